@@ -10,7 +10,7 @@ Used by the /audit/debias API endpoint.
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
@@ -31,6 +31,7 @@ def adversarial_fairness_pipeline(
     constraint: str = "demographic_parity",
     test_size: float = 0.3,
     random_state: int = 42,
+    progress: Callable[[float, str], None] | None = None,
 ) -> dict:
     """
     Run adversarial fairness mitigation via ExponentiatedGradient.
@@ -54,6 +55,10 @@ def adversarial_fairness_pipeline(
         Fraction of data to hold out for evaluation (default: 0.3).
     random_state : int
         Random seed for reproducibility.
+    progress : callable, optional
+        Called as ``progress(fraction, message)`` as each stage starts, so a
+        background job can report how far training has got. Exceptions it
+        raises abort the pipeline (used for cancellation).
 
     Returns
     -------
@@ -110,6 +115,8 @@ def adversarial_fairness_pipeline(
     )
 
     # --- Baseline (no mitigation) -----------------------------------------------
+    if progress is not None:
+        progress(0.1, "Training baseline model")
     baseline = LogisticRegression(solver="liblinear", random_state=random_state, max_iter=500)
     baseline.fit(X_train, y_train)
     y_pred_baseline = baseline.predict(X_test)
@@ -124,10 +131,14 @@ def adversarial_fairness_pipeline(
     else:
         raise ValueError(f"Unsupported constraint: {constraint}. Use 'demographic_parity'.")
 
+    if progress is not None:
+        progress(0.3, "Training fairness-constrained model")
     estimator = LogisticRegression(solver="liblinear", random_state=random_state, max_iter=500)
     mitigator = ExponentiatedGradient(estimator, constraints=fairness_constraint)
     mitigator.fit(X_train, y_train, sensitive_features=s_train)
 
+    if progress is not None:
+        progress(0.9, "Evaluating mitigated model")
     y_pred_mitigated = mitigator.predict(X_test)
 
     mitigated_report = classification_report(y_test, y_pred_mitigated, output_dict=True, zero_division=0)
@@ -1,45 +1,494 @@
 """
-API key authentication middleware for the fairness audit service.
+API key authentication for the fairness audit service.
+
+Keys are never kept in plain text: every store holds the SHA-256 of each
+key, and a request's ``X-API-Key`` is hashed once and looked up by that
+hash (lookup timing can reveal nothing about the key itself). Three stores:
+
+- :class:`EnvKeyStore` — the comma-separated ``API_KEYS`` variable, hashed
+  at startup. The default.
+- :class:`FileKeyStore` — a JSON file, ``{"keys": [{"key_hash", "name", ...}]}``.
+- :class:`SQLiteKeyStore` — an ``api_keys`` table.
+
+File and SQLite stores are hot-reloaded: their modification stamp is checked
+at most once a second — on a worker thread, not the event loop — and the
+keys re-read when it changes, so keys can be issued and revoked without a
+restart. Each key carries a name, optional expiry (stored as a UTC
+timestamp) and free-form metadata. Set ``API_KEYS_FILE`` (``*.json``, or a
+SQLite database) to use one.
+
+:class:`APIKeyMiddleware` is plain ASGI — no per-request task or body
+wrapping — and passes streamed uploads and downloads through untouched. The
+authenticated key's record is available to endpoints as
+``request.state.api_key``.
+
+Manage a key store from the command line:
+
+    python -m api.auth add data/api_keys.sqlite3 --name ci-pipeline --meta team=lending
+    python -m api.auth list data/api_keys.sqlite3
+    python -m api.auth revoke data/api_keys.sqlite3 <key_id>
 """
 
+import hashlib
+import json
 import logging
 import os
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+import anyio.to_thread
+from starlette.datastructures import Headers
 
 logger = logging.getLogger(__name__)
 
 SKIP_AUTH_PATHS = {"/health", "/docs", "/openapi.json", "/redoc"}
 
+_UNAUTHORIZED_BODY = b'{"detail": "Invalid or missing API key"}'
+
+
+def hash_key(api_key: str) -> str:
+    """SHA-256 hex digest of an API key — what the stores keep, and the key's owner id."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def parse_expiry(value: str | None) -> datetime | None:
+    """
+    Parse an ISO 8601 expiry into an aware UTC datetime.
+
+    A timestamp without an offset is taken as UTC; a bare date
+    (``2027-01-01``) means the end of that day, UTC.
+
+    Raises
+    ------
+    ValueError
+        If ``value`` is not an ISO 8601 date or timestamp.
+    """
+    if value is None or value == "":
+        return None
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Invalid expiry {value!r}; use ISO 8601, e.g. 2027-01-01T00:00:00+00:00.") from None
+    if len(text) == 10:  # YYYY-MM-DD
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def normalize_expiry(value: str | None) -> str | None:
+    """``expires_at`` as stored: the UTC ISO timestamp of :func:`parse_expiry`, or None."""
+    expiry = parse_expiry(value)
+    return None if expiry is None else expiry.isoformat()
+
+
+class APIKey:
+    """
+    One issued API key, without the key itself.
+
+    ``key_id`` (the first 12 hex digits of the hash) identifies the key in
+    listings and for revocation. ``owner`` is the full hash, matching the
+    owner of the key's background jobs and monitors.
+    """
+
+    def __init__(
+        self,
+        key_hash: str,
+        name: str | None = None,
+        created_at: str | None = None,
+        expires_at: str | None = None,
+        revoked_at: str | None = None,
+        metadata: dict | None = None,
+    ):
+        self.key_hash = key_hash
+        self.key_id = key_hash[:12]
+        self.name = name
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.revoked_at = revoked_at
+        self.metadata = metadata or {}
+        try:
+            self._expiry = parse_expiry(expires_at)
+        except ValueError:
+            # Hand-edited store: an unreadable expiry fails closed.
+            logger.warning("API key %s has an invalid expires_at %r; treating it as expired", self.key_id, expires_at)
+            self._expiry = datetime.min.replace(tzinfo=timezone.utc)
+
+    @property
+    def owner(self) -> str:
+        return self.key_hash
+
+    def active(self, now: datetime | None = None) -> bool:
+        """Not revoked and not past ``expires_at``."""
+        if self.revoked_at:
+            return False
+        return self._expiry is None or (now or datetime.now(timezone.utc)) < self._expiry
+
+    def to_dict(self) -> dict:
+        return {
+            "key_hash": self.key_hash,
+            "name": self.name,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "revoked_at": self.revoked_at,
+            "metadata": self.metadata,
+        }
+
+    def summary(self) -> dict:
+        """Listing fields — never the hash in full."""
+        summary = self.to_dict()
+        del summary["key_hash"]
+        return {"key_id": self.key_id, **summary, "active": self.active()}
+
+
+class KeyStore:
+    """
+    Base class: an in-memory ``{hash: APIKey}`` index, re-read from the
+    backing store when its stamp changes.
+
+    Subclasses implement ``_stamp()`` (any value that changes with the
+    stored keys; None when the store is missing) and ``_load()``.
+    """
+
+    reload_interval = 1.0  # seconds between stamp checks
+
+    def __init__(self):
+        self._keys: dict[str, APIKey] = {}
+        self._stamp_seen = object()
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def lookup(self, api_key: str | None) -> APIKey | None:
+        """The active record for ``api_key``, or None if it is unknown, revoked or expired."""
+        if not api_key:
+            return None
+        self.refresh()
+        record = self._keys.get(hash_key(api_key))
+        return record if record is not None and record.active() else None
+
+    def records(self) -> list[APIKey]:
+        """Every stored key, including revoked and expired ones."""
+        self.refresh(force=True)
+        return sorted(self._keys.values(), key=lambda r: (r.created_at or "", r.key_id))
+
+    def refresh_due(self) -> bool:
+        """Whether the next :meth:`refresh` will check the store (cheap: no I/O)."""
+        return time.monotonic() - self._checked_at >= self.reload_interval
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-read the keys if the store changed; checked at most every ``reload_interval`` seconds."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            stamp = self._stamp()
+            if stamp == self._stamp_seen:
+                return
+            try:
+                records = self._load() if stamp is not None else []
+            except (OSError, ValueError, sqlite3.Error) as exc:
+                # A half-written file or locked database: keep serving the previous keys.
+                logger.warning("Could not reload API keys, keeping %d: %s", len(self._keys), exc)
+                return
+            self._keys = {r.key_hash: r for r in records}
+            self._stamp_seen = stamp
+            self.reloads += 1
+            logger.info("Loaded %d API key(s) from %s", len(self._keys), self.describe())
+
+    def describe(self) -> str:
+        return type(self).__name__
+
+    def _stamp(self):
+        raise NotImplementedError
+
+    def _load(self) -> list[APIKey]:
+        raise NotImplementedError
+
+
+class EnvKeyStore(KeyStore):
+    """Keys from a comma-separated string (the ``API_KEYS`` variable), hashed on load."""
+
+    def __init__(self, raw: str):
+        super().__init__()
+        self._records = [APIKey(hash_key(k.strip())) for k in raw.split(",") if k.strip()]
 
-def _load_valid_keys() -> set[str]:
-    raw = os.environ.get("API_KEYS", "dev-key-12345")
-    keys = {k.strip() for k in raw.split(",") if k.strip()}
-    return keys
+    def describe(self) -> str:
+        return "API_KEYS"
 
+    def _stamp(self):
+        return "static"
 
-# Loaded once at module import time; refreshed on process restart.
-_VALID_KEYS: set[str] = _load_valid_keys()
+    def _load(self) -> list[APIKey]:
+        return self._records
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
-    """Middleware that enforces X-API-Key header authentication."""
+def _file_stamp(*paths: Path):
+    stamps = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stamps.append(None)
+            continue
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return None if stamps[0] is None else tuple(stamps)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        if request.url.path in SKIP_AUTH_PATHS or request.method == "OPTIONS":
-            return await call_next(request)
 
-        api_key = request.headers.get("X-API-Key")
-        if not api_key or api_key not in _VALID_KEYS:
-            logger.warning(
-                "Unauthorized request to %s — missing or invalid API key",
-                request.url.path,
+def _new_record(api_key: str, name, expires_at, metadata) -> APIKey:
+    """A new key's record; ``expires_at`` is validated and normalized to UTC (ValueError if invalid)."""
+    return APIKey(
+        hash_key(api_key), name=name, created_at=_now(), expires_at=normalize_expiry(expires_at), metadata=metadata,
+    )
+
+
+class FileKeyStore(KeyStore):
+    """
+    Keys in a JSON file: ``{"keys": [{"key_hash", "name", "created_at",
+    "expires_at", "revoked_at", "metadata"}]}``. Writes replace the file
+    atomically, so a reload never sees a partial file.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__()
+        self.path = Path(path)
+
+    def describe(self) -> str:
+        return str(self.path)
+
+    def _stamp(self):
+        return _file_stamp(self.path)
+
+    def _load(self) -> list[APIKey]:
+        with open(self.path) as f:
+            document = json.load(f)
+        if not isinstance(document, dict) or not isinstance(document.get("keys"), list):
+            raise ValueError(f"{self.path} must contain an object with a 'keys' list.")
+        return [APIKey(**entry) for entry in document["keys"]]
+
+    def _write(self, records: list[APIKey]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"keys": [r.to_dict() for r in records]}, indent=2) + "\n")
+        os.replace(tmp, self.path)
+        self.refresh(force=True)
+
+    def add(self, name=None, expires_at=None, metadata=None, api_key: str | None = None) -> tuple[str, APIKey]:
+        """Issue a key (random unless ``api_key`` is given); returns the plain key — shown once — and its record."""
+        api_key = api_key or secrets.token_urlsafe(32)
+        record = _new_record(api_key, name, expires_at, metadata)
+        with self._lock:
+            records = self._load() if self.path.exists() else []
+            if any(r.key_hash == record.key_hash for r in records):
+                raise ValueError("That API key is already in the store.")
+            records.append(record)
+        self._write(records)
+        return api_key, record
+
+    def revoke(self, key_id: str) -> bool:
+        """Mark the key with ``key_id`` revoked; False if there is no such active key."""
+        with self._lock:
+            records = self._load() if self.path.exists() else []
+            matches = [r for r in records if r.key_id == key_id and not r.revoked_at]
+            for record in matches:
+                record.revoked_at = _now()
+        if matches:
+            self._write(records)
+        return bool(matches)
+
+
+_KEYS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_keys (
+    key_hash    TEXT PRIMARY KEY,
+    key_id      TEXT NOT NULL,
+    name        TEXT,
+    created_at  TEXT NOT NULL,
+    expires_at  TEXT,
+    revoked_at  TEXT,
+    metadata    TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS api_keys_key_id ON api_keys (key_id);
+"""
+
+
+class SQLiteKeyStore(KeyStore):
+    """
+    Keys in the ``api_keys`` table of a SQLite database. Other processes
+    (or ``python -m api.auth``) may write to it; changes are picked up on
+    the next stamp check.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_KEYS_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def describe(self) -> str:
+        return str(self.path)
+
+    def _stamp(self):
+        # Commits land in the write-ahead log first, so watch it as well as the database.
+        return _file_stamp(self.path, self.path.with_name(self.path.name + "-wal"))
+
+    def _load(self) -> list[APIKey]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key_hash, name, created_at, expires_at, revoked_at, metadata FROM api_keys"
+            ).fetchall()
+        return [
+            APIKey(
+                row["key_hash"], row["name"], row["created_at"], row["expires_at"], row["revoked_at"],
+                json.loads(row["metadata"]),
             )
-            return Response(
-                content='{"detail": "Invalid or missing API key"}',
-                status_code=401,
-                media_type="application/json",
+            for row in rows
+        ]
+
+    def add(self, name=None, expires_at=None, metadata=None, api_key: str | None = None) -> tuple[str, APIKey]:
+        """Issue a key (random unless ``api_key`` is given); returns the plain key — shown once — and its record."""
+        api_key = api_key or secrets.token_urlsafe(32)
+        record = _new_record(api_key, name, expires_at, metadata)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO api_keys (key_hash, key_id, name, created_at, expires_at, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (record.key_hash, record.key_id, name, record.created_at, record.expires_at,
+                     json.dumps(record.metadata)),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("That API key is already in the store.") from None
+        self.refresh(force=True)
+        return api_key, record
+
+    def revoke(self, key_id: str) -> bool:
+        """Mark the key with ``key_id`` revoked; False if there is no such active key."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE api_keys SET revoked_at = ? WHERE key_id = ? AND revoked_at IS NULL",
+                (_now(), key_id),
             )
+        self.refresh(force=True)
+        return cursor.rowcount > 0
+
+
+def open_key_store(path: str | Path) -> FileKeyStore | SQLiteKeyStore:
+    """A :class:`FileKeyStore` for ``*.json``, otherwise a :class:`SQLiteKeyStore`."""
+    path = Path(path)
+    return FileKeyStore(path) if path.suffix.lower() == ".json" else SQLiteKeyStore(path)
+
+
+def default_key_store() -> KeyStore:
+    """The store named by ``API_KEYS_FILE``, else the ``API_KEYS`` variable (default ``dev-key-12345``)."""
+    path = os.environ.get("API_KEYS_FILE")
+    if path:
+        return open_key_store(path)
+    return EnvKeyStore(os.environ.get("API_KEYS", "dev-key-12345"))
+
+
+class APIKeyMiddleware:
+    """
+    Pure ASGI middleware that enforces ``X-API-Key`` authentication.
+
+    Requests without an active key get ``401``. Authenticated requests
+    continue with the key's :class:`APIKey` in ``scope["state"]["api_key"]``
+    (``request.state.api_key``); their body and response streams are not
+    touched.
+    """
+
+    def __init__(self, app, store: KeyStore | None = None):
+        self.app = app
+        self.store = store if store is not None else default_key_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in SKIP_AUTH_PATHS or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if self.store.refresh_due():
+            # The stamp check (and any reload) touches the filesystem or SQLite.
+            await anyio.to_thread.run_sync(self.store.refresh)
+        record = self.store.lookup(Headers(scope=scope).get("x-api-key"))
+        if record is None:
+            logger.warning("Unauthorized request to %s — missing or invalid API key", scope["path"])
+            await send({
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _UNAUTHORIZED_BODY})
+            return
+
+        scope.setdefault("state", {})["api_key"] = record
+        await self.app(scope, receive, send)
+
+
+def _main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m api.auth", description="Manage a hashed API key store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Issue a new key and print it (it is not stored in plain text).")
+    add.add_argument("store", help="Key store: *.json file or SQLite database.")
+    add.add_argument("--name")
+    add.add_argument(
+        "--expires", help="ISO 8601 timestamp (no offset = UTC) or date (valid through that day, UTC)."
+    )
+    add.add_argument("--meta", action="append", default=[], metavar="KEY=VALUE", help="Metadata; repeatable.")
+    revoke = commands.add_parser("revoke", help="Revoke a key by its key_id.")
+    revoke.add_argument("store")
+    revoke.add_argument("key_id")
+    listing = commands.add_parser("list", help="List keys (never the keys themselves).")
+    listing.add_argument("store")
+    args = parser.parse_args(argv)
+
+    store = open_key_store(args.store)
+    if args.command == "add":
+        metadata = dict(item.split("=", 1) for item in args.meta)
+        try:
+            api_key, record = store.add(name=args.name, expires_at=args.expires, metadata=metadata)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(f"key_id: {record.key_id}")
+        print(f"api_key: {api_key}")
+        return 0
+    if args.command == "revoke":
+        if store.revoke(args.key_id):
+            print(f"Revoked {args.key_id}")
+            return 0
+        print(f"No active key with key_id {args.key_id}")
+        return 1
+    print(json.dumps([r.summary() for r in store.records()], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
 
-        return await call_next(request)
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,193 @@
+"""
+Content-addressed cache for audit results.
+
+The same files are audited against the same community config over and over
+(dashboards, CI compliance gates, regulators re-running a check). An audit
+result depends only on the dataset bytes and the request parameters, so it
+is cached under a SHA-256 of exactly those — see :func:`cache_key`. A repeat
+request is answered without re-parsing the upload or re-rendering the PDF.
+
+Entries live in an in-memory LRU with a TTL and, optionally, in a directory
+on disk that survives restarts and is shared between workers. Values are
+JSON-serializable dicts (reports) or bytes (PDFs). Configured from the
+environment:
+
+    AUDIT_CACHE_SIZE   entries kept in memory; 0 disables caching (default 256)
+    AUDIT_CACHE_TTL    seconds an entry stays valid (default 3600)
+    AUDIT_CACHE_DIR    directory for the on-disk backend (default: memory only)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def config_digest(config: Any) -> str:
+    """SHA-256 of a JSON-serializable config, independent of key order."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def file_digest(fileobj) -> str:
+    """SHA-256 of a binary file object's contents; the file is rewound afterwards."""
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(_HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    """
+    Build a cache key from an endpoint namespace and everything its result depends on.
+
+    ``None`` and ``""`` are distinguished, so an omitted optional parameter
+    never collides with an empty one.
+    """
+    return config_digest([namespace, *parts])
+
+
+class ResultCache:
+    """
+    LRU + TTL cache of audit results, optionally backed by a directory.
+
+    Parameters
+    ----------
+    max_entries : int
+        Entries kept in memory. ``0`` disables the cache entirely.
+    ttl_seconds : float
+        Age after which an entry is treated as missing.
+    directory : str or Path, optional
+        On-disk backend. Memory misses fall through to it, and disk hits are
+        promoted back into memory.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, directory: str | Path | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        cache = cls(
+            max_entries=int(os.environ.get("AUDIT_CACHE_SIZE", "256")),
+            ttl_seconds=float(os.environ.get("AUDIT_CACHE_TTL", "3600")),
+            directory=os.environ.get("AUDIT_CACHE_DIR") or None,
+        )
+        logger.info(
+            "Audit cache: %d entries, TTL %ss, disk backend: %s",
+            cache.max_entries, cache.ttl_seconds, cache.directory or "none",
+        )
+        return cache
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if now - stored_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.evictions += 1
+
+        value, stored_at = self._disk_get(key, now)
+        if value is not None:
+            self._remember(key, value, stored_at)
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: dict | bytes) -> None:
+        """Store a report dict or rendered bytes under ``key``."""
+        if not self.enabled:
+            return
+        now = time.time()
+        self._remember(key, value, now)
+        self._disk_put(key, value)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_backend": str(self.directory) if self.directory is not None else None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+    def _remember(self, key: str, value: Any, stored_at: float) -> None:
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # -- disk backend ---------------------------------------------------------
+    # One file per entry: <key>.json for reports, <key>.bin for raw bytes.
+    # Writes go through a temp file + rename so readers never see partial data.
+
+    def _disk_get(self, key: str, now: float) -> tuple[Any | None, float]:
+        if self.directory is None:
+            return None, now
+        for suffix in (".json", ".bin"):
+            path = self.directory / f"{key}{suffix}"
+            try:
+                stored_at = path.stat().st_mtime
+                if now - stored_at > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                    self.evictions += 1
+                    return None, now
+                raw = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            return (json.loads(raw) if suffix == ".json" else raw), stored_at
+        return None, now
+
+    def _disk_put(self, key: str, value: dict | bytes) -> None:
+        if self.directory is None:
+            return
+        if isinstance(value, bytes):
+            path, raw = self.directory / f"{key}.bin", value
+        else:
+            path, raw = self.directory / f"{key}.json", json.dumps(value).encode()
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not write audit cache entry %s: %s", path, exc)
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,208 @@
+"""
+Response compression for the fairness audit service.
+
+Audit reports, reweighted rows and streamed CSV / NDJSON exports are
+highly repetitive text and shrink 5-10x. :class:`CompressionMiddleware`
+picks the encoding from the request's ``Accept-Encoding``: zstd when the
+client accepts it and the optional ``zstandard`` package is installed,
+otherwise gzip, otherwise none. Streaming responses are compressed chunk by
+chunk, flushing each one, so clients still receive rows as they are produced.
+
+Bodies under ``minimum_size`` bytes and content types that are already
+compressed (PDF, Parquet, ...) are sent as is. The middleware uses only
+Starlette's header helpers, not its gzip middleware internals, so it runs
+on any Starlette release FastAPI may pull in.
+"""
+
+import functools
+import zlib
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip only
+    zstandard = None
+
+# Media types (or ``type/`` prefixes) sent as is: already compressed, or
+# streams (server-sent events) that must not be buffered.
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/zstd",
+    "application/grpc",
+    "application/pdf",
+    "application/vnd.apache.parquet",
+    "text/event-stream",
+    "font/woff",
+    "image/",
+    "audio/",
+    "video/",
+)
+
+# Chunks at least this large are compressed on a worker thread, off the event loop.
+_THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Content codings an ``Accept-Encoding`` header allows (``q`` > 0), lower-cased."""
+    encodings = set()
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            encodings.add(coding.lower())
+    return encodings
+
+
+def _gzip_compressor(level: int):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def compress(body: bytes, more_body: bool) -> bytes:
+        return compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+    return compress
+
+
+def _zstd_compressor(level: int):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(body: bytes, more_body: bool) -> bytes:
+        mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK if more_body else zstandard.COMPRESSOBJ_FLUSH_FINISH
+        return compressor.compress(body) + compressor.flush(mode)
+
+    return compress
+
+
+class _CompressingResponder:
+    """
+    Wraps one response's ``send``: buffers ``http.response.start`` until the
+    first body chunk shows whether to compress, then compresses every chunk
+    with a streaming compressor, flushing each one.
+    """
+
+    def __init__(self, app, encoding: str, make_compressor, minimum_size: int, exclude_content_types: tuple[str, ...]):
+        self.app = app
+        self.encoding = encoding
+        self.make_compressor = make_compressor
+        self.compress = None  # created for the first body that is actually compressed
+        self.minimum_size = minimum_size
+        self.exclude_content_types = exclude_content_types
+        self.send = None
+        self.initial_message = None
+        self.passthrough = False
+        self.started = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or media_type.startswith(self.exclude_content_types)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.initial_message = message
+            return
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message_type != "http.response.body":
+            if not self.started:  # e.g. pathsend: nothing of ours to compress
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if len(body) < self.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.compress = self.make_compressor()
+            compressed = await self._compress(body, more_body)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+        await self.send({"type": "http.response.body", "body": await self._compress(body, more_body),
+                         "more_body": more_body})
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= _THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self.compress, body, more_body)
+        return self.compress(body, more_body)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with zstd or gzip per ``Accept-Encoding``.
+
+    Parameters
+    ----------
+    app : ASGI app
+    minimum_size : int
+        Smaller complete responses are sent uncompressed.
+    gzip_level, zstd_level : int
+        Compression levels; the defaults favour speed over ratio.
+    exclude_content_types : tuple of str
+        Media types, or ``type/`` prefixes, never compressed.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        exclude_content_types: tuple[str, ...] = EXCLUDED_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.exclude_content_types = tuple(exclude_content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        if "zstd" in encodings and zstandard is not None:
+            encoding, make_compressor = "zstd", functools.partial(_zstd_compressor, self.zstd_level)
+        elif "gzip" in encodings:
+            encoding, make_compressor = "gzip", functools.partial(_gzip_compressor, self.gzip_level)
+        else:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(
+            self.app, encoding, make_compressor, self.minimum_size, self.exclude_content_types
+        )
+        await responder(scope, receive, send)
@@ -0,0 +1,158 @@
+"""
+Executor layer for the fairness audit service.
+
+Route handlers are ``async def``, so anything CPU-bound they run inline
+blocks the event loop — and every other request on that worker with it.
+Handlers hand such work to one of two bounded executors instead:
+
+- ``io``  — a thread pool for pandas parsing and counting, which release the
+  GIL for most of their work.
+- ``cpu`` — a process pool for model training (fairlearn) and PDF rendering,
+  which hold the GIL and would otherwise serialize the thread pool.
+
+Each executor admits at most ``max_concurrency`` tasks at once; further
+callers wait (without blocking the loop) and are reported as queued.
+Pool sizes are read from the environment:
+
+    IO_WORKERS            threads in the io pool (default: min(32, CPUs + 4))
+    IO_MAX_CONCURRENCY    io tasks admitted at once (default: IO_WORKERS)
+    CPU_WORKERS           processes in the cpu pool (default: CPUs)
+    CPU_MAX_CONCURRENCY   cpu tasks admitted at once (default: CPU_WORKERS)
+    CPU_EXECUTOR          "process" (default) or "thread"
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    value = int(raw)
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {raw!r}.")
+    return value
+
+
+class BoundedExecutor:
+    """
+    A ``concurrent.futures`` executor with an admission limit and queue metrics.
+
+    Parameters
+    ----------
+    name : str
+        Label used in logs and metrics (e.g. ``"io"``).
+    executor : concurrent.futures.Executor
+        The pool that runs the work.
+    max_workers : int
+        Size of ``executor``; reported in metrics.
+    max_concurrency : int, optional
+        Tasks admitted at once. Defaults to ``max_workers``.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int, max_concurrency: int | None = None):
+        self.name = name
+        self.kind = "process" if isinstance(executor, ProcessPoolExecutor) else "thread"
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and return its result.
+
+        For a process pool, ``fn`` and its arguments must be picklable (a
+        module-level function called with DataFrames and plain values is).
+        Exceptions raised by ``fn`` propagate to the caller.
+        """
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        enqueued = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        started = time.perf_counter()
+        self.wait_seconds += started - enqueued
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.running -= 1
+            self.run_seconds += time.perf_counter() - started
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        """Return a JSON-serializable snapshot of the executor's load."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "running": self.running,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_seconds_total": round(self.wait_seconds, 4),
+            "run_seconds_total": round(self.run_seconds, 4),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_executors() -> dict[str, BoundedExecutor]:
+    """
+    Create the ``io`` and ``cpu`` executors from the environment.
+
+    Must be called from within the running event loop (e.g. a startup hook).
+    """
+    cpus = os.cpu_count() or 1
+
+    io_workers = _env_int("IO_WORKERS", min(32, cpus + 4))
+    io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="audit-io")
+
+    cpu_workers = _env_int("CPU_WORKERS", cpus)
+    cpu_kind = os.environ.get("CPU_EXECUTOR", "process").strip().lower()
+    if cpu_kind == "thread":
+        cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="audit-cpu")
+    elif cpu_kind == "process":
+        # "spawn" rather than fork: the server process is multithreaded.
+        cpu_pool = ProcessPoolExecutor(max_workers=cpu_workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        raise ValueError(f"CPU_EXECUTOR must be 'process' or 'thread', got {cpu_kind!r}.")
+
+    executors = {
+        "io": BoundedExecutor("io", io_pool, io_workers, _env_int("IO_MAX_CONCURRENCY", io_workers)),
+        "cpu": BoundedExecutor("cpu", cpu_pool, cpu_workers, _env_int("CPU_MAX_CONCURRENCY", cpu_workers)),
+    }
+    for executor in executors.values():
+        logger.info(
+            "Executor '%s': %s pool, %d workers, max concurrency %d",
+            executor.name, executor.kind, executor.max_workers, executor.max_concurrency,
+        )
+    return executors
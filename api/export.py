@@ -0,0 +1,161 @@
+"""
+Streaming serialization of reweighted datasets.
+
+``/reweight`` and ``/reweight/csv`` used to embed every reweighted row in
+one JSON document: a Python dict per row, then a single response string
+several times the size of the upload. The streaming formats here instead
+serialize one chunk of rows at a time, so the server holds one chunk
+regardless of dataset size:
+
+    text/csv                         CSV with a header row
+    application/x-ndjson             one JSON object per line
+    application/vnd.apache.parquet   Parquet, one row group per chunk (needs pyarrow)
+
+The format is negotiated from the request's ``Accept`` header (see
+:func:`negotiate_format`); ``application/json`` — and any client that does
+not ask — keeps the original JSON report.
+"""
+
+import io
+
+import pandas as pd
+
+JSON = "json"
+CSV = "csv"
+NDJSON = "ndjson"
+PARQUET = "parquet"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    CSV: "text/csv",
+    NDJSON: "application/x-ndjson",
+    PARQUET: "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS = {CSV: "csv", NDJSON: "ndjson", PARQUET: "parquet"}
+
+_ACCEPTED = {
+    "application/json": JSON,
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/jsonlines": NDJSON,
+    "application/vnd.apache.parquet": PARQUET,
+    "application/x-parquet": PARQUET,
+    "application/parquet": PARQUET,
+}
+
+
+def negotiate_format(accept: str | None) -> str | None:
+    """
+    Pick the response format from an ``Accept`` header.
+
+    Media ranges are tried in order of their ``q`` value (ties keep header
+    order). A missing header, ``*/*`` or ``application/*`` selects the JSON
+    report. Returns None when the header names only unsupported types, for
+    a ``406 Not Acceptable``.
+    """
+    if not accept or not accept.strip():
+        return JSON
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranges.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(ranges):
+        if media_type in _ACCEPTED:
+            return _ACCEPTED[media_type]
+        if media_type in ("*/*", "application/*"):
+            return JSON
+        if media_type == "text/*":
+            return CSV
+    return None
+
+
+def serialize_frames(frames, fmt: str):
+    """
+    Yield ``frames`` — an iterable of DataFrames with the same columns — as bytes in ``fmt``.
+
+    Each frame is encoded and yielded before the next is read, so memory is
+    bounded by one frame. Parquet writes one row group per frame; the schema
+    is fixed by the first frame.
+
+    Raises
+    ------
+    ImportError
+        For Parquet when pyarrow is not installed (before anything is yielded).
+    ValueError
+        For an unknown ``fmt``.
+    """
+    if fmt == CSV:
+        return _csv_chunks(frames)
+    if fmt == NDJSON:
+        return _ndjson_chunks(frames)
+    if fmt == PARQUET:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ImportError("Parquet output requires the optional 'pyarrow' package (pip install pyarrow).") from exc
+        return _parquet_chunks(frames)
+    raise ValueError(f"Unsupported export format: {fmt!r}")
+
+
+def _csv_chunks(frames):
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode()
+        header = False
+
+
+def _ndjson_chunks(frames):
+    for frame in frames:
+        if frame.empty:
+            continue
+        text = frame.to_json(orient="records", lines=True, date_format="iso")
+        yield (text if text.endswith("\n") else text + "\n").encode()
+
+
+def _parquet_chunks(frames):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = io.BytesIO()
+    writer = None
+    schema = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(sink, schema)
+            writer.write_table(table)
+            yield _drain(sink)
+        if writer is None:
+            # No rows at all: still return a valid (empty) Parquet file.
+            writer = pq.ParquetWriter(sink, pa.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def weights_frame(weights, start: int) -> pd.DataFrame:
+    """``row`` (0-based position in the input) and ``sample_weight`` for one chunk."""
+    return pd.DataFrame({"row": pd.RangeIndex(start, start + len(weights)), "sample_weight": weights})
@@ -0,0 +1,320 @@
+"""
+Background job store for long-running mitigations.
+
+``/audit/debias`` trains two models inside the request, which on large
+datasets outlives proxy timeouts. ``POST /jobs/debias`` instead records a
+job here, persists its input, and returns immediately; the job runs on the
+cpu executor and clients poll ``GET /jobs/{id}``.
+
+State lives in a SQLite database so it survives restarts and is shared with
+the worker processes, which write progress and results directly:
+
+    queued ──► running ──► succeeded | failed
+       │          │
+       └──────────┴──► cancelled
+
+Cancelling a running job is cooperative: the worker checks for it at each
+pipeline stage and stops there. Each server start gets a fresh boot id that
+is stamped on the jobs it runs; running jobs carrying any other boot id were
+interrupted by a restart and are re-queued on startup. (Pids are no use for
+this: a containerised server is pid 1 on every boot.)
+"""
+
+import json
+import logging
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    owner        TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    progress     REAL NOT NULL DEFAULT 0,
+    message      TEXT,
+    params       TEXT NOT NULL,
+    input_path   TEXT,
+    result       TEXT,
+    error        TEXT,
+    runner_pid   INTEGER,
+    runner_boot  TEXT,
+    created_at   TEXT NOT NULL,
+    started_at   TEXT,
+    finished_at  TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_owner_status ON jobs (owner, status);
+"""
+
+
+class JobLimitError(Exception):
+    """Raised when an API key already has its maximum number of active jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """
+    SQLite-backed job records plus a directory of persisted job inputs.
+
+    Every method opens its own short-lived connection, so one store can be
+    used from the event loop, executor threads and worker processes.
+
+    Parameters
+    ----------
+    root : str or Path
+    boot_id : str, optional
+        Identifies the current server start; required for :meth:`recover`.
+        Worker processes open the store without one.
+    """
+
+    def __init__(self, root: str | Path, boot_id: str | None = None):
+        self.root = Path(root)
+        self.boot_id = boot_id
+        self.inputs_dir = self.root / "inputs"
+        self.inputs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "jobs.sqlite3"
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "runner_boot" not in columns:  # stores created before boot ids
+                conn.execute("ALTER TABLE jobs ADD COLUMN runner_boot TEXT")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # -- submission -----------------------------------------------------------
+
+    def check_limit(self, owner: str, max_active: int) -> None:
+        """
+        Fail fast, before any input is parsed or persisted, when ``owner`` is at its job limit.
+
+        :meth:`create` repeats the check atomically with the insert.
+
+        Raises
+        ------
+        JobLimitError
+            If ``owner`` already has ``max_active`` queued or running jobs.
+        """
+        with self._connect() as conn:
+            active = self._active_jobs(conn, owner)
+        if active >= max_active:
+            raise JobLimitError(f"This API key already has {active} active job(s); the limit is {max_active}.")
+
+    @staticmethod
+    def _active_jobs(conn, owner: str) -> int:
+        (active,) = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE owner = ? AND status IN (?, ?)",
+            (owner, *ACTIVE_STATUSES),
+        ).fetchone()
+        return active
+
+    def create(self, kind: str, owner: str, params: dict, data: pd.DataFrame, max_active: int) -> str:
+        """
+        Record a new queued job and persist its input frame.
+
+        Raises
+        ------
+        JobLimitError
+            If ``owner`` already has ``max_active`` queued or running jobs.
+        """
+        self.check_limit(owner, max_active)
+        job_id = uuid.uuid4().hex
+        input_path = self.inputs_dir / f"{job_id}.pkl"
+        data.to_pickle(input_path)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            active = self._active_jobs(conn, owner)
+            if active >= max_active:
+                conn.execute("ROLLBACK")
+                input_path.unlink(missing_ok=True)
+                raise JobLimitError(
+                    f"This API key already has {active} active job(s); the limit is {max_active}."
+                )
+            conn.execute(
+                "INSERT INTO jobs (id, kind, owner, status, message, params, input_path, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, owner, QUEUED, "Waiting for a worker", json.dumps(params),
+                 str(input_path), _now()),
+            )
+            conn.execute("COMMIT")
+        return job_id
+
+    # -- queries --------------------------------------------------------------
+
+    def get(self, job_id: str, owner: str | None = None) -> dict | None:
+        """Return the public view of a job, or None if absent (or owned by someone else)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (owner is not None and row["owner"] != owner):
+            return None
+        job = {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "progress": round(row["progress"], 4),
+            "message": row["message"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["status"] == SUCCEEDED:
+            job["result"] = json.loads(row["result"])
+        if row["status"] == FAILED:
+            job["error"] = row["error"]
+        return job
+
+    def queued_ids(self) -> list[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    # -- state transitions ----------------------------------------------------
+
+    def cancel(self, job_id: str, owner: str | None = None) -> dict | None:
+        """Cancel a queued or running job. Finished jobs are left as they are."""
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, finished_at = ? "
+                "WHERE id = ? AND status IN (?, ?)" + (" AND owner = ?" if owner else ""),
+                (CANCELLED, "Cancelled by client", _now(), job_id, *ACTIVE_STATUSES)
+                + ((owner,) if owner else ()),
+            ).rowcount
+        if updated:
+            self._drop_input(job_id)
+        return self.get(job_id, owner)
+
+    def claim(self, job_id: str, runner_pid: int, runner_boot: str) -> dict | None:
+        """
+        Move a queued job to running for the server start ``runner_boot``;
+        returns its params, or None if it was cancelled.
+        """
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, started_at = ?, runner_pid = ?, runner_boot = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, "Starting", _now(), runner_pid, runner_boot, job_id, QUEUED),
+            ).rowcount
+            if not updated:
+                return None
+            row = conn.execute("SELECT params, input_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return {"params": json.loads(row["params"]), "input_path": row["input_path"]}
+
+    def report_progress(self, job_id: str, fraction: float, message: str) -> None:
+        """
+        Record progress for a running job.
+
+        Raises
+        ------
+        JobCancelled
+            If the job is no longer running (it was cancelled).
+        """
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET progress = ?, message = ? WHERE id = ? AND status = ?",
+                (fraction, message, job_id, RUNNING),
+            ).rowcount
+        if not updated:
+            raise JobCancelled(job_id)
+
+    def finish(self, job_id: str, result: dict | None = None, error: str | None = None) -> None:
+        """Store a running job's result or error. A job cancelled meanwhile stays cancelled."""
+        status, message = (FAILED, "Failed") if error is not None else (SUCCEEDED, "Done")
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, progress = CASE WHEN ? THEN 1.0 ELSE progress END, "
+                "result = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (status, message, error is None, json.dumps(result) if result is not None else None,
+                 error, _now(), job_id, RUNNING),
+            )
+        self._drop_input(job_id)
+
+    def recover(self) -> int:
+        """
+        Re-queue running jobs started under any other boot id than this
+        store's, i.e. interrupted by a restart.
+
+        Returns the number of jobs re-queued.
+        """
+        if self.boot_id is None:
+            raise ValueError("recover() needs a JobStore opened with the server's boot_id.")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, runner_boot FROM jobs WHERE status = ?", (RUNNING,)
+            ).fetchall()
+            orphaned = [row["id"] for row in rows if row["runner_boot"] != self.boot_id]
+            for job_id in orphaned:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 0, message = ?, started_at = NULL "
+                    "WHERE id = ? AND status = ?",
+                    (QUEUED, "Re-queued after server restart", job_id, RUNNING),
+                )
+        if orphaned:
+            logger.info("Re-queued %d job(s) interrupted by a restart", len(orphaned))
+        return len(orphaned)
+
+    def _drop_input(self, job_id: str) -> None:
+        (self.inputs_dir / f"{job_id}.pkl").unlink(missing_ok=True)
+
+
+def run_debias_job(root: str, job_id: str, runner_pid: int, runner_boot: str) -> str:
+    """
+    Worker entry point: run one queued ``debias`` job to completion.
+
+    Executed in a cpu-pool process. Reports progress through the store and
+    checks for cancellation at each pipeline stage. Returns the job's final
+    status.
+    """
+    from adversarial_fairlearn import adversarial_fairness_pipeline
+
+    store = JobStore(root)
+    claimed = store.claim(job_id, runner_pid, runner_boot)
+    if claimed is None:
+        return CANCELLED
+    try:
+        data = pd.read_pickle(claimed["input_path"])
+        result = adversarial_fairness_pipeline(
+            data=data,
+            progress=lambda fraction, message: store.report_progress(job_id, fraction, message),
+            **claimed["params"],
+        )
+    except JobCancelled:
+        return CANCELLED
+    except (ValueError, ImportError) as exc:
+        store.finish(job_id, error=str(exc))
+        return FAILED
+    except Exception as exc:
+        logger.exception("Job %s failed", job_id)
+        store.finish(job_id, error=f"Processing error: {exc}")
+        return FAILED
+    store.finish(job_id, result=result)
+    return SUCCEEDED
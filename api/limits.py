@@ -0,0 +1,383 @@
+"""
+Per-key rate limits, concurrency caps and load shedding.
+
+Every authenticated request is admitted or refused before its body is read:
+
+1. **Load shedding** — ``503`` while the executors' combined queue is at
+   ``SHED_MAX_QUEUED`` or the process's resident memory is over
+   ``SHED_MAX_RSS_MB``. Nothing is charged to the key.
+2. **Concurrency** — ``429`` when the key already has its maximum number of
+   requests of the same class in flight (streamed responses count until
+   their last byte is sent).
+3. **Rate** — ``429`` when the key's token bucket for the class is empty.
+
+Endpoints fall into three classes: ``expensive`` (model training, PDF
+rendering, job submission and bootstraps, which may resample every row —
+see :data:`EXPENSIVE_PATHS`), ``bulk`` (unbounded streamed uploads and
+many-config passes — :data:`BULK_PATHS`) and ``cheap`` (everything else).
+Classes are decided from the path alone, before the body (and so e.g. a
+bootstrap's ``method``) is read. Each refusal carries ``Retry-After``.
+
+Token buckets live in SQLite, so a key's remaining budget survives restarts
+and is shared by every worker process using the same database. In-flight
+counts are per process: requests in flight die with it.
+
+Limits are read from the environment and can be overridden per key through
+its metadata in the key store (see api/auth.py), using the same names in
+lower case (``rate_limit_expensive``, ``concurrency_cheap``, ...)::
+
+    RATE_LIMIT_CHEAP        bucket for cheap requests (default "600/min")
+    RATE_LIMIT_BULK         bucket for bulk requests (default "120/hour")
+    RATE_LIMIT_EXPENSIVE    bucket for expensive requests (default "30/hour")
+    CONCURRENCY_CHEAP       cheap requests in flight per key (default 16)
+    CONCURRENCY_BULK        bulk requests in flight per key (default 4)
+    CONCURRENCY_EXPENSIVE   expensive requests in flight per key (default 2)
+    SHED_MAX_QUEUED         executor queue depth that sheds load (default 64; 0 = off)
+    SHED_MAX_RSS_MB         resident memory that sheds load (default 0 = off)
+    SHED_RETRY_AFTER        Retry-After seconds for shed requests (default 5)
+    LIMITS_DB               bucket database (default: limits.sqlite3 in JOBS_DIR)
+
+A rate is ``"<requests>/<period>"`` with a period of ``s``, ``min``,
+``hour`` or ``day`` (or a number of seconds): up to ``<requests>`` at once,
+refilled evenly over the period. ``"0"`` or ``"none"`` disables the limit.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import anyio.to_thread
+
+logger = logging.getLogger(__name__)
+
+CHEAP = "cheap"
+BULK = "bulk"
+EXPENSIVE = "expensive"
+CLASSES = (CHEAP, BULK, EXPENSIVE)
+
+EXPENSIVE_PATHS = {"/audit/debias", "/audit/pdf", "/jobs/debias", "/audit/bootstrap"}
+BULK_PATHS = {"/audit/csv/stream", "/reweight/csv", "/audit/remediate", "/audit/compliance/batch"}
+
+DEFAULT_RATES = {CHEAP: "600/min", BULK: "120/hour", EXPENSIVE: "30/hour"}
+DEFAULT_CONCURRENCY = {CHEAP: 16, BULK: 4, EXPENSIVE: 2}
+
+_PERIODS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    owner       TEXT NOT NULL,
+    class       TEXT NOT NULL,
+    tokens      REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (owner, class)
+);
+"""
+
+
+def parse_rate(spec: str | None) -> tuple[float, float] | None:
+    """
+    ``"30/hour"`` -> ``(capacity, tokens per second)`` = ``(30, 30 / 3600)``.
+
+    Returns None for an unlimited rate (``"0"``, ``"none"``, empty).
+
+    Raises
+    ------
+    ValueError
+        If ``spec`` is not ``"<requests>/<period>"``.
+    """
+    if spec is None or str(spec).strip().lower() in ("", "0", "none", "unlimited"):
+        return None
+    count, sep, period = str(spec).strip().lower().partition("/")
+    try:
+        capacity = float(count)
+        seconds = _PERIODS[period.strip()] if period.strip() in _PERIODS else float(period)
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate {spec!r}; expected e.g. '60/min' or '30/hour'.") from None
+    if not sep or capacity <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate {spec!r}; expected e.g. '60/min' or '30/hour'.")
+    return capacity, capacity / seconds
+
+
+def endpoint_class(method: str, path: str) -> str:
+    """The admission class of a request: ``EXPENSIVE``, ``BULK`` or ``CHEAP``, from its POST path."""
+    if method == "POST":
+        if path in EXPENSIVE_PATHS:
+            return EXPENSIVE
+        if path in BULK_PATHS:
+            return BULK
+    return CHEAP
+
+
+def resident_memory_bytes() -> int | None:
+    """Current resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _env_by_class(prefix: str, convert) -> dict:
+    """``{class: value}`` for each ``<PREFIX>_<CLASS>`` variable that is set."""
+    values = {}
+    for cls in CLASSES:
+        raw = os.environ.get(f"{prefix}_{cls.upper()}")
+        if raw:
+            values[cls] = convert(raw)
+    return values
+
+
+class Refusal(Exception):
+    """An admission decision against a request: status, message and Retry-After seconds."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by (owner, class), persisted in SQLite.
+
+    Each :meth:`take` is one short ``BEGIN IMMEDIATE`` transaction, so
+    several processes sharing the database never double-spend a token.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def take(self, owner: str, cls: str, capacity: float, refill_per_second: float, now: float | None = None) -> float:
+        """
+        Take one token. Returns 0 on success, otherwise the seconds until a
+        token is available (nothing is taken).
+        """
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE owner = ? AND class = ?", (owner, cls)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * refill_per_second)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_per_second
+            conn.execute(
+                "INSERT INTO buckets (owner, class, tokens, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (owner, class) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (owner, cls, tokens, now),
+            )
+            conn.execute("COMMIT")
+        return wait
+
+
+class AdmissionControl:
+    """
+    Admission decisions for authenticated requests.
+
+    Parameters
+    ----------
+    buckets : TokenBuckets
+    rates : dict
+        ``{class: rate spec}`` defaults (see :func:`parse_rate`).
+    concurrency : dict
+        ``{class: max in flight per key}`` defaults; 0 = unlimited.
+    queue_depth : callable, optional
+        Returns the current number of queued executor tasks.
+    max_queued : int
+        Shed load at this queue depth; 0 disables.
+    max_rss_bytes : int
+        Shed load above this resident memory; 0 disables.
+    shed_retry_after : float
+        Retry-After for shed requests.
+    """
+
+    def __init__(
+        self,
+        buckets: TokenBuckets,
+        rates: dict | None = None,
+        concurrency: dict | None = None,
+        queue_depth=None,
+        max_queued: int = 0,
+        max_rss_bytes: int = 0,
+        shed_retry_after: float = 5,
+    ):
+        self.buckets = buckets
+        self.rates = {cls: parse_rate(spec) for cls, spec in {**DEFAULT_RATES, **(rates or {})}.items()}
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.queue_depth = queue_depth
+        self.max_queued = max_queued
+        self.max_rss_bytes = max_rss_bytes
+        self.shed_retry_after = shed_retry_after
+        self._in_flight: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.counters = {"admitted": 0, "rate_limited": 0, "concurrency_limited": 0, "shed": 0}
+
+    @classmethod
+    def from_env(cls, db_path: str | Path, queue_depth=None) -> "AdmissionControl":
+        rates = _env_by_class("RATE_LIMIT", str)
+        concurrency = _env_by_class("CONCURRENCY", int)
+        control = cls(
+            TokenBuckets(db_path),
+            rates=rates,
+            concurrency=concurrency,
+            queue_depth=queue_depth,
+            max_queued=int(os.environ.get("SHED_MAX_QUEUED", "64")),
+            max_rss_bytes=int(os.environ.get("SHED_MAX_RSS_MB", "0")) * 1024 * 1024,
+            shed_retry_after=float(os.environ.get("SHED_RETRY_AFTER", "5")),
+        )
+        logger.info(
+            "Admission control: rates %s, concurrency %s, shed at %s queued / %s MB RSS, state in %s",
+            {**DEFAULT_RATES, **rates}, control.concurrency,
+            control.max_queued or "off", control.max_rss_bytes // (1024 * 1024) or "off", db_path,
+        )
+        return control
+
+    def limits_for(self, key, cls: str) -> tuple[tuple[float, float] | None, int]:
+        """The (rate, concurrency) applying to ``key`` for ``cls``, with its metadata overrides."""
+        rate, concurrency = self.rates[cls], self.concurrency[cls]
+        metadata = getattr(key, "metadata", None) or {}
+        try:
+            if f"rate_limit_{cls}" in metadata:
+                rate = parse_rate(metadata[f"rate_limit_{cls}"])
+            if f"concurrency_{cls}" in metadata:
+                concurrency = int(metadata[f"concurrency_{cls}"])
+        except (TypeError, ValueError) as exc:
+            logger.warning("Ignoring invalid limit metadata on key %s: %s", getattr(key, "key_id", "?"), exc)
+            return self.rates[cls], self.concurrency[cls]
+        return rate, concurrency
+
+    def check_load(self) -> None:
+        """Raise a 503 :class:`Refusal` while the service is overloaded."""
+        if self.max_queued and self.queue_depth is not None:
+            queued = self.queue_depth()
+            if queued >= self.max_queued:
+                self.counters["shed"] += 1
+                raise Refusal(503, f"Service overloaded: {queued} tasks queued. Retry later.", self.shed_retry_after)
+        if self.max_rss_bytes:
+            rss = resident_memory_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                self.counters["shed"] += 1
+                raise Refusal(503, "Service overloaded: memory limit reached. Retry later.", self.shed_retry_after)
+
+    def acquire(self, key, cls: str) -> None:
+        """
+        Reserve an in-flight slot and take a token for ``key``; pair with :meth:`release`.
+
+        Raises
+        ------
+        Refusal
+            ``429`` when the key is at its concurrency cap or out of tokens.
+        """
+        rate, concurrency = self.limits_for(key, cls)
+        slot = (key.owner, cls)
+        with self._lock:
+            in_flight = self._in_flight.get(slot, 0)
+            if concurrency and in_flight >= concurrency:
+                self.counters["concurrency_limited"] += 1
+                raise Refusal(
+                    429, f"Too many concurrent {cls} requests for this API key (limit {concurrency}).", 1
+                )
+            self._in_flight[slot] = in_flight + 1
+        if rate is not None:
+            try:
+                wait = self.buckets.take(key.owner, cls, *rate)
+            except sqlite3.Error as exc:
+                # Fail open: a locked or broken limits database must not take the API down.
+                logger.warning("Rate limit state unavailable, admitting request: %s", exc)
+                wait = 0
+            if wait:
+                self.release(key, cls)
+                self.counters["rate_limited"] += 1
+                raise Refusal(429, f"Rate limit exceeded for {cls} requests on this API key.", wait)
+        self.counters["admitted"] += 1
+
+    def release(self, key, cls: str) -> None:
+        slot = (key.owner, cls)
+        with self._lock:
+            remaining = self._in_flight.get(slot, 0) - 1
+            if remaining > 0:
+                self._in_flight[slot] = remaining
+            else:
+                self._in_flight.pop(slot, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            in_flight = sum(self._in_flight.values())
+        return {**self.counters, "in_flight": in_flight}
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware applying :class:`AdmissionControl` to requests
+    authenticated by ``APIKeyMiddleware`` (which must run first, i.e. be
+    added after this one). Unauthenticated paths pass straight through.
+
+    ``get_control`` returns the current :class:`AdmissionControl`, or None
+    before the app has started.
+    """
+
+    def __init__(self, app, get_control):
+        self.app = app
+        self.get_control = get_control
+
+    async def __call__(self, scope, receive, send):
+        control = self.get_control()
+        key = scope.get("state", {}).get("api_key") if scope["type"] == "http" else None
+        if control is None or key is None:
+            await self.app(scope, receive, send)
+            return
+
+        cls = endpoint_class(scope["method"], scope["path"])
+        try:
+            control.check_load()
+            # Token buckets are a SQLite transaction: keep it off the event loop.
+            await anyio.to_thread.run_sync(control.acquire, key, cls)
+        except Refusal as refusal:
+            logger.warning("Refused %s %s for key %s: %s", scope["method"], scope["path"], key.key_id, refusal.detail)
+            await _send_refusal(send, refusal)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            control.release(key, cls)
+
+
+async def _send_refusal(send, refusal: Refusal) -> None:
+    body = json.dumps({"detail": refusal.detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": refusal.status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(refusal.retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
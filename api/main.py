@@ -4,17 +4,24 @@ FastAPI application — Racial Fairness Bias Audit Service.
 
 from __future__ import annotations
 
-import io
+import asyncio
+import hashlib
+import json
 import logging
 import sys
 import os
+import uuid
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from starlette.datastructures import Headers
 
 # ---------------------------------------------------------------------------
 # Bootstrap: make the project root importable so we can import core modules.
@@ -23,20 +30,69 @@ PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from racial_bias_score import calculate_racial_bias_score  # noqa: E402
-from fairness_reweight import reweight_samples_with_community  # noqa: E402
-from fairness_audit import disparate_impact  # noqa: E402
+from group_stats import (  # noqa: E402
+    GroupCounts,
+    WeightedRates,
+    favorable_indicator,
+    outcome_counts,
+    weighted_group_rates,
+)
+from ingest import (  # noqa: E402
+    CSV,
+    MissingColumnsError,
+    audit_dtypes,
+    detect_compression,
+    detect_format,
+    iter_batches,
+    read_table,
+)
+from fairness_reweight import ReweightTable, community_sample_weights, reweight_table  # noqa: E402
+from fairness_audit import (  # noqa: E402
+    DI_THRESHOLD_DEFAULT,
+    MIN_CELL_SIZE_DEFAULT,
+    build_audit_report,
+    disparate_impact_matrix,
+    disparate_impact_ratios,
+    intersectional_audit,
+)
 from load_community_definitions import load_community_definitions  # noqa: E402
 from community_input import validate_community_config, is_community_valid  # noqa: E402
 from report_generator import generate_pdf_report  # noqa: E402
 from adversarial_fairlearn import adversarial_fairness_pipeline  # noqa: E402
+from monitoring import RollingAuditMonitor  # noqa: E402
+from bootstrap import bootstrap_audit, bootstrap_audit_rows  # noqa: E402
+from threshold_sweep import ThresholdSweep, threshold_grid  # noqa: E402
+from config_registry import REGISTRY_DIR, ConfigRegistry  # noqa: E402
 
 from api.auth import APIKeyMiddleware  # noqa: E402
-from api.models import JSONAuditRequest, JSONReweightRequest  # noqa: E402
+from api import export  # noqa: E402
+from api.compression import CompressionMiddleware  # noqa: E402
+from api.cache import ResultCache, cache_key, config_digest, file_digest  # noqa: E402
+from api.executors import BoundedExecutor, build_executors  # noqa: E402
+from api.limits import AdmissionControl, AdmissionMiddleware  # noqa: E402
+from api.uploads import BodySizeLimitMiddleware, mapped_upload  # noqa: E402
+from api.jobs import JobLimitError, JobStore, run_debias_job  # noqa: E402
+from api.models import (  # noqa: E402
+    ColumnarAuditParams,
+    GroupCount,
+    JSONAuditRequest,
+    JSONReweightRequest,
+    MonitorConfig,
+    MonitorEvents,
+    check_columns,
+)
 
-DI_THRESHOLD_DEFAULT = 0.8  # EEOC 4/5ths rule — used only when community config has no threshold
 MAX_UPLOAD_MB = 50
 MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+# Hard ceiling on any request body, enforced while it is received; 0 = none,
+# since streaming endpoints accept uploads of any size.
+MAX_REQUEST_MB = int(os.environ.get("MAX_REQUEST_MB", "0"))
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024  # form fields and part headers around a raw-size-limited file
+STREAM_CHUNK_ROWS = 100_000  # rows parsed per chunk by /audit/csv/stream
+BOOTSTRAP_MAX_ROW_DRAWS = 2_000_000_000  # replicates x rows allowed for a row-level /audit/bootstrap
+SWEEP_MAX_STEPS = 100_000  # thresholds per /audit/threshold-sweep curve
+COMPLIANCE_BATCH_MAX_CONFIGS = 500  # configs per /audit/compliance/batch request
+CSV_ENGINE = os.environ.get("CSV_ENGINE") or None  # e.g. "pyarrow"; None = pandas default
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -56,6 +112,36 @@ _COMMUNITY_DEFS_PATH = os.environ.get(
 )
 
 community_defs: dict = {}
+community_defs_digest: str = ""  # part of every cache key that depends on community_defs
+
+# Audit results keyed by dataset hash + parameters — see api/cache.py.
+audit_cache = ResultCache(max_entries=0)
+
+# Published community configs, re-indexed when files change — see config_registry.py.
+config_registry = ConfigRegistry(os.environ.get("REGISTRY_DIR") or REGISTRY_DIR)
+
+# ---------------------------------------------------------------------------
+# Background jobs — SQLite store and persisted inputs under JOBS_DIR.
+# ---------------------------------------------------------------------------
+JOBS_DIR = os.environ.get("JOBS_DIR", str(Path(PROJECT_ROOT) / "data" / "jobs"))
+JOBS_MAX_PER_KEY = int(os.environ.get("JOBS_MAX_PER_KEY", "2"))  # queued + running jobs per API key
+
+job_store: JobStore | None = None
+
+# Per-key rate limits, concurrency caps and load shedding — see api/limits.py.
+# Bucket state lives in SQLite next to the job store so it survives restarts.
+LIMITS_DB = os.environ.get("LIMITS_DB")
+admission: AdmissionControl | None = None
+_job_tasks: set[asyncio.Task] = set()
+
+# ---------------------------------------------------------------------------
+# Rolling disparate-impact monitors — held in memory by this server process.
+# ---------------------------------------------------------------------------
+MONITORS_MAX_PER_KEY = int(os.environ.get("MONITORS_MAX_PER_KEY", "10"))
+MONITOR_DEFAULT_WINDOWS = ("7D", "30D", "90D")
+
+# (owner, monitor_id) -> {"monitor": RollingAuditMonitor, "config": MonitorConfig, "lock": asyncio.Lock}
+monitors: dict[tuple[str, str], dict] = {}
 
 
 def _load_community_defs() -> dict:
@@ -80,22 +166,154 @@ app = FastAPI(
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["GET", "POST"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
 )
+
+def _request_body_limit(scope) -> int | None:
+    """
+    Body limit for :class:`BodySizeLimitMiddleware`. A JSON-report
+    /reweight/csv keeps every column, so its upload is capped at the raw
+    upload limit as it arrives; other requests only by MAX_REQUEST_MB.
+    """
+    if scope["path"] == "/reweight/csv" and scope["method"] == "POST":
+        accept = Headers(scope=scope).get("accept")
+        if export.negotiate_format(accept) == export.JSON:
+            return MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+    return MAX_REQUEST_MB * 1024 * 1024 or None
+
+
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+app.add_middleware(BodySizeLimitMiddleware, limit_for=_request_body_limit)
+# Added after the body limit and before auth: runs once the key is known, before any body is read.
+app.add_middleware(AdmissionMiddleware, get_control=lambda: admission)
 app.add_middleware(APIKeyMiddleware)
 
 
+# Thread pool for pandas work, process pool for model training and PDF
+# rendering — see api/executors.py. Created per server lifetime.
+executors: dict[str, BoundedExecutor] = {}
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
-    global community_defs
+    global community_defs, community_defs_digest, audit_cache, job_store, admission
     community_defs = _load_community_defs()
+    community_defs_digest = config_digest(community_defs)
+    audit_cache = ResultCache.from_env()
+    executors.update(build_executors())
+    job_store = JobStore(JOBS_DIR, boot_id=uuid.uuid4().hex)
+    job_store.recover()
+    admission = AdmissionControl.from_env(
+        LIMITS_DB or Path(JOBS_DIR) / "limits.sqlite3",
+        queue_depth=lambda: sum(executor.queued for executor in executors.values()),
+    )
+    for job_id in job_store.queued_ids():
+        _schedule_job(job_id)
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    # Unfinished jobs stay queued/running in the store and resume on restart.
+    for task in list(_job_tasks):
+        task.cancel()
+    for executor in executors.values():
+        executor.shutdown()
+    executors.clear()
+
+
+def _schedule_job(job_id: str) -> None:
+    task = asyncio.create_task(_run_job(job_id))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+
+
+async def _run_job(job_id: str) -> None:
+    """Run a stored job on the cpu executor; the worker records its own outcome."""
+    try:
+        await _run_cpu(run_debias_job, str(job_store.root), job_id, os.getpid(), job_store.boot_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        # The worker itself failed (e.g. the process pool broke) — record it.
+        logger.exception("Job %s could not be run", job_id)
+        job_store.finish(job_id, error=f"Processing error: {exc}")
 
 
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
 
+async def _run_io(fn, *args, **kwargs):
+    """Run pandas parsing/counting work on the io thread pool."""
+    return await executors["io"].run(fn, *args, **kwargs)
+
+
+async def _run_cpu(fn, *args, **kwargs):
+    """Run GIL-bound work (model training, PDF rendering) on the cpu process pool."""
+    return await executors["cpu"].run(fn, *args, **kwargs)
+
+
+def _owner(request: Request) -> str:
+    """Owner id of the request's API key — its hash, set by APIKeyMiddleware — for jobs and monitors."""
+    return request.state.api_key.owner
+
+
+async def _upload_digest(file: UploadFile) -> str:
+    """SHA-256 of an upload's raw bytes, for result-cache keys."""
+    return await _run_io(file_digest, file.file)
+
+
+async def _body_cache_key(namespace: str, raw_body: bytes) -> str | None:
+    """
+    Cache key for a raw JSON request body, which holds the data and every
+    parameter. Hashed on the io pool; None while the cache is disabled.
+    """
+    if not audit_cache.enabled:
+        return None
+    digest = await _run_io(_sha256_hex, raw_body)
+    return cache_key(namespace, digest, community_defs_digest)
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _upload_cache_key(namespace: str, file: UploadFile, digest: str, *params) -> str:
+    """Cache key for an upload: its bytes, how they are parsed, and the request parameters."""
+    return cache_key(namespace, digest, *_upload_format(file), *params)
+
+
+def _upload_format(file: UploadFile) -> tuple[str, str | None]:
+    """
+    ``(format, compression)`` of an upload, from its content type and filename
+    (``hmda.csv.gz`` is gzip-compressed CSV). Only CSV may be compressed.
+    """
+    fmt = detect_format(file.content_type, file.filename)
+    compression = detect_compression(file.content_type, file.filename)
+    if compression is not None and fmt != CSV:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Compressed {fmt.capitalize()} uploads are not supported; upload the {fmt} file as is.",
+        )
+    return fmt, compression
+
+
+def _cached_json(key: str | None) -> JSONResponse | None:
+    if key is None:
+        return None
+    report = audit_cache.get(key)
+    if report is None:
+        return None
+    return JSONResponse(content=report, headers={"X-Cache": "HIT"})
+
+
+def _store_json(key: str | None, report: dict) -> JSONResponse:
+    if key is not None:
+        audit_cache.put(key, report)
+    return JSONResponse(content=report, headers={"X-Cache": "MISS"})
+
+
 def _coerce_favorable(df: pd.DataFrame, outcome_col: str, favorable_value: str) -> tuple[pd.DataFrame, Any]:
     """
     Try to coerce the favorable_value to match the dtype of outcome_col.
@@ -127,11 +345,61 @@ def _validate_columns(df: pd.DataFrame, race_col: str, outcome_col: str) -> None
         raise HTTPException(status_code=400, detail="Dataset is empty.")
 
 
+def _read_mapped(
+    fileobj, fmt: str, compression: str | None, columns: list[str] | None, dtype: dict | None
+) -> pd.DataFrame:
+    with mapped_upload(fileobj) as source:
+        return read_table(source, fmt, columns=columns, dtype=dtype, engine=CSV_ENGINE, compression=compression)
+
+
+async def _read_upload(
+    file: UploadFile,
+    columns: list[str] | None = None,
+    dtype: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Read an uploaded CSV, Parquet or Arrow IPC file into a DataFrame.
+
+    The format is chosen from the part's content type, then the filename
+    extension; gzip and zstd CSVs are decompressed as they are parsed. Only
+    ``columns`` are parsed (typed with ``dtype``); pass None to keep every
+    column (e.g. when the rows are echoed back).
+
+    The upload size limit applies to what is actually loaded: the in-memory
+    size of the projected columns, or the raw file size when every column is
+    kept (plus the loaded size, for a compressed file). A wide file whose
+    audit columns are small is therefore accepted.
+    """
+    if columns is None and (file.size or 0) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
+    fmt, compression = _upload_format(file)
+    try:
+        df = await _run_io(_read_mapped, file.file, fmt, compression, columns=columns, dtype=dtype)
+    except MissingColumnsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ImportError as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
+    if (columns is not None or compression is not None) and (
+        df.memory_usage(index=False, deep=True).sum() > MAX_UPLOAD_BYTES
+    ):
+        raise HTTPException(
+            status_code=413,
+            detail=f"Columns {list(df.columns)} exceed the {MAX_UPLOAD_MB}MB upload limit.",
+        )
+    return df
+
+
 def _compute_group_rates(df: pd.DataFrame, race_col: str, outcome_col: str, favorable: Any) -> dict[str, float]:
-    """Return favorable outcome rate per group as a plain dict (vectorized)."""
-    binary = (df[outcome_col] == favorable).astype(float)
-    rates = binary.groupby(df[race_col]).mean().round(4)
-    return {str(k): float(v) for k, v in rates.items()}
+    """Return favorable outcome rate per group as a plain dict (single bincount pass)."""
+    rates = outcome_counts(df, race_col, outcome_col, favorable).rate_dict(decimals=4)
+    return {str(k): v for k, v in rates.items()}
+
+
+def _upload_group_rates(df: pd.DataFrame, race_col: str, outcome_col: str, favorable_value: str) -> dict[str, float]:
+    """Validate an uploaded frame, coerce ``favorable_value`` and return its per-group rates (run on the io pool)."""
+    _validate_columns(df, race_col, outcome_col)
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    return _compute_group_rates(df, race_col, outcome_col, favorable)
 
 
 def _build_audit_report(
@@ -145,141 +413,139 @@ def _build_audit_report(
     df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
     _validate_columns(df, race_col, outcome_col)
 
-    # Community-defined threshold — the core differentiator of this framework.
-    # If the community set a threshold, use it. Otherwise fall back to EEOC 0.8.
-    di_threshold: float = float(community_defs.get("fairness_threshold", DI_THRESHOLD_DEFAULT))
-
-    # Bias score — requires a numeric binary column
-    df['_binary_outcome'] = (df[outcome_col] == favorable).astype(float)
-    bias_result = calculate_racial_bias_score(df, sensitive_column=race_col, outcome_column='_binary_outcome')
-    group_outcomes: dict[str, float] = {str(k): round(float(v), 4) for k, v in bias_result["group_outcomes"].items()}
-    disparity_score: float = float(bias_result["racial_disparity_score"])
-
-    # Determine reference (privileged) group.
-    # Default: White. Rationale — this tool measures systemic racial disadvantage,
-    # which is historically directional. White is the standard reference in EEOC
-    # Disparate Impact analysis. Falls back to highest-rate group if White is not
-    # present in the dataset, or uses caller-supplied privileged_group if provided.
-    DEFAULT_REF_GROUP = "White"
-    if privileged_group and privileged_group in group_outcomes:
-        ref_group = privileged_group
-    elif DEFAULT_REF_GROUP in group_outcomes:
-        ref_group = DEFAULT_REF_GROUP
-    else:
-        if privileged_group:
-            logger.warning(
-                "privileged_group '%s' not found in data — falling back to highest-rate group.",
-                privileged_group,
-            )
-        else:
-            logger.info(
-                "'%s' not found in dataset — falling back to highest-rate group as reference.",
-                DEFAULT_REF_GROUP,
-            )
-        ref_group = max(group_outcomes, key=lambda g: group_outcomes[g])
-
-    ref_rate = group_outcomes[ref_group]
-
-    # Disparate Impact per group
-    di_ratios: dict[str, float | None] = {}
-    for group in group_outcomes:
-        if group == ref_group:
-            di_ratios[group] = 1.0
-            continue
-        di = disparate_impact(
-            data=df,
-            race_col=race_col,
-            outcome_col=outcome_col,
-            privileged=ref_group,
-            unprivileged=group,
-            favorable=favorable,
-        )
-        di_ratios[group] = round(float(di), 4) if di is not None else None
-
-    # Statistical parity gap = max rate − min rate (in percentage points)
-    all_rates = list(group_outcomes.values())
-    stat_parity_gap = round((max(all_rates) - min(all_rates)) * 100, 2) if all_rates else 0.0
-
-    # Flagged groups — uses community-defined threshold, not hardcoded 0.8
-    flagged_groups = [g for g, di in di_ratios.items() if di is not None and di < di_threshold]
-
-    # Plain-English findings
-    findings: list[str] = []
-    for group, rate in group_outcomes.items():
-        if group == ref_group:
-            continue
-        di = di_ratios.get(group)
-        pct = round(rate * 100)
-        ref_pct = round(ref_rate * 100)
-        if di is None:
-            findings.append(
-                f"{group} applicants had a favorable outcome rate of {pct}%; "
-                f"Disparate Impact is undefined because the reference group ({ref_group}) "
-                f"has no positive outcomes."
-            )
-        elif di < di_threshold:
-            severity = "substantially below" if di < 0.5 else "below"
-            findings.append(
-                f"{group} applicants had a favorable outcome rate of {pct}% compared to "
-                f"{ref_pct}% for the reference group ({ref_group}), "
-                f"a Disparate Impact ratio of {di:.2f} — {severity} the {di_threshold} threshold."
-            )
-        else:
-            findings.append(
-                f"{group} applicants had a favorable outcome rate of {pct}% compared to "
-                f"{ref_pct}% for the reference group ({ref_group}), "
-                f"a Disparate Impact ratio of {di:.2f} — within the acceptable range."
-            )
+    # One pass over the data yields every group's favorable/total counts;
+    # the bias score, DI ratios and parity gap are all derived from them.
+    counts = outcome_counts(df, race_col, outcome_col, favorable)
+    return _audit_report_from_counts(counts, outcome_col, favorable_value, privileged_group, len(df))
 
-    findings.append(
-        f"The overall Statistical Parity Gap across all groups is "
-        f"{stat_parity_gap:.0f} percentage points."
-    )
 
-    # Recommendation
-    n = len(flagged_groups)
-    if flagged_groups:
-        group_word = "group falls" if n == 1 else "groups fall"
-        recommendation = (
-            f"Immediate review recommended. {n} {group_word} below the "
-            f"Disparate Impact threshold of {di_threshold} ({', '.join(flagged_groups)}), which may indicate "
-            f"discriminatory outcomes under the 4/5ths rule."
+def _build_intersectional_report(
+    df: pd.DataFrame,
+    group_cols: list[str],
+    outcome_col: str,
+    favorable_value: str,
+    min_cell_size: int,
+    privileged_group: str | None,
+) -> dict:
+    """Core logic for /audit/intersectional."""
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    if df.empty:
+        raise HTTPException(status_code=400, detail="Dataset is empty.")
+    try:
+        return intersectional_audit(
+            df,
+            group_cols,
+            outcome_col,
+            favorable,
+            community_defs,
+            min_cell_size=min_cell_size,
+            favorable_value=favorable_value,
+            privileged_group=privileged_group,
         )
-    else:
-        recommendation = (
-            "The data shows no statistically significant disparate impact across analyzed groups. "
-            f"All groups meet or exceed the {di_threshold} Disparate Impact threshold."
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _audit_report_from_counts(
+    counts: GroupCounts,
+    outcome_col: str,
+    favorable_value: str,
+    privileged_group: str | None,
+    total_records: int,
+) -> dict:
+    """Build the /audit report from per-group counts using the loaded community config."""
+    try:
+        return build_audit_report(
+            counts,
+            community_defs,
+            outcome_col=outcome_col,
+            favorable_value=favorable_value,
+            privileged_group=privileged_group,
+            total_records=total_records,
         )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    # Determine audit type based on community config provenance
-    audit_type = "community_valid" if is_community_valid(community_defs) else "standard"
-    provenance = community_defs.get("provenance", {})
 
-    return {
-        "status": "success",
-        "audit_type": audit_type,
-        "community_config": {
-            "priority_groups": community_defs.get("priority_groups", []),
-            "fairness_target": community_defs.get("fairness_target", ref_group),
-            "fairness_threshold": di_threshold,
-            "provenance": provenance if provenance else None,
-        },
-        "summary": {
-            "total_records": len(df),
-            "groups_analyzed": list(group_outcomes.keys()),
-            "outcome_column": outcome_col,
-            "favorable_value": favorable_value,
-            "flagged_groups": flagged_groups,
-        },
-        "metrics": {
-            "disparity_score": disparity_score,
-            "group_outcomes": group_outcomes,
-            "disparate_impact": di_ratios,
-            "statistical_parity_gap": stat_parity_gap,
-        },
-        "findings": findings,
-        "recommendation": recommendation,
-    }
+def _request_frame(request: JSONAuditRequest | JSONReweightRequest | MonitorEvents) -> pd.DataFrame:
+    """Build the DataFrame for a JSON request from its columnar or row-dict payload."""
+    if request.columns is not None:
+        return pd.DataFrame(request.columns)
+    return pd.DataFrame(request.data)
+
+
+def _json_audit_report(body: JSONAuditRequest) -> dict:
+    """/audit report for a row or columnar JSON body; the frame is built on the calling (io) thread."""
+    return _build_audit_report(
+        _request_frame(body), body.race_col, body.outcome_col, body.favorable_value, body.privileged_group,
+    )
+
+
+def _json_reweight_report(body: JSONReweightRequest) -> dict:
+    """/reweight JSON report for a row or columnar JSON body; the frame is built on the calling (io) thread."""
+    return _build_reweight_report(
+        _request_frame(body), body.race_col, body.outcome_col, body.favorable_value, body.weights_only,
+    )
+
+
+def _request_rows(request: JSONAuditRequest | JSONReweightRequest) -> int:
+    if request.columns is not None:
+        return len(next(iter(request.columns.values())))
+    return len(request.data)
+
+
+def _counts_from_mapping(mapping: dict) -> GroupCounts:
+    """Convert a pre-aggregated ``{group: {favorable, total}}`` payload, mapping errors to 400."""
+    if isinstance(mapping, dict):
+        mapping = {
+            str(group): entry.model_dump() if isinstance(entry, GroupCount) else entry
+            for group, entry in mapping.items()
+        }
+    try:
+        return GroupCounts.from_mapping(mapping)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid counts: {exc}") from exc
+
+
+def _stream_counts(
+    fileobj,
+    fmt: str,
+    race_col: str,
+    outcome_col: str,
+    favorable_value: str,
+    chunksize: int = STREAM_CHUNK_ROWS,
+    compression: str | None = None,
+    column_dtypes: dict | None = None,
+    all_columns: bool = False,
+) -> tuple[GroupCounts, int]:
+    """
+    Read a dataset in chunks, keeping only running per-group counts.
+
+    Each chunk is counted and discarded, so peak memory is one chunk plus
+    O(groups) regardless of file size. Returns the merged counts and the
+    total number of rows read. Only the group and outcome columns are
+    parsed unless ``all_columns``; when ``column_dtypes`` is given, each
+    parsed column's dtype in every chunk is added to the set
+    ``column_dtypes[column]``.
+    """
+    counts = GroupCounts()
+    n_rows = 0
+    with mapped_upload(fileobj) as source:
+        chunks = iter_batches(
+            source, fmt, columns=None if all_columns else [race_col, outcome_col], batch_rows=chunksize,
+            dtype=audit_dtypes(race_col), compression=compression,
+        )
+        for chunk in chunks:
+            _validate_columns(chunk, race_col, outcome_col)
+            if column_dtypes is not None:
+                for col, col_dtype in chunk.dtypes.items():
+                    column_dtypes.setdefault(col, set()).add(col_dtype)
+            chunk, favorable = _coerce_favorable(chunk, outcome_col, favorable_value)
+            counts = counts.merge(outcome_counts(chunk, race_col, outcome_col, favorable))
+            n_rows += len(chunk)
+    if n_rows == 0:
+        raise HTTPException(status_code=400, detail="Dataset is empty.")
+    return counts, n_rows
 
 
 def _build_reweight_report(
@@ -287,6 +553,7 @@ def _build_reweight_report(
     race_col: str,
     outcome_col: str,
     favorable_value: str,
+    weights_only: bool = False,
 ) -> dict:
     """Core logic for /reweight — shared between CSV and JSON paths."""
     df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
@@ -294,21 +561,20 @@ def _build_reweight_report(
 
     original_rates = _compute_group_rates(df, race_col, outcome_col, favorable)
 
-    reweighted_df = reweight_samples_with_community(
-        data=df.copy(),
-        race_col=race_col,
-        outcome_col=outcome_col,
-        favorable=favorable,
-        community_defs=community_defs,
-    )
-
-    reweighted_df['sample_weight'] = reweighted_df['sample_weight'].round(4)
-    reweighted_records = reweighted_df.to_dict(orient="records")
+    table = reweight_table(df, race_col, outcome_col, favorable, community_defs)
+    weights = table.apply_weights(df).round(4)
+    if weights_only:
+        reweighted_records = export.weights_frame(weights, 0).to_dict(orient="records")
+    else:
+        # df is already this request's private frame — attach the column in place.
+        df['sample_weight'] = weights
+        reweighted_records = df.to_dict(orient="records")
 
     return {
         "status": "success",
-        "records": len(reweighted_df),
+        "records": len(df),
         "reweighted_data": reweighted_records,
+        "weight_table": _rounded_weight_table(table),
         "summary": {
             "original_group_rates": original_rates,
             "target_group": community_defs.get("fairness_target", "unknown"),
@@ -317,6 +583,114 @@ def _build_reweight_report(
     }
 
 
+def _weighted_frames(
+    batches,
+    table: ReweightTable,
+    race_col: str,
+    outcome_col: str,
+    favorable_value: str,
+    weights_only: bool,
+):
+    """
+    Yield each batch with its ``sample_weight`` column, or just ``row`` and
+    ``sample_weight`` when ``weights_only`` — one batch in memory at a time.
+    """
+    start = 0
+    for batch in batches:
+        batch, favorable = _coerce_favorable(batch, outcome_col, favorable_value)
+        weights = table.apply_weights(batch, race_col, outcome_col, favorable).round(4)
+        if weights_only:
+            yield export.weights_frame(weights, start)
+        else:
+            batch["sample_weight"] = weights
+            yield batch
+        start += len(batch)
+
+
+def _common_dtype(dtypes) -> str:
+    """One dtype that holds every chunk's values: int64, float64 or bool when all agree, else str."""
+    dtypes = list(dtypes)
+    if dtypes and all(pd.api.types.is_bool_dtype(d) for d in dtypes):
+        return "bool"
+    numeric = [pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in dtypes]
+    if dtypes and all(numeric):
+        return "int64" if all(pd.api.types.is_integer_dtype(d) for d in dtypes) else "float64"
+    return "str"
+
+
+def _upload_batches(fileobj, fmt: str, compression: str | None, columns: list[str] | None, dtype: dict):
+    """
+    Re-read an upload from the start in STREAM_CHUNK_ROWS batches — the
+    second pass of a streamed export, parsed like :func:`_stream_counts`.
+    """
+    with mapped_upload(fileobj) as source:
+        yield from iter_batches(
+            source, fmt, columns=columns, batch_rows=STREAM_CHUNK_ROWS, dtype=dtype, compression=compression,
+        )
+
+
+def _export_response(frames, fmt: str, n_rows: int, weights_only: bool) -> StreamingResponse:
+    """
+    Stream ``frames`` as ``fmt``. Each chunk is produced on the io executor,
+    so neither the event loop nor memory sees more than one batch at a time.
+    """
+    try:
+        chunks = export.serialize_frames(frames, fmt)
+    except ImportError as exc:
+        raise HTTPException(status_code=406, detail=str(exc)) from exc
+
+    async def body():
+        while True:
+            chunk = await _run_io(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    filename = f"{'weights' if weights_only else 'reweighted'}.{export.FILE_EXTENSIONS[fmt]}"
+    return StreamingResponse(
+        body(),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Records": str(n_rows)},
+    )
+
+
+def _negotiated_format(request: Request) -> str:
+    fmt = export.negotiate_format(request.headers.get("accept"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=406,
+            detail="Supported response types: " + ", ".join(export.MEDIA_TYPES.values()) + ".",
+        )
+    return fmt
+
+
+def _rounded_weight_table(table: ReweightTable) -> dict:
+    """``{group: {"favorable": w, "unfavorable": w}}`` with weights rounded for responses."""
+    return {
+        str(group): {outcome: round(w, 4) for outcome, w in weights.items()}
+        for group, weights in table.to_dict()["weights"].items()
+    }
+
+
+def _build_reweight_report_from_counts(counts: GroupCounts) -> dict:
+    """Core logic for /reweight on pre-aggregated counts — returns the weight table, not rows."""
+    try:
+        table = ReweightTable.from_counts(counts, community_defs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return {
+        "status": "success",
+        "records": counts.n_records,
+        "weight_table": _rounded_weight_table(table),
+        "summary": {
+            "original_group_rates": {str(g): round(r, 4) for g, r in table.group_rates.items()},
+            "target_group": table.target_group,
+            "priority_groups": community_defs.get("priority_groups", []),
+        },
+    }
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -327,77 +701,509 @@ async def health() -> dict:
     return {"status": "ok", "version": "1.0.0"}
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics() -> dict:
+    """Queue depth and throughput of the io and cpu executors, audit cache hit rates and admission counters."""
+    return {
+        "executors": {name: executor.metrics() for name, executor in executors.items()},
+        "audit_cache": audit_cache.metrics(),
+        "registry": config_registry.metrics(),
+        "admission": admission.metrics() if admission is not None else {},
+    }
+
+
 # ---------- /audit ----------------------------------------------------------
 
 @app.post("/audit", tags=["Audit"])
-async def audit_json(request: JSONAuditRequest) -> JSONResponse:
-    """Audit a dataset supplied as a JSON body."""
+async def audit_json(body: JSONAuditRequest, request: Request) -> JSONResponse:
+    """Audit a dataset supplied as a JSON body — row dicts or pre-aggregated group counts."""
+    key = await _body_cache_key("audit-json", await request.body())
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+
+    if body.counts is not None:
+        logger.info(
+            "POST /audit (JSON) — %d groups (pre-aggregated), race_col=%s, outcome_col=%s",
+            len(body.counts),
+            body.race_col,
+            body.outcome_col,
+        )
+        counts = _counts_from_mapping(body.counts)
+        report = _audit_report_from_counts(
+            counts,
+            body.outcome_col,
+            body.favorable_value,
+            body.privileged_group,
+            counts.n_records,
+        )
+        return _store_json(key, report)
+
     logger.info(
         "POST /audit (JSON) — %d records, race_col=%s, outcome_col=%s",
-        len(request.data),
-        request.race_col,
-        request.outcome_col,
+        _request_rows(body),
+        body.race_col,
+        body.outcome_col,
     )
     try:
-        df = pd.DataFrame(request.data)
-        report = _build_audit_report(
+        report = await _run_io(_json_audit_report, body)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit (JSON)")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    return _store_json(key, report)
+
+
+def _columnar_audit_report(raw_body: bytes) -> dict:
+    """Core logic for /audit/columnar — decode, validate and audit the raw body (run on the io pool)."""
+    try:
+        body = json.loads(raw_body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {exc}") from exc
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object.")
+
+    columns = body.pop("columns", None)
+    if not isinstance(columns, dict) or not columns or not all(isinstance(v, list) for v in columns.values()):
+        raise HTTPException(status_code=400, detail="'columns' must be an object mapping column names to lists.")
+    try:
+        check_columns(columns)
+        params = ColumnarAuditParams.model_validate(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    logger.info(
+        "POST /audit/columnar — %d records, race_col=%s, outcome_col=%s",
+        len(next(iter(columns.values()))),
+        params.race_col,
+        params.outcome_col,
+    )
+    missing = [c for c in (params.race_col, params.outcome_col) if c not in columns]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Column(s) not found in data: {missing}. Available columns: {list(columns)}",
+        )
+    df = pd.DataFrame({c: columns[c] for c in (params.race_col, params.outcome_col)})
+    return _build_audit_report(
+        df=df,
+        race_col=params.race_col,
+        outcome_col=params.outcome_col,
+        favorable_value=params.favorable_value,
+        privileged_group=params.privileged_group,
+    )
+
+
+@app.post("/audit/columnar", tags=["Audit"])
+async def audit_columnar(request: Request) -> JSONResponse:
+    """
+    Audit a columnar JSON body without per-row model validation.
+
+    The body has the same shape as a columnar /audit request —
+    ``{"columns": {"race": [...], "hired": [...]}, "race_col": ..., "outcome_col": ...,
+    "favorable_value": ..., "privileged_group": ...}`` — but only the scalar
+    parameters go through pydantic. The column lists are handed straight to
+    pandas, and only the race and outcome columns are materialized. Decoding
+    and the frame build run on the io pool with the audit itself.
+    """
+    raw_body = await request.body()
+    key = await _body_cache_key("audit-columnar", raw_body)
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+    try:
+        report = await _run_io(_columnar_audit_report, raw_body)
+    except (HTTPException, RequestValidationError):
+        raise
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit/columnar")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    return _store_json(key, report)
+
+
+@app.post("/audit/csv", tags=["Audit"])
+async def audit_csv(
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to audit."),
+    race_col: str = Form(...),
+    outcome_col: str = Form(...),
+    favorable_value: str = Form(...),
+    privileged_group: str | None = Form(default=None),
+) -> JSONResponse:
+    """Audit a dataset supplied as a CSV file upload (multipart/form-data)."""
+    logger.info(
+        "POST /audit/csv — file=%s, race_col=%s, outcome_col=%s",
+        file.filename,
+        race_col,
+        outcome_col,
+    )
+    key = _upload_cache_key(
+        "audit-upload", file, await _upload_digest(file),
+        race_col, outcome_col, favorable_value, privileged_group, community_defs_digest,
+    )
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+    try:
+        df = await _read_upload(
+            file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col)
+        )
+        report = await _run_io(
+            _build_audit_report,
             df=df,
-            race_col=request.race_col,
-            outcome_col=request.outcome_col,
-            favorable_value=request.favorable_value,
-            privileged_group=request.privileged_group,
+            race_col=race_col,
+            outcome_col=outcome_col,
+            favorable_value=favorable_value,
+            privileged_group=privileged_group,
         )
     except HTTPException:
         raise
     except Exception as exc:
-        logger.exception("Unexpected error during /audit (JSON)")
+        logger.exception("Unexpected error during /audit/csv")
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
 
-    return JSONResponse(content=report)
+    return _store_json(key, report)
+
+
+@app.post("/audit/csv/stream", tags=["Audit"])
+async def audit_csv_stream(
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to audit, of any size."),
+    race_col: str = Form(...),
+    outcome_col: str = Form(...),
+    favorable_value: str = Form(...),
+    privileged_group: str | None = Form(default=None),
+) -> JSONResponse:
+    """
+    Audit a CSV upload of any size by streaming it in chunks.
+
+    Returns the same report as /audit/csv. Only running per-group counts are
+    kept in memory, so the upload size limit does not apply.
+    """
+    logger.info(
+        "POST /audit/csv/stream — file=%s, race_col=%s, outcome_col=%s",
+        file.filename,
+        race_col,
+        outcome_col,
+    )
+    # Same report as /audit/csv, so the two endpoints share cache entries.
+    key = _upload_cache_key(
+        "audit-upload", file, await _upload_digest(file),
+        race_col, outcome_col, favorable_value, privileged_group, community_defs_digest,
+    )
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+    fmt, compression = _upload_format(file)
+    try:
+        counts, n_rows = await _run_io(
+            _stream_counts,
+            file.file,
+            fmt,
+            race_col,
+            outcome_col,
+            favorable_value,
+            chunksize=STREAM_CHUNK_ROWS,
+            compression=compression,
+        )
+        report = _audit_report_from_counts(counts, outcome_col, favorable_value, privileged_group, n_rows)
+    except HTTPException:
+        raise
+    except MissingColumnsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ImportError as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit/csv/stream")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    return _store_json(key, report)
+
+
+# ---------- /audit/intersectional -------------------------------------------
+
+@app.post("/audit/intersectional", tags=["Audit"])
+async def audit_intersectional(
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to audit."),
+    group_cols: str = Form(..., description="Comma-separated group columns to cross, e.g. 'derived_race,derived_sex'."),
+    outcome_col: str = Form(...),
+    favorable_value: str = Form(...),
+    min_cell_size: int = Form(
+        default=MIN_CELL_SIZE_DEFAULT, ge=1, description="Intersections with fewer rows are suppressed."
+    ),
+    privileged_group: str | None = Form(
+        default=None, description="Reference intersection, e.g. 'White × Male'. Defaults to the highest-rate cell."
+    ),
+) -> JSONResponse:
+    """
+    Audit every intersection of several group columns (e.g. race x sex x age band).
+
+    Each occupied cell is audited as a group labelled ``"A × B × C"``;
+    cells smaller than ``min_cell_size`` are left out and summarized under
+    ``intersections``.
+    """
+    parsed_cols = list(dict.fromkeys(c.strip() for c in group_cols.split(",") if c.strip()))
+    if not parsed_cols:
+        raise HTTPException(status_code=400, detail="group_cols cannot be empty.")
+    logger.info(
+        "POST /audit/intersectional — file=%s, group_cols=%s, outcome_col=%s, min_cell_size=%d",
+        file.filename, parsed_cols, outcome_col, min_cell_size,
+    )
+    key = _upload_cache_key(
+        "audit-intersectional", file, await _upload_digest(file),
+        parsed_cols, outcome_col, favorable_value, min_cell_size, privileged_group, community_defs_digest,
+    )
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+    try:
+        df = await _read_upload(
+            file, columns=[*parsed_cols, outcome_col], dtype={c: "category" for c in parsed_cols}
+        )
+        report = await _run_io(
+            _build_intersectional_report,
+            df=df,
+            group_cols=parsed_cols,
+            outcome_col=outcome_col,
+            favorable_value=favorable_value,
+            min_cell_size=min_cell_size,
+            privileged_group=privileged_group,
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit/intersectional")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    return _store_json(key, report)
+
+
+# ---------- /audit/bootstrap ------------------------------------------------
+
+def _bootstrap_upload(
+    df: pd.DataFrame,
+    race_col: str,
+    outcome_col: str,
+    favorable_value: str,
+    method: str,
+    **options,
+) -> dict:
+    """Core logic for /audit/bootstrap on an upload — count or row-level replicates."""
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    _validate_columns(df, race_col, outcome_col)
+    if method == "rows":
+        return bootstrap_audit_rows(df, race_col, outcome_col, favorable, community_defs, **options)
+    counts = outcome_counts(df, race_col, outcome_col, favorable)
+    return bootstrap_audit(counts, community_defs, method=method, **options)
+
+
+@app.post("/audit/bootstrap", tags=["Audit"])
+async def audit_bootstrap(
+    file: UploadFile | None = File(default=None, description="CSV, Parquet or Arrow IPC file to audit."),
+    race_col: str = Form(...),
+    outcome_col: str = Form(...),
+    favorable_value: str | None = Form(default=None, description="Favorable outcome value. Required with file."),
+    counts_json: str | None = Form(
+        default=None,
+        description='Pre-aggregated per-group counts, {"group": {"favorable": f, "total": n}}. Use instead of file.',
+    ),
+    privileged_group: str | None = Form(default=None),
+    n_replicates: int = Form(default=10_000, ge=1, le=100_000),
+    confidence: float = Form(default=0.95, gt=0, lt=1),
+    method: str = Form(
+        default="binomial",
+        description="'binomial' (group sizes fixed), 'multinomial' (total fixed) or 'rows' (row-level, file only).",
+    ),
+    seed: int | None = Form(default=None, description="Random seed; seeded results are cached."),
+) -> JSONResponse:
+    """
+    Bootstrap confidence intervals for per-group DI and the disparity score,
+    and the probability that each group is flagged at the community threshold.
+
+    Replicates are drawn on the per-group contingency table, so 10,000 of
+    them cost milliseconds; ``method=rows`` resamples rows within each group
+    instead.
+    """
+    logger.info(
+        "POST /audit/bootstrap — file=%s, race_col=%s, outcome_col=%s, method=%s, replicates=%d",
+        file.filename if file is not None else "<counts>", race_col, outcome_col, method, n_replicates,
+    )
+    if method not in ("binomial", "multinomial", "rows"):
+        raise HTTPException(status_code=400, detail=f"Unknown method '{method}'.")
+    if (file is None) == (counts_json is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of 'file' (CSV upload) or 'counts_json' (per-group counts).",
+        )
+    if counts_json is not None and method == "rows":
+        raise HTTPException(status_code=400, detail="method 'rows' needs a file upload, not counts_json.")
+
+    params = (race_col, outcome_col, favorable_value, privileged_group, n_replicates, confidence, method, seed,
+              community_defs_digest)
+    if file is not None:
+        key = _upload_cache_key("audit-bootstrap", file, await _upload_digest(file), *params)
+    else:
+        key = cache_key("audit-bootstrap-counts", hashlib.sha256(counts_json.encode()).hexdigest(), *params)
+    if seed is not None:
+        cached = _cached_json(key)
+        if cached is not None:
+            return cached
+
+    options = {"privileged_group": privileged_group, "n_replicates": n_replicates,
+               "confidence": confidence, "seed": seed}
+    try:
+        if counts_json is not None:
+            try:
+                counts = _counts_from_mapping(json.loads(counts_json))
+            except json.JSONDecodeError as exc:
+                raise HTTPException(status_code=400, detail=f"Invalid counts_json: {exc}") from exc
+            total_records = counts.n_records
+            result = await _run_io(bootstrap_audit, counts, community_defs, method=method, **options)
+        else:
+            if not favorable_value:
+                raise HTTPException(status_code=400, detail="favorable_value is required with file.")
+            df = await _read_upload(file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col))
+            total_records = len(df)
+            if method == "rows" and n_replicates * total_records > BOOTSTRAP_MAX_ROW_DRAWS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{n_replicates} row-level replicates of {total_records} rows exceed the "
+                    f"{BOOTSTRAP_MAX_ROW_DRAWS:,} draw limit; use fewer replicates or method 'binomial'.",
+                )
+            result = await _run_io(
+                _bootstrap_upload, df, race_col, outcome_col, favorable_value, method, **options
+            )
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit/bootstrap")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    report = {"status": "success", "total_records": total_records, **result}
+    if seed is None:
+        return JSONResponse(content=report)
+    return _store_json(key, report)
+
+
+# ---------- /audit/threshold-sweep ------------------------------------------
+
+def _upload_counts(df: pd.DataFrame, race_col: str, outcome_col: str, favorable_value: str) -> GroupCounts:
+    """Per-group counts of an uploaded dataset, with the favorable value typed to its column."""
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    _validate_columns(df, race_col, outcome_col)
+    return outcome_counts(df, race_col, outcome_col, favorable)
+
+
+def _threshold_sweep_report(
+    counts: GroupCounts,
+    privileged_group: str | None,
+    theta_min: float,
+    theta_max: float,
+    steps: int,
+) -> dict:
+    """Core logic for /audit/threshold-sweep — flip thresholds and the flagged-count curve."""
+    sweep = ThresholdSweep.from_counts(counts, privileged_group)
+    thresholds = threshold_grid(theta_min, theta_max, steps)
+    threshold = float(community_defs.get("fairness_threshold", DI_THRESHOLD_DEFAULT))
+    # DI from unrounded rates, as the sweep and /audit compute it; only the reported rates are rounded.
+    rates = counts.rate_dict(decimals=4)
+    di_ratios = disparate_impact_ratios(counts.rate_dict(), sweep.reference)
+    flips = sweep.flip_thresholds()
+    # Groups in the order they flip, then those that never do (undefined DI, reference).
+    order = [*sweep.groups, *sweep.undefined, sweep.reference]
+    return {
+        "reference_group": sweep.reference,
+        "fairness_threshold": threshold,
+        "flagged_at_fairness_threshold": sweep.flagged_groups(threshold),
+        "groups": {
+            str(g): {"rate": rates[g], "disparate_impact": di_ratios[g], "flip_threshold": flips.get(g)}
+            for g in order
+        },
+        "sweep": sweep.curve(thresholds),
+    }
 
 
-@app.post("/audit/csv", tags=["Audit"])
-async def audit_csv(
-    file: UploadFile = File(..., description="CSV file to audit."),
+@app.post("/audit/threshold-sweep", tags=["Audit"])
+async def audit_threshold_sweep(
+    file: UploadFile | None = File(default=None, description="CSV, Parquet or Arrow IPC file to audit."),
     race_col: str = Form(...),
     outcome_col: str = Form(...),
-    favorable_value: str = Form(...),
+    favorable_value: str | None = Form(default=None, description="Favorable outcome value. Required with file."),
+    counts_json: str | None = Form(
+        default=None,
+        description='Pre-aggregated per-group counts, {"group": {"favorable": f, "total": n}}. Use instead of file.',
+    ),
     privileged_group: str | None = Form(default=None),
+    theta_min: float = Form(default=0.5, ge=0),
+    theta_max: float = Form(default=1.0, gt=0, le=10),
+    steps: int = Form(default=501, ge=2, le=SWEEP_MAX_STEPS, description="Thresholds on the curve, ends included."),
 ) -> JSONResponse:
-    """Audit a dataset supplied as a CSV file upload (multipart/form-data)."""
+    """
+    How many groups each DI threshold flags, over a dense grid of thresholds,
+    and the exact threshold at which every group flips from pass to fail.
+
+    A group with disparate impact ``d`` passes for every θ ≤ d and is flagged
+    for every θ > d, so its flip threshold is ``d`` itself. The curve is
+    computed from the DI values sorted once, so ``steps`` can be large
+    enough to explore the full landscape interactively.
+    """
     logger.info(
-        "POST /audit/csv — file=%s, race_col=%s, outcome_col=%s",
-        file.filename,
-        race_col,
-        outcome_col,
+        "POST /audit/threshold-sweep — file=%s, race_col=%s, outcome_col=%s, steps=%d",
+        file.filename if file is not None else "<counts>", race_col, outcome_col, steps,
     )
-    try:
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
-        report = _build_audit_report(
-            df=df,
-            race_col=race_col,
-            outcome_col=outcome_col,
-            favorable_value=favorable_value,
-            privileged_group=privileged_group,
+    if (file is None) == (counts_json is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of 'file' (CSV upload) or 'counts_json' (per-group counts).",
         )
+    if theta_min >= theta_max:
+        raise HTTPException(status_code=400, detail="theta_min must be below theta_max.")
+
+    params = (race_col, outcome_col, favorable_value, privileged_group, theta_min, theta_max, steps,
+              community_defs_digest)
+    if file is not None:
+        key = _upload_cache_key("audit-threshold-sweep", file, await _upload_digest(file), *params)
+    else:
+        key = cache_key("audit-threshold-sweep-counts", hashlib.sha256(counts_json.encode()).hexdigest(), *params)
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+
+    try:
+        if counts_json is not None:
+            try:
+                counts = _counts_from_mapping(json.loads(counts_json))
+            except json.JSONDecodeError as exc:
+                raise HTTPException(status_code=400, detail=f"Invalid counts_json: {exc}") from exc
+            total_records = counts.n_records
+        else:
+            if not favorable_value:
+                raise HTTPException(status_code=400, detail="favorable_value is required with file.")
+            df = await _read_upload(file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col))
+            total_records = len(df)
+            counts = await _run_io(_upload_counts, df, race_col, outcome_col, favorable_value)
+        result = await _run_io(_threshold_sweep_report, counts, privileged_group, theta_min, theta_max, steps)
     except HTTPException:
         raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
-        logger.exception("Unexpected error during /audit/csv")
+        logger.exception("Unexpected error during /audit/threshold-sweep")
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
 
-    return JSONResponse(content=report)
+    return _store_json(key, {"status": "success", "total_records": total_records, **result})
 
 
 # ---------- /audit/pdf ------------------------------------------------------
 
 @app.post("/audit/pdf", tags=["Audit"])
 async def audit_pdf(
-    file: UploadFile = File(..., description="CSV file to audit."),
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to audit."),
     race_col: str = Form(...),
     outcome_col: str = Form(...),
     favorable_value: str = Form(...),
@@ -410,20 +1216,31 @@ async def audit_pdf(
         race_col,
         outcome_col,
     )
+    digest = await _upload_digest(file)
+    params = (race_col, outcome_col, favorable_value, privileged_group, community_defs_digest)
+    pdf_key = _upload_cache_key("audit-pdf", file, digest, *params)
+    report_key = _upload_cache_key("audit-upload", file, digest, *params)
+    pdf_bytes = audit_cache.get(pdf_key)
+    cache_status = "HIT" if pdf_bytes is not None else "MISS"
     try:
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
-        report = _build_audit_report(
-            df=df,
-            race_col=race_col,
-            outcome_col=outcome_col,
-            favorable_value=favorable_value,
-            privileged_group=privileged_group,
-        )
-        pdf_bytes = generate_pdf_report(report)
+        if pdf_bytes is None:
+            # A cached /audit/csv report for the same upload skips straight to rendering.
+            report = audit_cache.get(report_key)
+            if report is None:
+                df = await _read_upload(
+                    file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col)
+                )
+                report = await _run_io(
+                    _build_audit_report,
+                    df=df,
+                    race_col=race_col,
+                    outcome_col=outcome_col,
+                    favorable_value=favorable_value,
+                    privileged_group=privileged_group,
+                )
+                audit_cache.put(report_key, report)
+            pdf_bytes = await _run_cpu(generate_pdf_report, report)
+            audit_cache.put(pdf_key, pdf_bytes)
     except HTTPException:
         raise
     except Exception as exc:
@@ -434,15 +1251,22 @@ async def audit_pdf(
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Cache": cache_status},
     )
 
 
 # ---------- /reweight -------------------------------------------------------
 
+def _reweighted_rates(df: pd.DataFrame, race_col: str, outcome_col: str, favorable_value: str) -> WeightedRates:
+    """Per-group outcome rates of ``df`` under the community reweighting — weights only, the frame is never copied."""
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    sample_weights = community_sample_weights(df, race_col, outcome_col, favorable, community_defs)
+    return weighted_group_rates(df[race_col], favorable_indicator(df[outcome_col], favorable), sample_weights)
+
+
 @app.post("/audit/remediate", tags=["Audit"])
 async def audit_remediate(
-    file: UploadFile = File(..., description="CSV file to audit and remediate."),
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to audit and remediate."),
     race_col: str = Form(...),
     outcome_col: str = Form(...),
     favorable_value: str = Form(...),
@@ -459,16 +1283,15 @@ async def audit_remediate(
         outcome_col,
     )
     try:
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
+        df = await _read_upload(
+            file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col)
+        )
 
         di_threshold = float(community_defs.get("fairness_threshold", DI_THRESHOLD_DEFAULT))
 
         # Step 1: Pre-mitigation audit
-        pre_report = _build_audit_report(
+        pre_report = await _run_io(
+            _build_audit_report,
             df=df,
             race_col=race_col,
             outcome_col=outcome_col,
@@ -486,44 +1309,19 @@ async def audit_remediate(
                 "delta": None,
             })
 
-        # Step 2: Reweight
-        df_copy, favorable = _coerce_favorable(df.copy(), outcome_col, favorable_value)
-        reweighted_df = reweight_samples_with_community(
-            data=df_copy,
-            race_col=race_col,
-            outcome_col=outcome_col,
-            favorable=favorable,
-            community_defs=community_defs,
-        )
-
-        # Step 3: Post-mitigation metrics — computed from weighted outcome rates.
+        # Steps 2-3: Reweight, then post-mitigation metrics from weighted outcome rates.
         # Instead of simulating random outcomes (which is non-deterministic and
         # mathematically incoherent), we compute what the group outcome rates
         # *would be* under the reweighted distribution and report those directly.
-        binary = (reweighted_df[outcome_col] == favorable).astype(float)
-        sw = reweighted_df["sample_weight"].fillna(1.0)
-
-        post_group_rates: dict[str, float] = {}
-        for group in reweighted_df[race_col].unique():
-            mask = reweighted_df[race_col] == group
-            weighted_sum = (binary[mask] * sw[mask]).sum()
-            weight_total = sw[mask].sum()
-            post_group_rates[str(group)] = round(float(weighted_sum / weight_total), 4) if weight_total > 0 else 0.0
+        weighted = await _run_io(_reweighted_rates, df, race_col, outcome_col, favorable_value)
+        post_group_rates = {str(g): rate for g, rate in weighted.rate_dict(decimals=4).items()}
+        effective_n = {str(g): round(float(n), 1) for g, n in zip(weighted.labels, weighted.effective_n)}
 
         # Compute post-mitigation DI using same reference group as pre-report
         pre_ref_group = privileged_group or community_defs.get("fairness_target", "White")
         if pre_ref_group not in post_group_rates:
             pre_ref_group = max(post_group_rates, key=lambda g: post_group_rates[g])
-        post_ref_rate = post_group_rates.get(pre_ref_group, 0.0)
-
-        post_di: dict[str, float | None] = {}
-        for group, rate in post_group_rates.items():
-            if group == pre_ref_group:
-                post_di[group] = 1.0
-            elif post_ref_rate == 0:
-                post_di[group] = None
-            else:
-                post_di[group] = round(rate / post_ref_rate, 4)
+        post_di = disparate_impact_ratios(post_group_rates, pre_ref_group)
 
         post_flagged = [g for g, di in post_di.items() if di is not None and di < di_threshold]
 
@@ -532,7 +1330,7 @@ async def audit_remediate(
             "audit_type": pre_report["audit_type"],
             "community_config": pre_report["community_config"],
             "summary": {
-                "total_records": len(reweighted_df),
+                "total_records": len(df),
                 "groups_analyzed": list(post_group_rates.keys()),
                 "outcome_column": outcome_col,
                 "favorable_value": favorable_value,
@@ -543,6 +1341,7 @@ async def audit_remediate(
                 "group_outcomes": post_group_rates,
                 "disparate_impact": post_di,
                 "statistical_parity_gap": round((max(post_group_rates.values()) - min(post_group_rates.values())) * 100, 2),
+                "effective_sample_size": effective_n,
             },
             "note": "Post-mitigation metrics are computed from weighted outcome rates, not from a new model.",
         }
@@ -579,9 +1378,35 @@ async def audit_remediate(
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
 
 
+async def _debias_input(
+    file: UploadFile,
+    race_col: str,
+    outcome_col: str,
+    favorable_value: str,
+    feature_cols: str,
+    constraint: str,
+) -> tuple[pd.DataFrame, dict]:
+    """Read a debias upload; returns the frame and the pipeline's keyword arguments."""
+    parsed_features = [c.strip() for c in feature_cols.split(",") if c.strip()]
+    if not parsed_features:
+        raise HTTPException(status_code=400, detail="feature_cols cannot be empty.")
+
+    df = await _read_upload(
+        file, columns=[race_col, outcome_col, *parsed_features], dtype=audit_dtypes(race_col)
+    )
+    df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
+    return df, {
+        "feature_cols": parsed_features,
+        "outcome_col": outcome_col,
+        "sensitive_col": race_col,
+        "favorable_value": favorable,
+        "constraint": constraint,
+    }
+
+
 @app.post("/audit/debias", tags=["Audit"])
 async def audit_debias(
-    file: UploadFile = File(..., description="CSV file to debias."),
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to debias."),
     race_col: str = Form(..., description="Sensitive attribute (race/ethnicity) column name."),
     outcome_col: str = Form(..., description="Outcome column name."),
     favorable_value: str = Form(..., description="Value in outcome column that counts as favorable."),
@@ -605,27 +1430,8 @@ async def audit_debias(
         file.filename, race_col, outcome_col, feature_cols,
     )
     try:
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
-
-        parsed_features = [c.strip() for c in feature_cols.split(",") if c.strip()]
-        if not parsed_features:
-            raise HTTPException(status_code=400, detail="feature_cols cannot be empty.")
-
-        df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
-
-        result = adversarial_fairness_pipeline(
-            data=df,
-            feature_cols=parsed_features,
-            outcome_col=outcome_col,
-            sensitive_col=race_col,
-            favorable_value=favorable,
-            constraint=constraint,
-        )
+        df, params = await _debias_input(file, race_col, outcome_col, favorable_value, feature_cols, constraint)
+        result = await _run_cpu(adversarial_fairness_pipeline, data=df, **params)
     except HTTPException:
         raise
     except (ValueError, ImportError) as exc:
@@ -637,16 +1443,262 @@ async def audit_debias(
     return JSONResponse(content=result)
 
 
+# ---------- /jobs -----------------------------------------------------------
+
+@app.post("/jobs/debias", tags=["Jobs"], status_code=202)
+async def submit_debias_job(
+    request: Request,
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to debias."),
+    race_col: str = Form(..., description="Sensitive attribute (race/ethnicity) column name."),
+    outcome_col: str = Form(..., description="Outcome column name."),
+    favorable_value: str = Form(..., description="Value in outcome column that counts as favorable."),
+    feature_cols: str = Form(..., description="Comma-separated list of feature columns to use for model training."),
+    constraint: str = Form(default="demographic_parity", description="Fairness constraint: 'demographic_parity'."),
+) -> JSONResponse:
+    """
+    Queue an /audit/debias run and return its job id immediately.
+
+    Takes the same form fields as /audit/debias. Poll ``GET /jobs/{job_id}``
+    for progress; once ``status`` is ``succeeded`` its ``result`` holds the
+    /audit/debias response. Each API key may have at most
+    ``JOBS_MAX_PER_KEY`` queued or running jobs (429 beyond that).
+    """
+    logger.info(
+        "POST /jobs/debias — file=%s, race_col=%s, outcome_col=%s, features=%s",
+        file.filename, race_col, outcome_col, feature_cols,
+    )
+    owner = _owner(request)
+    try:
+        await _run_io(job_store.check_limit, owner, JOBS_MAX_PER_KEY)
+        df, params = await _debias_input(file, race_col, outcome_col, favorable_value, feature_cols, constraint)
+        job_id = await _run_io(job_store.create, "debias", owner, params, df, JOBS_MAX_PER_KEY)
+    except JobLimitError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    _schedule_job(job_id)
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"},
+    )
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str, request: Request) -> JSONResponse:
+    """Status, progress (0–1) and — once finished — the result or error of a job."""
+    # SQLite may wait on a worker's write lock: keep it off the event loop.
+    job = await _run_io(job_store.get, job_id, _owner(request))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return JSONResponse(content=job)
+
+
+@app.delete("/jobs/{job_id}", tags=["Jobs"])
+async def cancel_job(job_id: str, request: Request) -> JSONResponse:
+    """
+    Cancel a queued or running job.
+
+    A queued job never starts; a running one stops at its next pipeline
+    stage. Finished jobs are returned unchanged.
+    """
+    job = await _run_io(job_store.cancel, job_id, _owner(request))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return JSONResponse(content=job)
+
+
+# ---------- /monitor --------------------------------------------------------
+
+def _monitor_entry(request: Request, monitor_id: str) -> dict:
+    entry = monitors.get((_owner(request), monitor_id))
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Monitor '{monitor_id}' not found.")
+    return entry
+
+
+def _monitor_status(monitor_id: str, entry: dict) -> dict:
+    monitor: RollingAuditMonitor = entry["monitor"]
+    return {
+        "monitor_id": monitor_id,
+        "config": entry["config"].model_dump(),
+        "latest_bucket": monitor.latest.isoformat() if monitor.latest is not None else None,
+        "groups": [str(g) for g in monitor.labels],
+        "late_events": monitor.late_events,
+        "future_events": monitor.future_events,
+    }
+
+
+def _ingest_events(monitor: RollingAuditMonitor, config: MonitorConfig, df: pd.DataFrame) -> int:
+    """Add a batch of decision events to ``monitor``; returns the number kept."""
+    missing = [c for c in (config.race_col, config.outcome_col, config.time_col) if c not in df.columns]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Column(s) not found in events: {missing}. Available columns: {list(df.columns)}",
+        )
+    df, favorable = _coerce_favorable(df, config.outcome_col, config.favorable_value)
+    try:
+        return monitor.add(
+            df[config.time_col],
+            df[config.race_col],
+            favorable_indicator(df[config.outcome_col], favorable),
+        )
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid events: {exc}") from exc
+
+
+@app.put("/monitor/{monitor_id}", tags=["Monitor"])
+async def configure_monitor(monitor_id: str, config: MonitorConfig, request: Request) -> JSONResponse:
+    """
+    Create a rolling disparate-impact monitor, or reset an existing one.
+
+    Events posted to ``/monitor/{monitor_id}/events`` are counted per time
+    bucket; ``GET /monitor/{monitor_id}`` reports any window up to
+    ``retention`` buckets. Each API key may hold ``MONITORS_MAX_PER_KEY``
+    monitors (429 beyond that).
+    """
+    owner = _owner(request)
+    key = (owner, monitor_id)
+    if key not in monitors and sum(1 for o, _ in monitors if o == owner) >= MONITORS_MAX_PER_KEY:
+        raise HTTPException(
+            status_code=429,
+            detail=f"This API key already has {MONITORS_MAX_PER_KEY} monitors; delete one first.",
+        )
+    try:
+        monitor = RollingAuditMonitor(
+            config.race_col,
+            config.outcome_col,
+            config.time_col,
+            favorable=config.favorable_value,
+            bucket=config.bucket,
+            retention=config.retention,
+            max_skew=config.max_skew,
+            max_groups=config.max_groups,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    logger.info(
+        "PUT /monitor/%s — race_col=%s, outcome_col=%s, time_col=%s, bucket=%s x %d",
+        monitor_id, config.race_col, config.outcome_col, config.time_col, config.bucket, config.retention,
+    )
+    monitors[key] = {"monitor": monitor, "config": config, "lock": asyncio.Lock()}
+    return JSONResponse(content=_monitor_status(monitor_id, monitors[key]))
+
+
+@app.post("/monitor/{monitor_id}/events", tags=["Monitor"])
+async def ingest_monitor_events(monitor_id: str, events: MonitorEvents, request: Request) -> JSONResponse:
+    """
+    Add a batch of decision events to a monitor.
+
+    Events older than the monitor's retention (relative to the newest event
+    seen) are dropped and counted in ``late_events``, events stamped more
+    than ``max_skew`` past the server's clock in ``future_events``; events
+    with a missing timestamp, group or outcome are skipped.
+    """
+    entry = _monitor_entry(request, monitor_id)
+    df = await _run_io(_request_frame, events)
+    async with entry["lock"]:
+        try:
+            ingested = await _run_io(_ingest_events, entry["monitor"], entry["config"], df)
+        except HTTPException:
+            raise
+        except Exception as exc:
+            logger.exception("Unexpected error during /monitor/%s/events", monitor_id)
+            raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+        status = _monitor_status(monitor_id, entry)
+    return JSONResponse(content={**status, "received": len(df), "ingested": ingested})
+
+
+@app.get("/monitor/{monitor_id}", tags=["Monitor"])
+async def monitor_report(
+    monitor_id: str,
+    request: Request,
+    window: list[str] | None = Query(
+        default=None, description="Window durations, e.g. window=7D&window=30D. Defaults to 7D, 30D and 90D."
+    ),
+    end: str | None = Query(default=None, description="Timestamp in the last bucket of each window (default: newest)."),
+) -> JSONResponse:
+    """
+    Disparate impact, statistical parity gap and flagged groups per rolling window.
+
+    Each window's entry is the /audit report over the events in it, plus a
+    ``window`` block with its UTC bounds, or null if the window holds no
+    events. Windows are summed from the per-bucket counts, so this costs
+    O(buckets x groups) however many events were ingested.
+    """
+    entry = _monitor_entry(request, monitor_id)
+    monitor: RollingAuditMonitor = entry["monitor"]
+    config: MonitorConfig = entry["config"]
+    if window is None:
+        window = [w for w in MONITOR_DEFAULT_WINDOWS if pd.Timedelta(w) <= monitor.bucket * monitor.retention]
+    reports = {}
+    async with entry["lock"]:
+        for w in window:
+            try:
+                if len(monitor.window_counts(w, end)) == 0:
+                    reports[w] = None
+                    continue
+                reports[w] = monitor.window_report(w, community_defs, end, privileged_group=config.privileged_group)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=f"Invalid window '{w}': {exc}") from exc
+        status = _monitor_status(monitor_id, entry)
+    return JSONResponse(content={**status, "windows": reports})
+
+
+@app.delete("/monitor/{monitor_id}", tags=["Monitor"])
+async def delete_monitor(monitor_id: str, request: Request) -> JSONResponse:
+    """Delete a monitor and its counts."""
+    entry = _monitor_entry(request, monitor_id)
+    monitors.pop((_owner(request), monitor_id), None)
+    return JSONResponse(content=_monitor_status(monitor_id, entry))
+
+
 # ---------- /audit/compliance ----------------------------------------------
 
+def _check_compliance_config(config: Any, label: str = "Community config") -> None:
+    """Reject a compliance config that is not an object or lacks a required field (400)."""
+    if not isinstance(config, dict):
+        raise HTTPException(status_code=400, detail=f"{label} must be a JSON object.")
+    for field in ("priority_groups", "fairness_target", "fairness_threshold"):
+        if field not in config:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{label} missing required field: '{field}'",
+            )
+
+
+def _compliance_reference(group_rates: dict, requested: str) -> str:
+    """The config's fairness target if present, else White, Caucasian (COMPAS), or the highest-rate group."""
+    if requested in group_rates:
+        return requested
+    if "White" in group_rates:
+        return "White"
+    if "Caucasian" in group_rates:
+        return "Caucasian"
+    return max(group_rates, key=lambda g: group_rates[g])
+
+
+def _config_classification(provenance: dict | None) -> str:
+    """Audit classification implied by a config's provenance record."""
+    if provenance and provenance.get("record_id") and provenance.get("input_date"):
+        participants = provenance.get("input_participants", 0)
+        return "community_valid" if participants >= 10 else "low_confidence"
+    return "standard"
+
+
 @app.post("/audit/compliance", tags=["Audit"])
 async def audit_compliance(
-    file: UploadFile = File(..., description="CSV file to check compliance."),
+    file: UploadFile | None = File(default=None, description="CSV, Parquet or Arrow IPC file to check compliance."),
     race_col: str = Form(...),
     outcome_col: str = Form(...),
-    favorable_value: str = Form(...),
-    config_json: str = Form(
-        ...,
+    favorable_value: str | None = Form(default=None, description="Favorable outcome value. Required with file."),
+    counts_json: str | None = Form(
+        default=None,
+        description=(
+            "Pre-aggregated per-group counts as a JSON string, "
+            '{"group": {"favorable": f, "total": n}}. Use instead of file.'
+        ),
+    ),
+    config_json: str | None = Form(
+        default=None,
         description=(
             "A CDF v1.0 community fairness configuration as a JSON string. "
             "This config defines the fairness standard the dataset is checked against. "
@@ -654,6 +1706,10 @@ async def audit_compliance(
             "a community input session."
         ),
     ),
+    config_id: str | None = Form(
+        default=None,
+        description="Record id of a published registry config. Use instead of config_json.",
+    ),
 ) -> JSONResponse:
     """
     Compliance check: audit a dataset against a specific community-defined
@@ -667,69 +1723,74 @@ async def audit_compliance(
 
     Returns a pass/fail verdict, per-group DI, flagged groups, and the
     provenance record of the community config used.
+
+    Send either a CSV ``file`` or ``counts_json`` — the per-group favorable/total
+    counts from an upstream GROUP BY — in which case no row data is uploaded.
+    Likewise, send either ``config_json`` or the ``config_id`` of a config
+    published in the registry.
     """
     logger.info(
         "POST /audit/compliance — file=%s, race_col=%s, outcome_col=%s",
-        file.filename, race_col, outcome_col,
+        file.filename if file is not None else "<counts>", race_col, outcome_col,
     )
     try:
-        import json as json_mod
-
-        # Parse the community config
-        try:
-            config = json_mod.loads(config_json)
-        except json_mod.JSONDecodeError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid config_json: {e}")
-
-        # Validate required fields
-        for field in ("priority_groups", "fairness_target", "fairness_threshold"):
-            if field not in config:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Community config missing required field: '{field}'",
-                )
+        # Parse the community config, or look it up in the registry
+        if (config_json is None) == (config_id is None):
+            raise HTTPException(status_code=400, detail="Provide exactly one of 'config_json' or 'config_id'.")
+        if config_id is not None:
+            config = _registry_config(config_id)
+        else:
+            try:
+                config = json.loads(config_json)
+            except json.JSONDecodeError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid config_json: {e}")
+        _check_compliance_config(config)
 
         threshold = float(config["fairness_threshold"])
         ref_group_requested = str(config["fairness_target"])
         priority_groups = config["priority_groups"]
         provenance = config.get("provenance", {})
 
-        # Read the CSV
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
-        _validate_columns(df, race_col, outcome_col)
-
-        df, favorable = _coerce_favorable(df, outcome_col, favorable_value)
-
-        # Compute group rates
-        binary = (df[outcome_col] == favorable).astype(float)
-        group_rates = binary.groupby(df[race_col]).mean().round(4).to_dict()
-        group_rates = {str(k): float(v) for k, v in group_rates.items()}
-
-        # Reference group
-        if ref_group_requested in group_rates:
-            ref = ref_group_requested
-        elif "White" in group_rates:
-            ref = "White"
-        elif "Caucasian" in group_rates:
-            ref = "Caucasian"
+        if (file is None) == (counts_json is None):
+            raise HTTPException(
+                status_code=400,
+                detail="Provide exactly one of 'file' (CSV upload) or 'counts_json' (per-group counts).",
+            )
+
+        params = (race_col, outcome_col, favorable_value, config_digest(config))
+        if file is not None:
+            key = _upload_cache_key("compliance", file, await _upload_digest(file), *params)
+        else:
+            key = cache_key("compliance-counts", hashlib.sha256(counts_json.encode()).hexdigest(), *params)
+        cached = _cached_json(key)
+        if cached is not None:
+            return cached
+
+        if counts_json is not None:
+            # Pre-aggregated contingency table — O(groups), no row data
+            try:
+                counts = _counts_from_mapping(json.loads(counts_json))
+            except json.JSONDecodeError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid counts_json: {e}")
+            total_records = counts.n_records
+            group_rates = {str(k): v for k, v in counts.rate_dict(decimals=4).items()}
         else:
-            ref = max(group_rates, key=lambda g: group_rates[g])
+            if not favorable_value:
+                raise HTTPException(status_code=400, detail="favorable_value is required with file.")
 
-        ref_rate = group_rates[ref]
+            # Read the upload (CSV, Parquet or Arrow)
+            df = await _read_upload(
+                file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col)
+            )
+            total_records = len(df)
+
+            # Compute group rates
+            group_rates = await _run_io(_upload_group_rates, df, race_col, outcome_col, favorable_value)
+
+        ref = _compliance_reference(group_rates, ref_group_requested)
 
         # DI computation
-        di_ratios: dict[str, float | None] = {}
-        for group, rate in group_rates.items():
-            if group == ref:
-                di_ratios[group] = 1.0
-            elif ref_rate == 0:
-                di_ratios[group] = None
-            else:
-                di_ratios[group] = round(rate / ref_rate, 4)
+        di_ratios = disparate_impact_ratios(group_rates, ref)
 
         flagged = [g for g, di in di_ratios.items() if di is not None and di < threshold]
 
@@ -737,13 +1798,9 @@ async def audit_compliance(
         passes = len(flagged) == 0
         priority_flagged = [g for g in flagged if g in priority_groups]
 
-        # Determine audit classification from the config
-        audit_classification = "standard"
-        if provenance and provenance.get("record_id") and provenance.get("input_date"):
-            participants = provenance.get("input_participants", 0)
-            audit_classification = "community_valid" if participants >= 10 else "low_confidence"
+        audit_classification = _config_classification(provenance)
 
-        return JSONResponse(content={
+        return _store_json(key, {
             "status": "success",
             "verdict": "PASS" if passes else "FAIL",
             "audit_classification": audit_classification,
@@ -754,7 +1811,7 @@ async def audit_compliance(
                 "provenance": provenance if provenance else None,
             },
             "summary": {
-                "total_records": len(df),
+                "total_records": total_records,
                 "groups_analyzed": sorted(group_rates.keys()),
                 "reference_group": ref,
                 "flagged_groups": flagged,
@@ -784,23 +1841,244 @@ async def audit_compliance(
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
 
 
-@app.post("/reweight", tags=["Reweight"])
-async def reweight_json(request: JSONReweightRequest) -> JSONResponse:
-    """Reweight a dataset supplied as a JSON body."""
+# ---------- /audit/compliance/batch ----------------------------------------
+
+def _registry_config(record_id: str) -> dict:
+    """A registry config by id, as a 400 when the id is unknown (it names a request parameter)."""
+    try:
+        return config_registry.get(record_id)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Config id not found in registry: '{record_id}'") from None
+
+
+def _batch_configs(
+    config_ids: str | None,
+    configs_json: str | None,
+    jurisdiction: str | None = None,
+    domain: str | None = None,
+) -> list[tuple[str, str, dict]]:
+    """
+    Resolve registry ids, registry filters and inline configs into
+    ``(id, source, config)`` triples, in request order.
+    """
+    resolved = []
+    if config_ids:
+        ids = [c.strip() for c in config_ids.split(",") if c.strip()]
+        published = {e.record_id for e in config_registry.entries()}
+        unknown = [c for c in ids if c not in published]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Config id(s) not found in registry: {unknown}")
+        resolved.extend((c, "registry", config_registry.get(c)) for c in ids)
+    if jurisdiction or domain:
+        listed = {config_id for config_id, _, _ in resolved}
+        resolved.extend(
+            (e.record_id, "registry", config_registry.get(e.record_id))
+            for e in config_registry.find(jurisdiction=jurisdiction, domain=domain)
+            if e.record_id not in listed
+        )
+    if configs_json:
+        try:
+            inline = json.loads(configs_json)
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid configs_json: {exc}") from exc
+        if not isinstance(inline, list):
+            raise HTTPException(status_code=400, detail="configs_json must be a JSON array of configs.")
+        for i, config in enumerate(inline):
+            _check_compliance_config(config, f"Inline config {i}")
+            record_id = (config.get("provenance") or {}).get("record_id")
+            resolved.append((str(record_id) if record_id else f"inline-{i}", "inline", config))
+    if not resolved:
+        raise HTTPException(
+            status_code=400,
+            detail="No configs selected: provide config_ids, configs_json, or a jurisdiction/domain "
+            "that matches registry configs.",
+        )
+    if len(resolved) > COMPLIANCE_BATCH_MAX_CONFIGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(resolved)} configs exceed the limit of {COMPLIANCE_BATCH_MAX_CONFIGS} per request.",
+        )
+    for config_id, _, config in resolved:
+        _check_compliance_config(config, f"Config '{config_id}'")
+    return resolved
+
+
+def _compliance_matrix(group_rates: dict, configs: list[tuple[str, str, dict]]) -> dict:
+    """
+    Core logic for /audit/compliance/batch — every config against one set of group rates.
+
+    DI against each config's reference group is one broadcast over a
+    (configs x groups) matrix, and flags are a single comparison against
+    the column of thresholds.
+    """
+    labels = list(group_rates)
+    references = [_compliance_reference(group_rates, str(c["fairness_target"])) for _, _, c in configs]
+    thresholds = np.array([float(c["fairness_threshold"]) for _, _, c in configs])
+    di = disparate_impact_matrix(group_rates, references)
+    flagged = di < thresholds[:, None]  # NaN compares False: undefined DI is never flagged
+    passes = ~flagged.any(axis=1)
+
+    rows = []
+    for i, (config_id, source, config) in enumerate(configs):
+        flagged_groups = [labels[j] for j in np.flatnonzero(flagged[i])]
+        priority_groups = config["priority_groups"]
+        rows.append({
+            "id": config_id,
+            "source": source,
+            "verdict": "PASS" if passes[i] else "FAIL",
+            "audit_classification": _config_classification(config.get("provenance")),
+            "fairness_target": references[i],
+            "fairness_threshold": float(thresholds[i]),
+            "flagged_groups": flagged_groups,
+            "priority_groups_flagged": [g for g in flagged_groups if g in priority_groups],
+            "jurisdiction": config.get("jurisdiction"),
+            "domain": config.get("domain"),
+        })
+
+    return {
+        "summary": {
+            "configs_checked": len(configs),
+            "configs_passed": int(passes.sum()),
+            "configs_failed": int((~passes).sum()),
+            "groups_analyzed": sorted(labels),
+        },
+        "group_rates": group_rates,
+        "configs": rows,
+        "matrix": {
+            "configs": [config_id for config_id, _, _ in configs],
+            "groups": labels,
+            "disparate_impact": [[None if np.isnan(v) else float(v) for v in row] for row in di],
+            "flagged": flagged.tolist(),
+        },
+    }
+
+
+@app.post("/audit/compliance/batch", tags=["Audit"])
+async def audit_compliance_batch(
+    file: UploadFile | None = File(default=None, description="CSV, Parquet or Arrow IPC file to check compliance."),
+    race_col: str = Form(...),
+    outcome_col: str = Form(...),
+    favorable_value: str | None = Form(default=None, description="Favorable outcome value. Required with file."),
+    counts_json: str | None = Form(
+        default=None,
+        description='Pre-aggregated per-group counts, {"group": {"favorable": f, "total": n}}. Use instead of file.',
+    ),
+    config_ids: str | None = Form(
+        default=None, description="Comma-separated registry config ids (provenance record_id)."
+    ),
+    configs_json: str | None = Form(
+        default=None, description="A JSON array of inline CDF v1.0 configs."
+    ),
+    jurisdiction: str | None = Form(default=None, description="Add every registry config for this jurisdiction."),
+    domain: str | None = Form(default=None, description="Add every registry config for this domain."),
+) -> JSONResponse:
+    """
+    Check one dataset against many community configs at once.
+
+    The upload is parsed and its group rates computed a single time; every
+    config — from the registry by id or by jurisdiction/domain, or inline —
+    is then evaluated against those rates together. Returns each config's verdict and flagged groups,
+    and a config x group matrix of DI values and flags.
+    """
     logger.info(
-        "POST /reweight (JSON) — %d records, race_col=%s, outcome_col=%s",
-        len(request.data),
-        request.race_col,
-        request.outcome_col,
+        "POST /audit/compliance/batch — file=%s, race_col=%s, outcome_col=%s",
+        file.filename if file is not None else "<counts>", race_col, outcome_col,
     )
+    if (file is None) == (counts_json is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of 'file' (CSV upload) or 'counts_json' (per-group counts).",
+        )
+    configs = _batch_configs(config_ids, configs_json, jurisdiction, domain)
+
+    params = (race_col, outcome_col, favorable_value, config_digest([[i, c] for i, _, c in configs]))
+    if file is not None:
+        key = _upload_cache_key("compliance-batch", file, await _upload_digest(file), *params)
+    else:
+        key = cache_key("compliance-batch-counts", hashlib.sha256(counts_json.encode()).hexdigest(), *params)
+    cached = _cached_json(key)
+    if cached is not None:
+        return cached
+
     try:
-        df = pd.DataFrame(request.data)
-        report = _build_reweight_report(
-            df=df,
-            race_col=request.race_col,
-            outcome_col=request.outcome_col,
-            favorable_value=request.favorable_value,
+        if counts_json is not None:
+            try:
+                counts = _counts_from_mapping(json.loads(counts_json))
+            except json.JSONDecodeError as exc:
+                raise HTTPException(status_code=400, detail=f"Invalid counts_json: {exc}") from exc
+            total_records = counts.n_records
+            group_rates = {str(k): v for k, v in counts.rate_dict(decimals=4).items()}
+        else:
+            if not favorable_value:
+                raise HTTPException(status_code=400, detail="favorable_value is required with file.")
+            df = await _read_upload(file, columns=[race_col, outcome_col], dtype=audit_dtypes(race_col))
+            total_records = len(df)
+            group_rates = await _run_io(_upload_group_rates, df, race_col, outcome_col, favorable_value)
+        result = await _run_io(_compliance_matrix, group_rates, configs)
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Unexpected error during /audit/compliance/batch")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    return _store_json(key, {"status": "success", "total_records": total_records, **result})
+
+
+# ---------- /registry -------------------------------------------------------
+
+@app.get("/registry", tags=["Registry"])
+async def registry_list(
+    jurisdiction: str | None = Query(default=None),
+    domain: str | None = Query(default=None),
+    date_from: str | None = Query(default=None, description="Earliest provenance input_date (YYYY-MM-DD)."),
+    date_to: str | None = Query(default=None, description="Latest provenance input_date (YYYY-MM-DD)."),
+) -> dict:
+    """List published community configs, optionally filtered by jurisdiction, domain and input date."""
+    entries = await _run_io(config_registry.find, jurisdiction, domain, date_from, date_to)
+    return {"count": len(entries), "configs": [entry.summary() for entry in entries]}
+
+
+@app.get("/registry/{record_id}", tags=["Registry"])
+async def registry_get(record_id: str) -> dict:
+    """A published community config by its provenance record_id, with its validation result."""
+    try:
+        entry = await _run_io(config_registry.entry, record_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No registry config with record_id '{record_id}'.") from None
+    return {**entry.summary(), "issues": entry.issues, "config": entry.config}
+
+
+@app.post("/reweight", tags=["Reweight"])
+async def reweight_json(body: JSONReweightRequest, request: Request) -> Response:
+    """
+    Reweight a dataset supplied as a JSON body — row dicts or pre-aggregated group counts.
+
+    Rows are returned in the format negotiated from ``Accept``: the JSON
+    report by default, or streamed CSV, NDJSON or Parquet.
+    """
+    if body.counts is not None:
+        logger.info(
+            "POST /reweight (JSON) — %d groups (pre-aggregated), race_col=%s, outcome_col=%s",
+            len(body.counts),
+            body.race_col,
+            body.outcome_col,
         )
+        return JSONResponse(content=_build_reweight_report_from_counts(_counts_from_mapping(body.counts)))
+
+    fmt = _negotiated_format(request)
+    logger.info(
+        "POST /reweight (JSON) — %d records, race_col=%s, outcome_col=%s, format=%s",
+        _request_rows(body),
+        body.race_col,
+        body.outcome_col,
+        fmt,
+    )
+    try:
+        if fmt != export.JSON:
+            return await _run_io(_frame_export, body, fmt)
+        report = await _run_io(_json_reweight_report, body)
     except HTTPException:
         raise
     except Exception as exc:
@@ -810,31 +2088,62 @@ async def reweight_json(request: JSONReweightRequest) -> JSONResponse:
     return JSONResponse(content=report)
 
 
+def _frame_export(body: JSONReweightRequest, fmt: str) -> StreamingResponse:
+    """Streamed export of a JSON request's rows, serialized STREAM_CHUNK_ROWS rows at a time."""
+    race_col, outcome_col, favorable_value = body.race_col, body.outcome_col, body.favorable_value
+    weights_only = body.weights_only
+    df, favorable = _coerce_favorable(_request_frame(body), outcome_col, favorable_value)
+    _validate_columns(df, race_col, outcome_col)
+    try:
+        table = reweight_table(df, race_col, outcome_col, favorable, community_defs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if weights_only:
+        df = df[[race_col, outcome_col]]
+    batches = (df.iloc[start:start + STREAM_CHUNK_ROWS] for start in range(0, len(df), STREAM_CHUNK_ROWS))
+    frames = _weighted_frames(batches, table, race_col, outcome_col, favorable_value, weights_only)
+    return _export_response(frames, fmt, len(df), weights_only)
+
+
 @app.post("/reweight/csv", tags=["Reweight"])
 async def reweight_csv(
-    file: UploadFile = File(..., description="CSV file to reweight."),
+    request: Request,
+    file: UploadFile = File(..., description="CSV, Parquet or Arrow IPC file to reweight."),
     race_col: str = Form(...),
     outcome_col: str = Form(...),
     favorable_value: str = Form(...),
-) -> JSONResponse:
-    """Reweight a dataset supplied as a CSV file upload (multipart/form-data)."""
+    weights_only: bool = Form(
+        default=False, description="Return only each row's index and sample_weight instead of the full rows."
+    ),
+) -> Response:
+    """
+    Reweight a dataset supplied as a file upload (multipart/form-data).
+
+    With ``Accept: application/json`` (the default) the rows are embedded in
+    the JSON report, subject to the upload size limit. CSV, NDJSON and
+    Parquet responses are streamed instead: the upload is read twice in
+    chunks — once to count groups, once to weight and serialize rows — so
+    memory stays flat and the size limit does not apply.
+    """
+    fmt = _negotiated_format(request)
     logger.info(
-        "POST /reweight/csv — file=%s, race_col=%s, outcome_col=%s",
+        "POST /reweight/csv — file=%s, race_col=%s, outcome_col=%s, format=%s",
         file.filename,
         race_col,
         outcome_col,
+        fmt,
     )
+    if fmt != export.JSON:
+        return await _upload_export(file, fmt, race_col, outcome_col, favorable_value, weights_only)
     try:
-        contents = await file.read()
-        if len(contents) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_MB}MB limit.")
-        df = pd.read_csv(io.BytesIO(contents))
-        df.columns = df.columns.str.strip()
-        report = _build_reweight_report(
+        df = await _read_upload(file)
+        report = await _run_io(
+            _build_reweight_report,
             df=df,
             race_col=race_col,
             outcome_col=outcome_col,
             favorable_value=favorable_value,
+            weights_only=weights_only,
         )
     except HTTPException:
         raise
@@ -843,3 +2152,48 @@ async def reweight_csv(
         raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
 
     return JSONResponse(content=report)
+
+
+async def _upload_export(
+    file: UploadFile,
+    fmt: str,
+    race_col: str,
+    outcome_col: str,
+    favorable_value: str,
+    weights_only: bool,
+) -> StreamingResponse:
+    """
+    Two-pass streamed export of an upload. Counting errors surface as a
+    status code before the first byte is sent.
+    """
+    source_fmt, compression = _upload_format(file)
+    column_dtypes: dict[str, set] = {}
+    try:
+        counts, n_rows = await _run_io(
+            _stream_counts, file.file, source_fmt, race_col, outcome_col, favorable_value,
+            compression=compression, column_dtypes=column_dtypes,
+            all_columns=source_fmt == CSV and not weights_only,
+        )
+        table = ReweightTable.from_counts(
+            counts, community_defs, race_col=race_col, outcome_col=outcome_col,
+        )
+    except HTTPException:
+        raise
+    except (MissingColumnsError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ImportError as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Unexpected error during /reweight/csv")
+        raise HTTPException(status_code=500, detail=f"Processing error: {exc}") from exc
+
+    # CSV types are inferred per chunk, but the export's schema is fixed by its first
+    # chunk (Parquet fails mid-stream on a change): pin every column for the second
+    # pass — the group column as counted, every other column to one type that fits
+    # all the chunks seen while counting.
+    columns = [race_col, outcome_col] if weights_only else None
+    dtype = {col: _common_dtype(dtypes) for col, dtypes in column_dtypes.items()}
+    dtype.update(audit_dtypes(race_col))
+    batches = _upload_batches(file.file, source_fmt, compression, columns, dtype)
+    frames = _weighted_frames(batches, table, race_col, outcome_col, favorable_value, weights_only)
+    return _export_response(frames, fmt, n_rows, weights_only)
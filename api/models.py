@@ -6,17 +6,63 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
-class JSONAuditRequest(BaseModel):
-    data: list[dict[str, Any]] = Field(
-        ..., description="List of row dicts representing the dataset.", min_length=1
+class GroupCount(BaseModel):
+    favorable: int = Field(..., description="Number of favorable outcomes in the group.", ge=0)
+    total: int = Field(..., description="Number of records in the group.", gt=0)
+
+
+def check_columns(columns: dict[str, list[Any]]) -> None:
+    """Raise ValueError unless every column list is non-empty and of the same length."""
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length (got lengths {sorted(lengths)}).")
+    if lengths == {0}:
+        raise ValueError("Columns must contain at least one row.")
+
+
+class _DatasetRequest(BaseModel):
+    """Shared validation: a request carries exactly one of row dicts, columns, or per-group counts."""
+
+    @model_validator(mode="after")
+    def _check_dataset(self):
+        given = [name for name in ("data", "columns", "counts") if getattr(self, name) is not None]
+        if len(given) != 1:
+            raise ValueError(
+                "Provide exactly one of 'data' (row dicts), 'columns' (column lists) "
+                "or 'counts' (per-group counts)."
+            )
+        if self.columns is not None:
+            check_columns(self.columns)
+        if self.counts is None and not self.favorable_value:
+            raise ValueError("'favorable_value' is required when 'data' or 'columns' is provided.")
+        return self
+
+
+class JSONAuditRequest(_DatasetRequest):
+    data: list[dict[str, Any]] | None = Field(
+        default=None, description="List of row dicts representing the dataset.", min_length=1
+    )
+    columns: dict[str, list[Any]] | None = Field(
+        default=None,
+        description="Columnar dataset, e.g. "
+        '{"race": ["White", "Black"], "hired": ["yes", "no"]}. Faster than data for large audits.',
+        min_length=1,
+    )
+    counts: dict[str, GroupCount] | None = Field(
+        default=None,
+        description="Pre-aggregated per-group counts, e.g. "
+        '{"White": {"favorable": 300, "total": 400}}. Use instead of data.',
+        min_length=1,
     )
     race_col: str = Field(..., description="Column name containing racial/group identifiers.", min_length=1)
     outcome_col: str = Field(..., description="Column name containing the outcome variable.", min_length=1)
-    favorable_value: str = Field(
-        ..., description="The outcome value considered favorable (e.g. 'hired', '1').", min_length=1
+    favorable_value: str | None = Field(
+        default=None,
+        description="The outcome value considered favorable (e.g. 'hired', '1'). "
+        "Required with data or columns.",
     )
     privileged_group: str | None = Field(
         default=None,
@@ -25,12 +71,93 @@ class JSONAuditRequest(BaseModel):
     )
 
 
-class JSONReweightRequest(BaseModel):
-    data: list[dict[str, Any]] = Field(
-        ..., description="List of row dicts representing the dataset.", min_length=1
+class JSONReweightRequest(_DatasetRequest):
+    data: list[dict[str, Any]] | None = Field(
+        default=None, description="List of row dicts representing the dataset.", min_length=1
+    )
+    columns: dict[str, list[Any]] | None = Field(
+        default=None,
+        description="Columnar dataset, e.g. "
+        '{"race": ["White", "Black"], "hired": ["yes", "no"]}. Faster than data for large audits.',
+        min_length=1,
+    )
+    counts: dict[str, GroupCount] | None = Field(
+        default=None,
+        description="Pre-aggregated per-group counts. Returns the weight table instead of rows.",
+        min_length=1,
+    )
+    race_col: str = Field(..., description="Column name containing racial/group identifiers.", min_length=1)
+    outcome_col: str = Field(..., description="Column name containing the outcome variable.", min_length=1)
+    favorable_value: str | None = Field(
+        default=None, description="The outcome value considered favorable. Required with data or columns."
+    )
+    weights_only: bool = Field(
+        default=False, description="Return only each row's index and sample_weight instead of the full rows."
     )
+
+
+class ColumnarAuditParams(BaseModel):
+    """Audit parameters for the raw-body columnar endpoint; ``columns`` is parsed separately."""
+
     race_col: str = Field(..., description="Column name containing racial/group identifiers.", min_length=1)
     outcome_col: str = Field(..., description="Column name containing the outcome variable.", min_length=1)
     favorable_value: str = Field(
-        ..., description="The outcome value considered favorable.", min_length=1
+        ..., description="The outcome value considered favorable (e.g. 'hired', '1').", min_length=1
+    )
+    privileged_group: str | None = Field(
+        default=None,
+        description="Optional reference group for Disparate Impact calculation.",
+    )
+
+
+class MonitorConfig(BaseModel):
+    """Configuration of a rolling disparate-impact monitor (see monitoring.RollingAuditMonitor)."""
+
+    race_col: str = Field(..., description="Column name containing racial/group identifiers.", min_length=1)
+    outcome_col: str = Field(..., description="Column name containing the outcome variable.", min_length=1)
+    time_col: str = Field(..., description="Column name containing each decision's timestamp.", min_length=1)
+    favorable_value: str = Field(
+        ..., description="The outcome value considered favorable (e.g. 'approved', '1').", min_length=1
+    )
+    bucket: str = Field(
+        default="1D", description="Bucket width as a pandas duration, e.g. '1D' or '6h'. Buckets align to UTC."
     )
+    retention: int = Field(
+        default=90, description="Number of buckets kept — the longest window that can be queried.", ge=1, le=3660
+    )
+    max_skew: str = Field(
+        default="1h",
+        description="How far past the server's clock an event may be stamped; later events are rejected "
+                    "and counted in future_events.",
+    )
+    max_groups: int = Field(
+        default=100,
+        description="Distinct groups the monitor tracks; a batch that would add more is rejected. "
+                    "Memory grows with retention x max_groups.",
+        ge=1,
+        le=1000,
+    )
+    privileged_group: str | None = Field(
+        default=None,
+        description="Optional reference group for Disparate Impact calculation.",
+    )
+
+
+class MonitorEvents(BaseModel):
+    """A batch of decision events for a monitor, as row dicts or column lists."""
+
+    data: list[dict[str, Any]] | None = Field(
+        default=None, description="List of decision rows.", min_length=1
+    )
+    columns: dict[str, list[Any]] | None = Field(
+        default=None, description="Columnar decisions, e.g. {\"race\": [...], \"approved\": [...], \"ts\": [...]}.",
+        min_length=1,
+    )
+
+    @model_validator(mode="after")
+    def _check_events(self):
+        if (self.data is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of 'data' (row dicts) or 'columns' (column lists).")
+        if self.columns is not None:
+            check_columns(self.columns)
+        return self
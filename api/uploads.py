@@ -0,0 +1,137 @@
+"""
+Upload spooling and request size limits for the fairness audit service.
+
+Starlette's multipart parser spools every file part into a
+``SpooledTemporaryFile`` as it arrives: parts up to 1MB stay in memory,
+larger ones roll over to a temp file on disk. Two pieces build on that:
+
+- :class:`BodySizeLimitMiddleware` counts request body bytes as they are
+  received and answers ``413`` as soon as a body crosses its limit (or up
+  front, when ``Content-Length`` already exceeds it), rather than after the
+  whole upload has been spooled.
+- :func:`mapped_upload` hands the parsers a read-only ``mmap`` of a spooled
+  upload, so CSV, Parquet and Arrow readers page the file in from the OS
+  cache instead of copying it through buffered reads.
+"""
+
+import io
+import json
+import logging
+import mmap
+import tempfile
+from contextlib import contextmanager
+
+from starlette.datastructures import Headers
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware that caps request body size.
+
+    Parameters
+    ----------
+    app : ASGI app
+    limit_for : callable
+        ``limit_for(scope) -> int | None``: the byte limit for a request, or
+        None for no limit. Called once per HTTP request, before any body is read.
+    """
+
+    def __init__(self, app, limit_for):
+        self.app = app
+        self.limit_for = limit_for
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.limit_for(scope)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = Headers(scope=scope).get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await _reject(scope, send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded:
+                # The app's own error response for the aborted body parse is replaced by the 413.
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded and not started:
+            await _reject(scope, send, limit)
+
+
+async def _reject(scope, send, limit: int) -> None:
+    logger.warning("Rejected %s: request body exceeds %d bytes", scope.get("path"), limit)
+    body = json.dumps({"detail": f"Request body exceeds the {limit}-byte limit."}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _on_disk(fileobj) -> bool:
+    if isinstance(fileobj, tempfile.SpooledTemporaryFile):
+        # fileno() would force an in-memory spool onto disk; only map parts that rolled over.
+        return fileobj._rolled
+    try:
+        fileobj.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return True
+
+
+@contextmanager
+def mapped_upload(fileobj):
+    """
+    Yield a read-only, seekable view of an uploaded file from its start.
+
+    A part spooled to disk is memory-mapped; a small in-memory part (or an
+    empty file, which cannot be mapped) is yielded as the file object itself,
+    rewound. The map is closed on exit.
+    """
+    fileobj.seek(0)
+    if not _on_disk(fileobj):
+        yield fileobj
+        return
+    fileobj.flush()
+    try:
+        mapped = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
+        yield fileobj
+        return
+    try:
+        yield mapped
+    finally:
+        mapped.close()
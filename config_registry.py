@@ -0,0 +1,281 @@
+"""
+Community Config Registry
+--------------------------
+Indexed, cached access to published community fairness configurations.
+
+Configs live as JSON files under ``registry/<jurisdiction>/<domain>/``.
+:class:`ConfigRegistry` indexes them by provenance ``record_id``,
+jurisdiction, domain and input date. Every file is parsed and validated
+(``community_input.validate_community_config``) once; a later lookup only
+``stat``\\s it and re-reads it when its modification time or size has
+changed, so edits and newly published configs show up without a restart.
+
+:func:`load_config` gives the same mtime-invalidated cache for a config at
+any path — the adapters' ``from_config`` and ``load_community_definitions``
+read through it.
+
+Usage:
+    from config_registry import ConfigRegistry
+
+    registry = ConfigRegistry()
+    registry.get("proxy-survey-mi-lending-2026-001")["fairness_threshold"]   # 0.88
+    [e.record_id for e in registry.find(jurisdiction="Michigan", domain="lending")]
+
+Run ``python config_registry.py`` to rewrite ``registry/index.json`` from the
+configs on disk.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from community_input import validate_community_config
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = Path(__file__).resolve().parent / "registry"
+INDEX_FILE = "index.json"
+_SKIP_DIRS = {"templates"}
+
+
+class RegistryEntry:
+    """
+    One parsed registry config and where it came from.
+
+    ``jurisdiction`` and ``domain`` come from the config's own fields,
+    falling back to its ``<jurisdiction>/<domain>/`` directory. ``valid``
+    and ``issues`` are the result of ``validate_community_config`` when the
+    file was parsed.
+    """
+
+    def __init__(self, path: Path, relative_path: str, config: dict, stamp: tuple[int, int]):
+        self.path = path
+        self.relative_path = relative_path
+        self.config = config
+        self.stamp = stamp
+        provenance = config.get("provenance") or {}
+        parts = Path(relative_path).parts
+        self.record_id = str(provenance["record_id"]) if provenance.get("record_id") else None
+        self.jurisdiction = config.get("jurisdiction") or (parts[0] if len(parts) > 2 else None)
+        self.domain = config.get("domain") or (parts[1] if len(parts) > 2 else None)
+        self.input_date = provenance.get("input_date")
+        self.valid, self.issues = validate_community_config(config)
+
+    def summary(self) -> dict:
+        """Index fields for listings and ``index.json``."""
+        return {
+            "record_id": self.record_id,
+            "path": self.relative_path,
+            "jurisdiction": self.jurisdiction,
+            "domain": self.domain,
+            "input_date": self.input_date,
+            "fairness_target": self.config.get("fairness_target"),
+            "fairness_threshold": self.config.get("fairness_threshold"),
+            "audit_classification": self.config.get("audit_classification", "standard"),
+            "valid": self.valid,
+        }
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_json(path: Path) -> dict:
+    with open(path) as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} does not contain a JSON object.")
+    return config
+
+
+class ConfigRegistry:
+    """
+    Registry of the configs under ``root``, re-indexed lazily on lookup.
+
+    Parameters
+    ----------
+    root : str or Path
+        Registry directory. ``index.json`` and ``templates/`` are not
+        configs and are skipped, as are files without a provenance
+        ``record_id``.
+    """
+
+    def __init__(self, root: str | Path = REGISTRY_DIR):
+        self.root = Path(root)
+        self._files: dict[Path, RegistryEntry] = {}
+        self._by_id: dict[str, RegistryEntry] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def refresh(self) -> None:
+        """Re-read configs whose mtime or size changed, and drop deleted ones."""
+        with self._lock:
+            seen = {}
+            for path in self._config_paths():
+                try:
+                    stamp = _stamp(path)
+                except FileNotFoundError:
+                    continue
+                entry = self._files.get(path)
+                if entry is None or entry.stamp != stamp:
+                    entry = self._parse(path, stamp)
+                if entry is not None:
+                    seen[path] = entry
+            self._files = seen
+            self._by_id = {}
+            for path in sorted(seen):
+                entry = seen[path]
+                if entry.record_id is None:
+                    continue
+                if entry.record_id in self._by_id:
+                    logger.warning(
+                        "Duplicate registry record_id '%s' in %s — keeping %s.",
+                        entry.record_id, entry.relative_path, self._by_id[entry.record_id].relative_path,
+                    )
+                    continue
+                self._by_id[entry.record_id] = entry
+
+    def entries(self) -> list[RegistryEntry]:
+        """Every indexed config, ordered by path."""
+        self.refresh()
+        return sorted(self._by_id.values(), key=lambda e: e.relative_path)
+
+    def entry(self, record_id: str) -> RegistryEntry:
+        """
+        The entry for ``record_id``.
+
+        Raises
+        ------
+        KeyError
+            If no config has that ``record_id``.
+        """
+        self.refresh()
+        try:
+            return self._by_id[record_id]
+        except KeyError:
+            raise KeyError(f"No registry config with record_id '{record_id}'.") from None
+
+    def get(self, record_id: str) -> dict:
+        """A copy of the config for ``record_id``, safe for the caller to modify."""
+        return copy.deepcopy(self.entry(record_id).config)
+
+    def find(
+        self,
+        jurisdiction: str | None = None,
+        domain: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> list[RegistryEntry]:
+        """
+        Entries matching every given filter.
+
+        ``jurisdiction`` and ``domain`` match case-insensitively;
+        ``date_from`` and ``date_to`` (ISO dates, inclusive) bound the
+        provenance ``input_date``, and exclude configs without one.
+        """
+        matches = []
+        for entry in self.entries():
+            if jurisdiction is not None and (entry.jurisdiction or "").casefold() != jurisdiction.casefold():
+                continue
+            if domain is not None and (entry.domain or "").casefold() != domain.casefold():
+                continue
+            if (date_from is not None or date_to is not None) and not entry.input_date:
+                continue
+            if date_from is not None and entry.input_date < date_from:
+                continue
+            if date_to is not None and entry.input_date > date_to:
+                continue
+            matches.append(entry)
+        return matches
+
+    def index(self) -> dict:
+        """The ``index.json`` document for the configs currently on disk."""
+        return {
+            "registry_version": "1.0",
+            "description": "Index of published community fairness configurations",
+            "schema": "../specs/community_fairness_config_v1.schema.json",
+            "configs": [entry.summary() for entry in self.entries()],
+        }
+
+    def write_index(self) -> Path:
+        """Rewrite ``<root>/index.json`` from the configs on disk."""
+        path = self.root / INDEX_FILE
+        path.write_text(json.dumps(self.index(), indent=2) + "\n")
+        return path
+
+    def metrics(self) -> dict:
+        return {"root": str(self.root), "configs": len(self._by_id), "parses": self.parses}
+
+    def _config_paths(self):
+        if not self.root.is_dir():
+            return
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            for name in sorted(filenames):
+                if name.endswith(".json") and not (name == INDEX_FILE and dirpath == str(self.root)):
+                    yield Path(dirpath) / name
+
+    def _parse(self, path: Path, stamp: tuple[int, int]) -> RegistryEntry | None:
+        self.parses += 1
+        try:
+            return RegistryEntry(path, path.relative_to(self.root).as_posix(), _read_json(path), stamp)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Skipping unreadable registry config %s: %s", path, exc)
+            return None
+
+
+_default_registry: ConfigRegistry | None = None
+
+
+def default_registry() -> ConfigRegistry:
+    """The process-wide registry of the repository's ``registry/`` directory."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ConfigRegistry()
+    return _default_registry
+
+
+# ---------------------------------------------------------------------------
+# Config files at arbitrary paths
+# ---------------------------------------------------------------------------
+_file_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def load_config(path: str | Path) -> dict:
+    """
+    Parse a config file, reusing the parsed copy while the file is unchanged.
+
+    Returns a copy the caller may modify. The file is re-read when its
+    modification time or size changes.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``path`` does not exist.
+    ValueError
+        If the file is not a JSON object.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    stamp = _stamp(path)
+    with _file_cache_lock:
+        cached = _file_cache.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _read_json(path))
+        with _file_cache_lock:
+            _file_cache[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    registry = ConfigRegistry()
+    written = registry.write_index()
+    print(f"Indexed {len(registry.entries())} config(s) into {written}")
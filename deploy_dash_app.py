@@ -10,6 +10,8 @@ import plotly.express as px
 import pandas as pd
 
 from fairness_reweight import reweight_samples_with_community
+from group_stats import favorable_indicator, weighted_group_rates
+from ingest import detect_format, read_table
 from utils import setup_logging
 from load_community_definitions import load_community_definitions
 from racial_bias_score import calculate_racial_bias_score
@@ -167,10 +169,13 @@ def store_upload(contents, demo_hmda_clicks, demo_compas_clicks, filename):
         demo_key = 'hmda' if trigger_id == 'demo-hmda' else 'compas'
         demo = DEMO_DATASETS[demo_key]
         try:
-            df = pd.read_csv(demo['path'])
-            df.columns = df.columns.str.strip()
-            # Convert outcome column to string for consistent matching
-            df[demo['outcome_col']] = df[demo['outcome_col']].astype(str)
+            # Parse only the demo's audit columns; the outcome is read as
+            # strings for consistent matching against the dropdown value.
+            df = read_table(
+                demo['path'],
+                columns=[demo['race_col'], demo['outcome_col']],
+                dtype={demo['outcome_col']: 'str'},
+            )
             col_options = [{'label': c, 'value': c} for c in df.columns]
             status = html.Span(
                 f"✓ Demo: {demo['label']}",
@@ -196,8 +201,7 @@ def store_upload(contents, demo_hmda_clicks, demo_compas_clicks, filename):
     decoded = base64.b64decode(content_string)
 
     try:
-        df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-        df.columns = df.columns.str.strip()
+        df = read_table(io.BytesIO(decoded), detect_format(filename=filename))
         col_options = [{'label': c, 'value': c} for c in df.columns]
         status = html.Span(f"✓ {filename} ({len(df):,} rows)", className="upload-success")
         logging.info("Uploaded %s — %d rows, %d columns", filename, len(df), len(df.columns))
@@ -267,7 +271,7 @@ def update_dashboard(stored_data, race_col, outcome_col, favorable_value, reweig
         local_defs.setdefault('priority_groups', df[race_col].unique().tolist())
         df = reweight_samples_with_community(
             df, race_col=race_col, outcome_col=outcome_col,
-            favorable=favorable_str, community_defs=local_defs,
+            favorable=favorable_str, community_defs=local_defs, inplace=True,
         )
         logging.info("Applied community-driven reweighting.")
     else:
@@ -296,12 +300,9 @@ def update_dashboard(stored_data, race_col, outcome_col, favorable_value, reweig
     )
 
     # ── Per-group weighted hire rates ─────────────────────────────────────────
-    hire_rates = {}
-    for group in df[race_col].unique():
-        gdf = df[df[race_col] == group]
-        favorable_weight = gdf.loc[gdf[outcome_col] == favorable_str, 'sample_weight'].sum()
-        total_weight = gdf['sample_weight'].sum()
-        hire_rates[group] = favorable_weight / total_weight if total_weight > 0 else 0
+    hire_rates = weighted_group_rates(
+        df[race_col], favorable_indicator(df[outcome_col], favorable_str), df['sample_weight'],
+    ).rate_dict()
 
     # ── Fairness metric panel ─────────────────────────────────────────────────
     DEFAULT_REF_GROUP = 'White'
@@ -1,7 +1,14 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
+from community_input import is_community_valid
+from group_stats import GroupCounts, favorable_indicator, group_counts, intersection_counts
+
+DI_THRESHOLD_DEFAULT = 0.8  # EEOC 4/5ths rule — used only when community config has no threshold
+MIN_CELL_SIZE_DEFAULT = 30  # intersectional cells smaller than this are suppressed, not reported
+
 
 def group_outcomes_by_race(data, race_col, outcome_col):
     """
@@ -17,11 +24,293 @@ def disparate_impact(data, race_col, outcome_col, privileged, unprivileged, favo
     Calculate disparate impact ratio between privileged and unprivileged groups.
     Returns None if the privileged group has no positive outcomes.
     """
-    privileged_rate = data.loc[data[race_col] == privileged, outcome_col].value_counts(normalize=True).get(favorable, 0)
-    unprivileged_rate = data.loc[data[race_col] == unprivileged, outcome_col].value_counts(normalize=True).get(favorable, 0)
+    counts = group_counts(
+        data[race_col], favorable_indicator(data[outcome_col], favorable, keep_missing=True)
+    )
+    return disparate_impact_from_counts(counts, privileged, unprivileged)
+
+
+def disparate_impact_from_counts(counts: GroupCounts, privileged, unprivileged):
+    """
+    Disparate impact ratio computed from precomputed per-group counts.
+
+    Lets callers auditing every group against one reference count the data
+    once (see ``group_stats.group_counts``) instead of rescanning it per group.
+    A group absent from ``counts`` has a favorable rate of 0.
+    """
+    rates = counts.rate_dict()
+    privileged_rate = rates.get(privileged, 0)
+    unprivileged_rate = rates.get(unprivileged, 0)
     if privileged_rate == 0:
         logging.warning(
             "Privileged group '%s' has no positive outcomes — disparate impact is undefined.", privileged
         )
         return None
     return unprivileged_rate / privileged_rate
+
+
+def disparate_impact_ratios(group_rates: dict, reference, decimals: int = 4) -> dict:
+    """
+    Disparate impact of every group relative to ``reference``, from a rate dict.
+
+    The reference group maps to 1.0. Every ratio is None when the reference
+    group has a 0% favorable rate (DI is undefined).
+    """
+    ref_rate = group_rates[reference]
+    ratios = {}
+    for group, rate in group_rates.items():
+        if group == reference:
+            ratios[group] = 1.0
+        elif ref_rate == 0:
+            ratios[group] = None
+        else:
+            ratios[group] = round(float(rate / ref_rate), decimals)
+    return ratios
+
+
+def disparate_impact_matrix(group_rates: dict, references: list, decimals: int = 4) -> np.ndarray:
+    """
+    Disparate impact of every group against each of several reference groups.
+
+    Returns a ``(len(references), len(group_rates))`` array whose row ``i``
+    holds :func:`disparate_impact_ratios` against ``references[i]``, columns
+    in ``group_rates`` order. Undefined ratios (zero reference rate) are NaN.
+    Evaluating many configs against one dataset is then a single broadcast.
+    """
+    labels = list(group_rates)
+    rates = np.array([group_rates[g] for g in labels], dtype=float)
+    ref_index = np.array([labels.index(r) for r in references], dtype=np.intp)
+    ref_rates = rates[ref_index][:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        di = np.round(rates[None, :] / ref_rates, decimals)
+    di[np.broadcast_to(ref_rates == 0, di.shape)] = np.nan
+    di[np.arange(len(ref_index)), ref_index] = 1.0
+    return di
+
+
+def reference_group(group_rates: dict, privileged_group: str | None = None):
+    """
+    Pick the reference (privileged) group for disparate impact.
+
+    Default: White. Rationale — this tool measures systemic racial disadvantage,
+    which is historically directional. White is the standard reference in EEOC
+    Disparate Impact analysis. Falls back to highest-rate group if White is not
+    present in the dataset, or uses caller-supplied privileged_group if provided.
+    """
+    DEFAULT_REF_GROUP = "White"
+    if privileged_group and privileged_group in group_rates:
+        return privileged_group
+    if DEFAULT_REF_GROUP in group_rates:
+        return DEFAULT_REF_GROUP
+    if privileged_group:
+        logging.warning(
+            "privileged_group '%s' not found in data — falling back to highest-rate group.",
+            privileged_group,
+        )
+    else:
+        logging.info(
+            "'%s' not found in dataset — falling back to highest-rate group as reference.",
+            DEFAULT_REF_GROUP,
+        )
+    return max(group_rates, key=lambda g: group_rates[g])
+
+
+def build_audit_report(
+    counts: GroupCounts,
+    community_defs: dict,
+    outcome_col: str,
+    favorable_value,
+    privileged_group: str | None = None,
+    total_records: int | None = None,
+) -> dict:
+    """
+    Build the full audit report (metrics, findings, recommendation) from per-group counts.
+
+    This is the report served by the API's /audit endpoints. It needs only the
+    (favorable, total) counts per group, so it is shared by the row-level,
+    streaming and pre-aggregated audit paths.
+
+    Parameters
+    ----------
+    counts : GroupCounts
+        Per-group favorable/total counts (see ``group_stats.group_counts``).
+    community_defs : dict
+        Community configuration supplying the threshold, target and provenance.
+    outcome_col : str
+        Outcome column name, echoed in the report summary.
+    favorable_value : object
+        Favorable outcome value as supplied by the caller, echoed in the summary.
+    privileged_group : str, optional
+        Reference group for DI. Defaults to White, then the highest-rate group.
+    total_records : int, optional
+        Row count to report; defaults to the number of rows in ``counts``.
+
+    Raises
+    ------
+    ValueError
+        If ``counts`` contains no groups.
+    """
+    # Community-defined threshold — the core differentiator of this framework.
+    # If the community set a threshold, use it. Otherwise fall back to EEOC 0.8.
+    di_threshold: float = float(community_defs.get("fairness_threshold", DI_THRESHOLD_DEFAULT))
+
+    if len(counts) == 0:
+        raise ValueError("No valid rows after dropping missing values.")
+    raw_rates: dict[str, float] = {str(k): v for k, v in counts.rate_dict().items()}
+    group_outcomes: dict[str, float] = {g: round(r, 4) for g, r in raw_rates.items()}
+    disparity_score: float = round(float(max(raw_rates.values()) - min(raw_rates.values())), 4)
+
+    ref_group = reference_group(group_outcomes, privileged_group)
+    ref_rate = group_outcomes[ref_group]
+
+    # Disparate Impact per group
+    if raw_rates[ref_group] == 0:
+        logging.warning(
+            "Privileged group '%s' has no positive outcomes — disparate impact is undefined.", ref_group
+        )
+    di_ratios: dict[str, float | None] = disparate_impact_ratios(raw_rates, ref_group)
+
+    # Statistical parity gap = max rate − min rate (in percentage points)
+    all_rates = list(group_outcomes.values())
+    stat_parity_gap = round((max(all_rates) - min(all_rates)) * 100, 2) if all_rates else 0.0
+
+    # Flagged groups — uses community-defined threshold, not hardcoded 0.8
+    flagged_groups = [g for g, di in di_ratios.items() if di is not None and di < di_threshold]
+
+    # Plain-English findings
+    findings: list[str] = []
+    for group, rate in group_outcomes.items():
+        if group == ref_group:
+            continue
+        di = di_ratios.get(group)
+        pct = round(rate * 100)
+        ref_pct = round(ref_rate * 100)
+        if di is None:
+            findings.append(
+                f"{group} applicants had a favorable outcome rate of {pct}%; "
+                f"Disparate Impact is undefined because the reference group ({ref_group}) "
+                f"has no positive outcomes."
+            )
+        elif di < di_threshold:
+            severity = "substantially below" if di < 0.5 else "below"
+            findings.append(
+                f"{group} applicants had a favorable outcome rate of {pct}% compared to "
+                f"{ref_pct}% for the reference group ({ref_group}), "
+                f"a Disparate Impact ratio of {di:.2f} — {severity} the {di_threshold} threshold."
+            )
+        else:
+            findings.append(
+                f"{group} applicants had a favorable outcome rate of {pct}% compared to "
+                f"{ref_pct}% for the reference group ({ref_group}), "
+                f"a Disparate Impact ratio of {di:.2f} — within the acceptable range."
+            )
+
+    findings.append(
+        f"The overall Statistical Parity Gap across all groups is "
+        f"{stat_parity_gap:.0f} percentage points."
+    )
+
+    # Recommendation
+    n = len(flagged_groups)
+    if flagged_groups:
+        group_word = "group falls" if n == 1 else "groups fall"
+        recommendation = (
+            f"Immediate review recommended. {n} {group_word} below the "
+            f"Disparate Impact threshold of {di_threshold} ({', '.join(flagged_groups)}), which may indicate "
+            f"discriminatory outcomes under the 4/5ths rule."
+        )
+    else:
+        recommendation = (
+            "The data shows no statistically significant disparate impact across analyzed groups. "
+            f"All groups meet or exceed the {di_threshold} Disparate Impact threshold."
+        )
+
+    # Determine audit type based on community config provenance
+    audit_type = "community_valid" if is_community_valid(community_defs) else "standard"
+    provenance = community_defs.get("provenance", {})
+
+    return {
+        "status": "success",
+        "audit_type": audit_type,
+        "community_config": {
+            "priority_groups": community_defs.get("priority_groups", []),
+            "fairness_target": community_defs.get("fairness_target", ref_group),
+            "fairness_threshold": di_threshold,
+            "provenance": provenance if provenance else None,
+        },
+        "summary": {
+            "total_records": total_records if total_records is not None else counts.n_records,
+            "groups_analyzed": list(group_outcomes.keys()),
+            "outcome_column": outcome_col,
+            "favorable_value": favorable_value,
+            "flagged_groups": flagged_groups,
+        },
+        "metrics": {
+            "disparity_score": disparity_score,
+            "group_outcomes": group_outcomes,
+            "disparate_impact": di_ratios,
+            "statistical_parity_gap": stat_parity_gap,
+        },
+        "findings": findings,
+        "recommendation": recommendation,
+    }
+
+
+def intersectional_audit(
+    data: pd.DataFrame,
+    group_cols: list[str],
+    outcome_col: str,
+    favorable,
+    community_defs: dict,
+    min_cell_size: int = MIN_CELL_SIZE_DEFAULT,
+    favorable_value=None,
+    privileged_group: str | None = None,
+) -> dict:
+    """
+    Audit every intersection of several group columns (e.g. race x sex x age band).
+
+    Rows are counted per occupied cell in one pass (see
+    ``group_stats.intersection_counts``). Cells with fewer than
+    ``min_cell_size`` rows are suppressed: their rates are too noisy to
+    support a disparate impact finding. The remaining cells are audited as
+    groups labelled ``"A × B × C"``, so the report has the same shape as
+    :func:`build_audit_report`, plus an ``intersections`` block describing
+    the cells. ``privileged_group`` names a reference cell by that label.
+
+    Raises
+    ------
+    ValueError
+        If a column is missing, or no cell reaches ``min_cell_size``.
+    """
+    missing = [c for c in [*group_cols, outcome_col] if c not in data.columns]
+    if missing:
+        raise ValueError(f"Column(s) not found in data: {missing}. Available columns: {list(data.columns)}")
+    if data.empty:
+        raise ValueError("Input data is empty.")
+
+    cells = intersection_counts(data[list(group_cols)], favorable_indicator(data[outcome_col], favorable))
+    counts = cells.to_group_counts(min_cell_size)
+    if len(counts) == 0:
+        raise ValueError(
+            f"No intersection has at least {min_cell_size} rows "
+            f"({len(cells)} occupied cells, largest has {int(cells.total.max(initial=0))})."
+        )
+
+    report = build_audit_report(
+        counts,
+        community_defs,
+        outcome_col=outcome_col,
+        favorable_value=favorable if favorable_value is None else favorable_value,
+        privileged_group=privileged_group,
+        total_records=len(data),
+    )
+    report["intersections"] = {
+        "columns": list(group_cols),
+        "min_cell_size": min_cell_size,
+        "cells_occupied": len(cells),
+        "cells_reported": len(counts),
+        "cells_suppressed": len(cells) - len(counts),
+        "records_suppressed": cells.n_records - counts.n_records,
+        "cell_sizes": {label: int(n) for label, n in zip(counts.labels, counts.total)},
+    }
+    return report
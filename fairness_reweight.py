@@ -12,6 +12,13 @@ Algorithm (from algorithm_specification.md Section 4):
 
     For individuals not in a priority group:
         wᵢ = 1.0
+
+The algorithm yields at most 2 × |groups| distinct weights, returned as a
+:class:`ReweightTable` that can be applied to other frames or Arrow batches:
+
+    table = reweight_table(df, "race", "hired", "yes", community_defs)
+    for batch in shards:
+        weights = table.apply_weights(batch)
 """
 
 import logging
@@ -19,91 +26,243 @@ import logging
 import numpy as np
 import pandas as pd
 
+from group_stats import favorable_indicator, group_counts
+
 logger = logging.getLogger(__name__)
 
 
-def reweight_samples_with_community(data, race_col, outcome_col, favorable, community_defs):
+class ReweightTable:
     """
-    Reweight samples based on community-defined priority groups and fairness target.
+    The compact result of community reweighting: one weight per (group, outcome).
 
-    Raises ValueError if target group is missing from data or has no favorable outcomes,
-    rather than silently falling back — community-defined parameters must be validated.
+    The algorithm yields at most ``2 x groups`` distinct weights, so the table
+    — plus the target rate and per-group rates it was derived from — is the
+    whole result. Compute it once (from rows or from a contingency table) and
+    apply it to any number of frames or Arrow batches with
+    :meth:`apply_weights`, e.g. to shards of training data.
+
+    Attributes
+    ----------
+    target_group : str
+    target_rate : float
+    group_rates : dict
+        ``{group: favorable rate}`` of the data the table was built from.
+    labels : list
+        Groups in table order.
+    favorable_weights, unfavorable_weights : np.ndarray
+        Weight per group in ``labels`` order (1.0 for non-priority groups).
+    race_col, outcome_col, favorable
+        Defaults for :meth:`apply_weights`, set when built from rows.
     """
-    target_group = community_defs.get('fairness_target', 'White')
-    priority_groups = set(community_defs.get('priority_groups', []))
 
-    # --- Validate target group is in the data ---
-    groups_in_data = set(data[race_col].dropna().unique())
-    if target_group not in groups_in_data:
-        available = sorted(groups_in_data)
-        raise ValueError(
-            f"fairness_target '{target_group}' not found in data. "
-            f"Available groups: {available}. "
-            f"Update community_definitions.json or pass a valid privileged_group."
-        )
+    def __init__(self, target_group, target_rate, group_rates, weights,
+                 race_col=None, outcome_col=None, favorable=None):
+        self.target_group = target_group
+        self.target_rate = target_rate
+        self.group_rates = dict(group_rates)
+        self.labels = list(weights)
+        self.favorable_weights = np.array([weights[g]["favorable"] for g in self.labels], dtype=float)
+        self.unfavorable_weights = np.array([weights[g]["unfavorable"] for g in self.labels], dtype=float)
+        self.race_col = race_col
+        self.outcome_col = outcome_col
+        self.favorable = favorable
 
-    # --- Compute per-group favorable outcome rates ---
-    binary_outcome = (data[outcome_col] == favorable).astype(float)
-    group_rates = binary_outcome.groupby(data[race_col]).mean()
+    @classmethod
+    def from_counts(cls, counts, community_defs, **columns):
+        """
+        Compute the per-(group, outcome) reweighting factors from per-group counts.
 
-    target_rate = float(group_rates.get(target_group, 0.0))
-    if target_rate == 0.0:
-        raise ValueError(
-            f"Target group '{target_group}' has a 0% favorable outcome rate. "
-            f"Cannot reweight toward a group with no favorable outcomes."
-        )
-    if target_rate == 1.0:
-        logger.warning(
-            "Target group '%s' has a 100%% favorable outcome rate. "
-            "Reweighting will push all priority group weights toward certainty.",
-            target_group,
-        )
+        The algorithm only needs each group's favorable rate, so the weights for
+        a whole dataset can be derived from its contingency table alone.
+
+        Parameters
+        ----------
+        counts : GroupCounts
+            Per-group favorable/total counts (see group_stats).
+        community_defs : dict
+            Community configuration with 'fairness_target' and 'priority_groups'.
+        **columns
+            Optional ``race_col``, ``outcome_col`` and ``favorable`` defaults
+            for :meth:`apply_weights`.
 
-    # --- Warn about missing priority groups ---
-    missing_priority = priority_groups - groups_in_data
-    if missing_priority:
-        logger.warning(
-            "Priority group(s) %s not found in data — they will be skipped.",
-            sorted(missing_priority),
+        Raises
+        ------
+        ValueError
+            If the target group is absent from ``counts`` or has a 0% favorable rate.
+        """
+        target_group = community_defs.get('fairness_target', 'White')
+        priority_groups = set(community_defs.get('priority_groups', []))
+
+        # --- Validate target group is in the data ---
+        group_rates = counts.rate_dict()
+        groups_in_data = set(group_rates)
+        if target_group not in groups_in_data:
+            available = sorted(groups_in_data)
+            raise ValueError(
+                f"fairness_target '{target_group}' not found in data. "
+                f"Available groups: {available}. "
+                f"Update community_definitions.json or pass a valid privileged_group."
+            )
+
+        target_rate = float(group_rates.get(target_group, 0.0))
+        if target_rate == 0.0:
+            raise ValueError(
+                f"Target group '{target_group}' has a 0% favorable outcome rate. "
+                f"Cannot reweight toward a group with no favorable outcomes."
+            )
+        if target_rate == 1.0:
+            logger.warning(
+                "Target group '%s' has a 100%% favorable outcome rate. "
+                "Reweighting will push all priority group weights toward certainty.",
+                target_group,
+            )
+
+        # --- Warn about missing priority groups ---
+        missing_priority = priority_groups - groups_in_data
+        if missing_priority:
+            logger.warning(
+                "Priority group(s) %s not found in data — they will be skipped.",
+                sorted(missing_priority),
+            )
+
+        # Per the algorithm spec:
+        #   favorable:   w = target_rate / group_rate
+        #   unfavorable: w = (1 - target_rate) / (1 - group_rate)
+        # Only applied to priority groups; everyone else gets weight 1.0.
+        weights = {}
+        for group, g_rate in group_rates.items():
+            if group not in priority_groups:
+                fav_weight = unfav_weight = 1.0
+            elif g_rate == 0.0:
+                # Group has 0% favorable rate — can only reweight unfavorable outcomes
+                fav_weight = 1.0
+                unfav_weight = (1.0 - target_rate) / 1.0  # denominator is (1 - 0) = 1
+            elif g_rate == 1.0:
+                # Group has 100% favorable rate — can only reweight favorable outcomes
+                fav_weight = target_rate / 1.0
+                unfav_weight = 1.0
+            else:
+                fav_weight = target_rate / g_rate
+                unfav_weight = (1.0 - target_rate) / (1.0 - g_rate)
+            weights[group] = {"favorable": fav_weight, "unfavorable": unfav_weight}
+
+        return cls(target_group, target_rate, group_rates, weights, **columns)
+
+    @classmethod
+    def from_dict(cls, table):
+        """Rebuild a table from :meth:`to_dict` output (e.g. loaded from JSON)."""
+        return cls(
+            table["target_group"], table["target_rate"], table["group_rates"], table["weights"],
+            race_col=table.get("race_col"), outcome_col=table.get("outcome_col"),
+            favorable=table.get("favorable"),
         )
 
-    # --- Compute weights per row ---
-    data = data.copy()
-    is_favorable = binary_outcome.values.astype(bool)
-    row_group = data[race_col].values
-    row_rates = data[race_col].map(group_rates).values.astype(float)
-
-    # Per the algorithm spec:
-    #   favorable:   w = target_rate / group_rate
-    #   unfavorable: w = (1 - target_rate) / (1 - group_rate)
-    # Only applied to priority groups; everyone else gets weight 1.0.
-    weights = np.ones(len(data), dtype=float)
-
-    for group in priority_groups & groups_in_data:
-        group_mask = row_group == group
-        g_rate = float(group_rates[group])
-
-        if g_rate == 0.0:
-            # Group has 0% favorable rate — can only reweight unfavorable outcomes
-            fav_weight = 1.0
-            unfav_weight = (1.0 - target_rate) / 1.0  # denominator is (1 - 0) = 1
-        elif g_rate == 1.0:
-            # Group has 100% favorable rate — can only reweight favorable outcomes
-            fav_weight = target_rate / 1.0
-            unfav_weight = 1.0
+    def to_dict(self):
+        """
+        Return ``target_group``, ``target_rate``, ``group_rates`` and ``weights`` —
+        ``{group: {"favorable": w, "unfavorable": w}}`` — plus any column defaults.
+        """
+        table = {
+            "target_group": self.target_group,
+            "target_rate": self.target_rate,
+            "group_rates": dict(self.group_rates),
+            "weights": {
+                group: {"favorable": float(fav), "unfavorable": float(unfav)}
+                for group, fav, unfav in zip(self.labels, self.favorable_weights, self.unfavorable_weights)
+            },
+        }
+        for key in ("race_col", "outcome_col", "favorable"):
+            if getattr(self, key) is not None:
+                table[key] = getattr(self, key)
+        return table
+
+    def weight(self, group, favorable):
+        """Weight of one row of ``group`` with a favorable (True) or unfavorable outcome."""
+        if group not in self.labels:
+            return 1.0
+        i = self.labels.index(group)
+        return float(self.favorable_weights[i] if favorable else self.unfavorable_weights[i])
+
+    def apply_weights(self, data, race_col=None, outcome_col=None, favorable=None):
+        """
+        Return the weight of every row of ``data`` as a NumPy array.
+
+        ``data`` may be a pandas DataFrame or a pyarrow ``RecordBatch`` /
+        ``Table``; only the two columns read are converted. Each row's group
+        is mapped to its table index in one vectorized lookup, and the index
+        selects from the favorable or unfavorable weight array. Rows whose
+        group is missing or absent from the table get weight 1.0, like any
+        non-priority row. Column arguments default to those the table was
+        built with.
+        """
+        race_col = race_col if race_col is not None else self.race_col
+        outcome_col = outcome_col if outcome_col is not None else self.outcome_col
+        favorable = favorable if favorable is not None else self.favorable
+        if race_col is None or outcome_col is None or favorable is None:
+            raise ValueError("race_col, outcome_col and favorable are required to apply weights.")
+
+        if isinstance(data, pd.DataFrame):
+            groups, outcomes = data[race_col], data[outcome_col]
         else:
-            fav_weight = target_rate / g_rate
-            unfav_weight = (1.0 - target_rate) / (1.0 - g_rate)
+            groups = data.column(race_col).to_pandas()
+            outcomes = data.column(outcome_col).to_pandas()
 
-        fav_mask = group_mask & is_favorable
-        unfav_mask = group_mask & ~is_favorable
-        weights[fav_mask] = fav_weight
-        weights[unfav_mask] = unfav_weight
+        # Code -1 (unknown or missing group) indexes the trailing 1.0.
+        codes = pd.Index(self.labels).get_indexer(groups)
+        favorable_weights = np.append(self.favorable_weights, 1.0)
+        unfavorable_weights = np.append(self.unfavorable_weights, 1.0)
+        is_favorable = favorable_indicator(outcomes, favorable).astype(bool)
+        return np.where(is_favorable, favorable_weights[codes], unfavorable_weights[codes])
 
-    data['sample_weight'] = weights
+
+def reweight_table(data, race_col, outcome_col, favorable, community_defs):
+    """
+    Build the :class:`ReweightTable` for a dataset in one counting pass.
+
+    The table remembers ``race_col``, ``outcome_col`` and ``favorable``, so
+    ``table.apply_weights(batch)`` works directly on other batches of the
+    same schema.
+    """
+    counts = group_counts(data[race_col], favorable_indicator(data[outcome_col], favorable))
+    return ReweightTable.from_counts(
+        counts, community_defs, race_col=race_col, outcome_col=outcome_col, favorable=favorable,
+    )
+
+
+def community_sample_weights(data, race_col, outcome_col, favorable, community_defs):
+    """
+    Return the community reweighting factor of every row as a NumPy array.
+
+    Computes the same weights as :func:`reweight_samples_with_community`
+    without copying or modifying ``data`` — the only allocation proportional
+    to the input is the returned float array.
+
+    Raises ValueError if target group is missing from data or has no favorable outcomes.
+    """
+    priority_groups = set(community_defs.get('priority_groups', []))
+    table = reweight_table(data, race_col, outcome_col, favorable, community_defs)
+    weights = table.apply_weights(data)
 
     logger.info(
         "Reweighting applied. Target group: %s (rate=%.4f), priority groups: %s",
-        target_group, target_rate, sorted(priority_groups & groups_in_data),
+        table.target_group, table.target_rate, sorted(priority_groups & set(table.labels)),
     )
+    return weights
+
+
+def reweight_samples_with_community(data, race_col, outcome_col, favorable, community_defs, inplace=False):
+    """
+    Reweight samples based on community-defined priority groups and fairness target.
+
+    Returns ``data`` with a ``sample_weight`` column — a copy by default, or
+    ``data`` itself when ``inplace=True``. Use :func:`community_sample_weights`
+    when only the weights are needed.
+
+    Raises ValueError if target group is missing from data or has no favorable outcomes,
+    rather than silently falling back — community-defined parameters must be validated.
+    """
+    weights = community_sample_weights(data, race_col, outcome_col, favorable, community_defs)
+    if not inplace:
+        data = data.copy()
+    data['sample_weight'] = weights
     return data
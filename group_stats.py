@@ -0,0 +1,438 @@
+"""
+Group Statistics Kernel
+------------------------
+Single-pass per-group favorable/total counting shared by every audit path.
+
+Every metric this framework reports (group outcome rates, disparate impact,
+statistical parity gap, disparity score, reweighting factors) depends only on
+per-group (favorable, total) counts. This module computes those counts once:
+the group column is factorized into integer codes and ``np.bincount`` sums the
+outcome values per code, so the cost is O(rows) regardless of the number of
+groups — instead of re-filtering the whole frame once per group.
+:func:`weighted_group_rates` does the same for sample-weighted rates, and
+:func:`intersection_counts` for cells crossing several group columns.
+
+Usage:
+    from group_stats import outcome_counts
+
+    counts = outcome_counts(df, "derived_race", "action_taken", favorable=1)
+    counts.rate_dict()      # {"Asian": 0.71, "Black or African American": 0.58, ...}
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class GroupCounts:
+    """
+    Per-group favorable and total counts produced by :func:`group_counts`.
+
+    ``labels``, ``favorable`` and ``total`` are aligned: position ``i`` holds
+    the counts for group ``labels[i]``. Groups with no rows are never present,
+    so every rate is well defined.
+    """
+
+    def __init__(self, labels=(), favorable=(), total=()):
+        self.labels = list(labels)
+        self.favorable = np.asarray(favorable, dtype=float)
+        self.total = np.asarray(total, dtype=np.int64 if len(self.labels) == 0 else None)
+        if not (len(self.labels) == len(self.favorable) == len(self.total)):
+            raise ValueError("labels, favorable and total must have the same length.")
+
+    @classmethod
+    def from_mapping(cls, mapping: dict) -> GroupCounts:
+        """
+        Build counts from a pre-aggregated ``{group: {"favorable": f, "total": n}}`` mapping.
+
+        This is the contingency-table form an upstream ``GROUP BY`` produces.
+
+        Raises
+        ------
+        ValueError
+            If the mapping is empty, a field is missing, or a group has
+            ``total <= 0``, ``favorable < 0`` or ``favorable > total``.
+        """
+        if not isinstance(mapping, dict):
+            raise ValueError("Group counts must be a {group: {favorable, total}} mapping.")
+        if not mapping:
+            raise ValueError("Group counts are empty.")
+        labels, favorable, total = [], [], []
+        for group, entry in mapping.items():
+            try:
+                fav, tot = entry["favorable"], entry["total"]
+            except (KeyError, TypeError):
+                raise ValueError(
+                    f"Counts for group '{group}' must have 'favorable' and 'total' fields."
+                ) from None
+            if tot <= 0:
+                raise ValueError(f"Group '{group}' has total={tot}; totals must be positive.")
+            if not 0 <= fav <= tot:
+                raise ValueError(
+                    f"Group '{group}' has favorable={fav}, which must be between 0 and total={tot}."
+                )
+            labels.append(group)
+            favorable.append(fav)
+            total.append(tot)
+        return cls(labels, favorable, total)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label) -> bool:
+        return label in self.labels
+
+    def __repr__(self) -> str:
+        return f"GroupCounts({self.to_dict()!r})"
+
+    @property
+    def n_records(self) -> int:
+        """Number of rows counted across all groups."""
+        return int(self.total.sum())
+
+    @property
+    def rates(self) -> np.ndarray:
+        """Favorable outcome rate per group (favorable / total)."""
+        return self.favorable / self.total
+
+    def rate_dict(self, decimals: int | None = None) -> dict:
+        """Return ``{group: rate}``, optionally rounded to ``decimals`` places."""
+        rates = self.rates
+        if decimals is not None:
+            rates = rates.round(decimals)
+        return {label: float(rate) for label, rate in zip(self.labels, rates)}
+
+    def merge(self, other: GroupCounts) -> GroupCounts:
+        """
+        Return the combined counts of ``self`` and ``other``.
+
+        Counts are additive, so auditing a file chunk by chunk and merging the
+        partial counts gives exactly the counts of the whole file.
+        """
+        try:
+            labels = sorted(set(self.labels) | set(other.labels))
+        except TypeError:
+            labels = list(dict.fromkeys(self.labels + other.labels))
+        index = {label: i for i, label in enumerate(labels)}
+        favorable = np.zeros(len(labels), dtype=float)
+        total = np.zeros(len(labels), dtype=np.result_type(self.total, other.total))
+        for part in (self, other):
+            positions = [index[label] for label in part.labels]
+            favorable[positions] += part.favorable
+            total[positions] += part.total
+        return GroupCounts(labels, favorable, total)
+
+    __add__ = merge
+
+    def subtract(self, other: GroupCounts) -> GroupCounts:
+        """
+        Return ``self`` with the counts in ``other`` removed.
+
+        The inverse of :meth:`merge`, for retracting rows that were counted
+        earlier. Groups left with no rows are dropped.
+
+        Raises
+        ------
+        ValueError
+            If ``other`` has a group that ``self`` lacks, or more favorable or
+            total rows for a group than ``self`` holds.
+        """
+        index = {label: i for i, label in enumerate(self.labels)}
+        unknown = [label for label in other.labels if label not in index]
+        if unknown:
+            raise ValueError(f"Cannot subtract counts for groups that were never counted: {unknown}.")
+        favorable = self.favorable.copy()
+        total = self.total.astype(np.result_type(self.total, other.total), copy=True)
+        positions = [index[label] for label in other.labels]
+        favorable[positions] -= other.favorable
+        total[positions] -= other.total
+        if total.dtype.kind == "f":
+            # Weighted sums: absorb float round-off so fully retracted groups reach 0.
+            tolerance = 1e-9 * np.maximum(np.abs(self.total), 1.0)
+            total[np.abs(total) <= tolerance] = 0.0
+            favorable[np.abs(favorable) <= tolerance] = 0.0
+            favorable = np.where((favorable > total) & (favorable - total <= tolerance), total, favorable)
+        if (total < 0).any() or (favorable < 0).any() or (favorable > total).any():
+            raise ValueError("Cannot subtract more rows from a group than were counted.")
+        kept = total > 0
+        labels = np.asarray(self.labels, dtype=object)
+        return GroupCounts(labels[kept], favorable[kept], total[kept])
+
+    __sub__ = subtract
+
+    def to_dict(self) -> dict:
+        """Return ``{group: {"favorable": ..., "total": ...}}`` with plain Python numbers."""
+        return {
+            label: {"favorable": fav.item(), "total": tot.item()}
+            for label, fav, tot in zip(self.labels, self.favorable, self.total)
+        }
+
+
+def group_counts(groups, values) -> GroupCounts:
+    """
+    Count rows and sum outcome values per group in a single pass.
+
+    Parameters
+    ----------
+    groups : array-like
+        Group label per row (e.g. a race column). Missing labels are dropped.
+    values : array-like
+        Numeric outcome per row — a 0/1 favorable indicator, or a float score.
+        Rows with a missing value are dropped, matching ``groupby().mean()``.
+
+    Returns
+    -------
+    GroupCounts
+        Groups in sorted order (the same order ``DataFrame.groupby`` uses),
+        with the summed values as ``favorable`` and the row count as ``total``.
+    """
+    if isinstance(groups, (list, tuple)):
+        groups = np.asarray(groups, dtype=object)
+    codes, labels = pd.factorize(groups, sort=True)
+    values = np.asarray(values, dtype=float)
+    if len(codes) != len(values):
+        raise ValueError(
+            f"groups and values must have the same length ({len(codes)} != {len(values)})."
+        )
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    if not valid.all():
+        codes = codes[valid]
+        values = values[valid]
+
+    n_labels = len(labels)
+    favorable = np.bincount(codes, weights=values, minlength=n_labels)
+    total = np.bincount(codes, minlength=n_labels)
+
+    # Categorical inputs can carry categories with no rows — drop them so
+    # every reported group has a defined rate.
+    observed = total > 0
+    labels = np.asarray(labels, dtype=object)
+    return GroupCounts(labels[observed], favorable[observed], total[observed])
+
+
+class WeightedRates:
+    """
+    Per-group weighted outcome rates produced by :func:`weighted_group_rates`.
+
+    ``favorable`` holds each group's sum of ``weight * value`` and
+    ``weight_total`` its sum of weights; ``effective_n`` is Kish's effective
+    sample size, ``(sum w)^2 / sum w^2``, which shrinks as weights become
+    more uneven. Groups whose weights sum to zero have a rate of 0.
+    """
+
+    def __init__(self, labels, favorable, weight_total, weight_sq_total):
+        self.labels = list(labels)
+        self.favorable = np.asarray(favorable, dtype=float)
+        self.weight_total = np.asarray(weight_total, dtype=float)
+        self.weight_sq_total = np.asarray(weight_sq_total, dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def rates(self) -> np.ndarray:
+        """Weighted favorable rate per group (0 where the group's weights sum to 0)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.weight_total > 0, self.favorable / self.weight_total, 0.0)
+
+    @property
+    def effective_n(self) -> np.ndarray:
+        """Kish effective sample size per group."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.weight_sq_total > 0, self.weight_total ** 2 / self.weight_sq_total, 0.0)
+
+    def rate_dict(self, decimals: int | None = None) -> dict:
+        """Return ``{group: weighted rate}``, optionally rounded to ``decimals`` places."""
+        rates = self.rates
+        if decimals is not None:
+            rates = rates.round(decimals)
+        return {label: float(rate) for label, rate in zip(self.labels, rates)}
+
+
+def weighted_group_rates(groups, values, weights) -> WeightedRates:
+    """
+    Weighted per-group rates, weight totals and effective sample sizes in one pass.
+
+    The weighted counterpart of :func:`group_counts`: the group column is
+    factorized once and ``np.bincount`` accumulates ``weight * value``,
+    ``weight`` and ``weight ** 2`` per group, instead of masking the frame
+    once per group.
+
+    Parameters
+    ----------
+    groups : array-like
+        Group label per row. Missing labels are dropped.
+    values : array-like
+        Numeric outcome per row, usually a 0/1 favorable indicator.
+    weights : array-like
+        Non-negative sample weight per row. Rows with a missing value or
+        weight are dropped.
+    """
+    if isinstance(groups, (list, tuple)):
+        groups = np.asarray(groups, dtype=object)
+    codes, labels = pd.factorize(groups, sort=True)
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if not len(codes) == len(values) == len(weights):
+        raise ValueError(
+            f"groups, values and weights must have the same length "
+            f"({len(codes)}, {len(values)}, {len(weights)})."
+        )
+
+    valid = (codes >= 0) & ~np.isnan(values) & ~np.isnan(weights)
+    if not valid.all():
+        codes, values, weights = codes[valid], values[valid], weights[valid]
+
+    n_labels = len(labels)
+    favorable = np.bincount(codes, weights=weights * values, minlength=n_labels)
+    weight_total = np.bincount(codes, weights=weights, minlength=n_labels)
+    weight_sq_total = np.bincount(codes, weights=weights * weights, minlength=n_labels)
+
+    observed = np.bincount(codes, minlength=n_labels) > 0
+    labels = np.asarray(labels, dtype=object)
+    return WeightedRates(
+        labels[observed], favorable[observed], weight_total[observed], weight_sq_total[observed]
+    )
+
+
+INTERSECTION_SEP = " × "  # joins the per-column labels of an intersectional cell
+
+# Mixed-radix code spaces up to this size are counted with a dense bincount;
+# larger (sparser) ones go through np.unique over the occupied codes only.
+_DENSE_CODE_SPACE = 1 << 22
+
+
+class IntersectionCounts:
+    """
+    Per-cell favorable and total counts over several group columns.
+
+    Produced by :func:`intersection_counts`. Only occupied cells are stored:
+    ``digits[i]`` holds cell ``i``'s code in each column (an index into
+    ``levels[col]``), aligned with ``favorable[i]`` and ``total[i]``.
+    """
+
+    def __init__(self, columns, levels, digits, favorable, total):
+        self.columns = list(columns)
+        self.levels = [np.asarray(level, dtype=object) for level in levels]
+        self.digits = np.asarray(digits, dtype=np.int64).reshape(-1, len(self.columns))
+        self.favorable = np.asarray(favorable, dtype=float)
+        self.total = np.asarray(total, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def __repr__(self) -> str:
+        return f"IntersectionCounts(columns={self.columns!r}, cells={len(self)})"
+
+    @property
+    def n_records(self) -> int:
+        return int(self.total.sum())
+
+    def cell_labels(self, mask=None) -> list[str]:
+        """``"A × B × C"`` label of each cell (or each cell selected by ``mask``)."""
+        digits = self.digits if mask is None else self.digits[mask]
+        parts = [self.levels[j][digits[:, j]].astype(str) for j in range(len(self.columns))]
+        if not parts or len(digits) == 0:
+            return []
+        labels = parts[0]
+        for part in parts[1:]:
+            labels = np.char.add(np.char.add(labels, INTERSECTION_SEP), part)
+        return labels.tolist()
+
+    def to_group_counts(self, min_cell_size: int = 1) -> GroupCounts:
+        """
+        Cells with at least ``min_cell_size`` rows as :class:`GroupCounts`
+        keyed by their combined label, in sorted order.
+        """
+        kept = self.total >= min_cell_size
+        labels = self.cell_labels(kept)
+        order = np.argsort(np.asarray(labels, dtype=object), kind="stable") if labels else []
+        return GroupCounts(
+            [labels[i] for i in order], self.favorable[kept][order], self.total[kept][order]
+        )
+
+
+def intersection_counts(groups: pd.DataFrame, values) -> IntersectionCounts:
+    """
+    Count rows and sum outcome values per intersection of several group columns.
+
+    Each column is factorized separately and the codes are combined into one
+    integer per row by mixed-radix encoding (``code = sum(digit_j * stride_j)``),
+    so the rows are counted in one ``np.bincount`` pass however many columns
+    are crossed. Only occupied cells are materialized. Rows with a missing
+    label in any column, or a missing value, are dropped.
+
+    Parameters
+    ----------
+    groups : DataFrame
+        One column per attribute (e.g. race, sex, age band).
+    values : array-like
+        Numeric outcome per row, usually a 0/1 favorable indicator.
+
+    Raises
+    ------
+    ValueError
+        If ``groups`` has no columns, the lengths differ, or the combined
+        code space does not fit in 64 bits.
+    """
+    if groups.shape[1] == 0:
+        raise ValueError("At least one group column is required.")
+    values = np.asarray(values, dtype=float)
+    if len(groups) != len(values):
+        raise ValueError(
+            f"groups and values must have the same length ({len(groups)} != {len(values)})."
+        )
+
+    codes, levels = [], []
+    for col in groups.columns:
+        col_codes, col_levels = pd.factorize(groups[col], sort=True)
+        codes.append(col_codes)
+        levels.append(col_levels)
+    radices = [max(len(level), 1) for level in levels]
+    code_space = int(np.prod([float(r) for r in radices]))
+    if code_space >= 2 ** 62:
+        raise ValueError(f"{len(radices)} columns with {radices} levels exceed the 64-bit code space.")
+
+    strides = np.cumprod([1] + radices[:0:-1])[::-1].astype(np.int64)  # last column varies fastest
+    valid = ~np.isnan(values)
+    combined = np.zeros(len(values), dtype=np.int64)
+    for col_codes, stride in zip(codes, strides):
+        valid &= col_codes >= 0
+        combined += col_codes.astype(np.int64) * stride
+    combined, values = combined[valid], values[valid]
+
+    if code_space <= max(_DENSE_CODE_SPACE, 4 * len(combined)):
+        total = np.bincount(combined, minlength=code_space)
+        favorable = np.bincount(combined, weights=values, minlength=code_space)
+        occupied = np.flatnonzero(total)
+        total, favorable = total[occupied], favorable[occupied]
+    else:
+        occupied, inverse = np.unique(combined, return_inverse=True)
+        total = np.bincount(inverse, minlength=len(occupied))
+        favorable = np.bincount(inverse, weights=values, minlength=len(occupied))
+
+    digits = (occupied[:, None] // strides[None, :]) % np.asarray(radices, dtype=np.int64)[None, :]
+    return IntersectionCounts(groups.columns, levels, digits, favorable, total)
+
+
+def favorable_indicator(outcomes, favorable: Any, keep_missing: bool = False) -> np.ndarray:
+    """
+    Return a float 0/1 array marking rows whose outcome equals ``favorable``.
+
+    With ``keep_missing=True`` rows with a missing outcome are NaN instead of
+    0, so :func:`group_counts` excludes them from the denominator.
+    """
+    outcomes = pd.Series(outcomes) if not isinstance(outcomes, pd.Series) else outcomes
+    indicator = (outcomes == favorable).to_numpy(dtype=float)
+    if keep_missing:
+        indicator[outcomes.isna().to_numpy()] = np.nan
+    return indicator
+
+
+def outcome_counts(df: pd.DataFrame, race_col: str, outcome_col: str, favorable: Any) -> GroupCounts:
+    """Per-group counts of rows whose ``outcome_col`` equals ``favorable``."""
+    return group_counts(df[race_col], favorable_indicator(df[outcome_col], favorable))
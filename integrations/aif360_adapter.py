@@ -16,13 +16,16 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 
+from config_registry import default_registry, load_config
+from fairness_audit import disparate_impact_ratios
+from group_stats import group_counts, outcome_counts
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,9 +49,12 @@ class CommunityAIF360Audit:
     @classmethod
     def from_config(cls, config_path: str) -> CommunityAIF360Audit:
         """Load a community config from a JSON file."""
-        with open(config_path) as f:
-            config = json.load(f)
-        return cls(config)
+        return cls(load_config(config_path))
+
+    @classmethod
+    def from_registry(cls, record_id: str) -> CommunityAIF360Audit:
+        """Load a published config from the community registry by its provenance record_id."""
+        return cls(default_registry().get(record_id))
 
     @classmethod
     def from_dict(cls, config: dict) -> CommunityAIF360Audit:
@@ -113,18 +119,18 @@ class CommunityAIF360Audit:
             unfavorable_label=0,
         )
 
+        # Per-group label rates in one pass, keyed by protected-attribute code
+        code_rates = group_counts(df_work["__protected__"], df_work["__label__"]).rate_dict()
+
         # Privileged group = community-defined reference
         ref_code = group_map.get(self.fairness_target)
         if ref_code is None:
             # Fall back to highest-rate group
-            rates = df_work.groupby("__protected__")["__label__"].mean()
-            ref_code = rates.idxmax()
+            ref_code = max(code_rates, key=lambda c: code_rates[c])
 
         results = {"groups": {}, "provenance": self.provenance, "audit_classification": self.audit_classification}
         reverse_map = {v: k for k, v in group_map.items()}
 
-        ref_rate = df_work[df_work["__protected__"] == ref_code]["__label__"].mean()
-
         for code, group_name in reverse_map.items():
             metric = BinaryLabelDatasetMetric(
                 dataset,
@@ -132,7 +138,7 @@ class CommunityAIF360Audit:
                 privileged_groups=[{"__protected__": ref_code}],
             )
             di = metric.disparate_impact()
-            rate = df_work[df_work["__protected__"] == code]["__label__"].mean()
+            rate = code_rates[code]
 
             results["groups"][group_name] = {
                 "outcome_rate": round(rate, 4),
@@ -152,15 +158,14 @@ class CommunityAIF360Audit:
         self, df, label_col, protected_col, favorable_label
     ) -> dict:
         """Pure-pandas fallback — no AIF360 dependency required."""
-        binary = (df[label_col] == favorable_label).astype(float)
-        group_rates = binary.groupby(df[protected_col]).mean().to_dict()
+        group_rates = outcome_counts(df, protected_col, label_col, favorable_label).rate_dict()
 
         # Reference group
         ref = self.fairness_target
         if ref not in group_rates:
             ref = max(group_rates, key=lambda g: group_rates[g])
 
-        ref_rate = group_rates[ref]
+        di_ratios = disparate_impact_ratios(group_rates, ref)
 
         results = {
             "reference_group": ref,
@@ -171,13 +176,7 @@ class CommunityAIF360Audit:
         }
 
         for group, rate in group_rates.items():
-            if group == ref:
-                di = 1.0
-            elif ref_rate == 0:
-                di = None
-            else:
-                di = round(rate / ref_rate, 4)
-
+            di = di_ratios[group]
             results["groups"][group] = {
                 "outcome_rate": round(rate, 4),
                 "disparate_impact": di,
@@ -16,7 +16,6 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Optional
@@ -24,6 +23,10 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from config_registry import default_registry, load_config
+from fairness_audit import disparate_impact_ratios
+from group_stats import group_counts
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,9 +49,12 @@ class CommunityFairlearnMitigation:
 
     @classmethod
     def from_config(cls, config_path: str) -> CommunityFairlearnMitigation:
-        with open(config_path) as f:
-            config = json.load(f)
-        return cls(config)
+        return cls(load_config(config_path))
+
+    @classmethod
+    def from_registry(cls, record_id: str) -> CommunityFairlearnMitigation:
+        """Load a published config from the community registry by its provenance record_id."""
+        return cls(default_registry().get(record_id))
 
     @classmethod
     def from_dict(cls, config: dict) -> CommunityFairlearnMitigation:
@@ -92,11 +98,7 @@ class CommunityFairlearnMitigation:
         return self._compute_flags(rates)
 
     def _audit_builtin(self, y_true, y_pred, sensitive_features) -> dict:
-        df = pd.DataFrame({
-            "y_pred": y_pred,
-            "group": sensitive_features,
-        })
-        rates = df.groupby("group")["y_pred"].mean().to_dict()
+        rates = group_counts(sensitive_features, y_pred).rate_dict()
         return self._compute_flags(rates)
 
     def _compute_flags(self, rates: dict) -> dict:
@@ -104,17 +106,11 @@ class CommunityFairlearnMitigation:
         if ref not in rates:
             ref = max(rates, key=lambda g: rates[g])
 
-        ref_rate = rates[ref]
+        di_ratios = disparate_impact_ratios(rates, ref)
 
         groups = {}
         for group, rate in rates.items():
-            if group == ref:
-                di = 1.0
-            elif ref_rate == 0:
-                di = None
-            else:
-                di = round(rate / ref_rate, 4)
-
+            di = di_ratios[group]
             groups[group] = {
                 "selection_rate": round(rate, 4),
                 "disparate_impact": di,
@@ -1,17 +1,20 @@
-import json
 import logging
 
+from config_registry import load_config
+
 
 def load_community_definitions(file_path='data/community_definitions.json'):
     """
     Load community fairness definitions from JSON.
     Falls back to defaults if the file is not found.
+
+    The parsed file is cached until its modification time changes (see
+    ``config_registry.load_config``).
     """
     try:
-        with open(file_path, 'r') as f:
-            definitions = json.load(f)
-            logging.info("Loaded community fairness definitions from %s", file_path)
-            return definitions
+        definitions = load_config(file_path)
+        logging.info("Loaded community fairness definitions from %s", file_path)
+        return definitions
     except FileNotFoundError:
         logging.info("No community definitions file found at %s — using defaults.", file_path)
         return {
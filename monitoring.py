@@ -0,0 +1,484 @@
+"""
+Continuous Monitoring
+----------------------
+Incremental audit state for decision streams that are audited repeatedly.
+
+A nightly audit of a decision log is mostly the same rows as the night
+before. Every audit metric depends only on per-group (favorable, total)
+counts (see ``group_stats``), and those counts are additive, so an
+:class:`AuditAccumulator` keeps just the counts: new decisions are added
+with ``update``, corrected or expired ones removed with ``retract``, and
+shards counted by separate workers combined with ``merge``. ``report``
+builds the same report as the API's ``/audit`` endpoints without touching
+the history again.
+
+:class:`RollingAuditMonitor` adds time: it keys decisions on a timestamp
+column and keeps per-bucket (e.g. per-day) group counts in a ring buffer,
+so disparate impact over the last 7, 30 or 90 days is a sum over buckets —
+O(buckets x groups) — rather than a re-audit of a filtered extract.
+
+Usage:
+    from monitoring import AuditAccumulator
+
+    acc = AuditAccumulator("derived_race", "action_taken", favorable=1)
+    for batch in todays_batches:
+        acc.update(batch)
+    acc.merge(other_worker_accumulator)
+    report = acc.report(community_defs)
+
+    monitor = RollingAuditMonitor("derived_race", "action_taken", "decided_at", favorable=1)
+    monitor.update(new_decisions)
+    monitor.window_report("30D", community_defs)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from fairness_audit import build_audit_report
+from group_stats import GroupCounts, favorable_indicator, group_counts, weighted_group_rates
+from racial_bias_score import calculate_racial_bias_score_from_counts
+
+
+class AuditAccumulator:
+    """
+    Mergeable per-group favorable/total counts for one outcome definition.
+
+    Parameters
+    ----------
+    race_col : str
+        Group column of the batches passed to :meth:`update`.
+    outcome_col : str
+        Outcome column of those batches.
+    favorable : object
+        Outcome value counted as favorable, already of the column's type.
+    weight_col : str, optional
+        Sample-weight column. When set, rates are weighted: each group's
+        favorable rate is ``sum(weight * favorable) / sum(weight)``.
+
+    Attributes
+    ----------
+    counts : GroupCounts
+        Unweighted favorable/total row counts per group.
+    weighted : GroupCounts or None
+        Weighted sums per group (``favorable`` is the weighted favorable sum,
+        ``total`` the weight sum); None for an unweighted accumulator.
+    n_records : int
+        Rows currently accounted for, including rows with a missing group.
+    """
+
+    def __init__(self, race_col: str, outcome_col: str, favorable: Any, weight_col: str | None = None):
+        self.race_col = race_col
+        self.outcome_col = outcome_col
+        self.favorable = favorable
+        self.weight_col = weight_col
+        self.counts = GroupCounts()
+        self.weighted = GroupCounts() if weight_col is not None else None
+        self.n_records = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"AuditAccumulator(race_col={self.race_col!r}, outcome_col={self.outcome_col!r}, "
+            f"favorable={self.favorable!r}, weight_col={self.weight_col!r}, n_records={self.n_records})"
+        )
+
+    # -- accumulation ---------------------------------------------------------
+
+    def update(self, batch) -> AuditAccumulator:
+        """Add the rows of ``batch`` (a DataFrame) and return the accumulator."""
+        counts, weighted = self._count(batch)
+        self.counts = self.counts.merge(counts)
+        if weighted is not None:
+            self.weighted = self.weighted.merge(weighted)
+        self.n_records += len(batch)
+        return self
+
+    def retract(self, batch) -> AuditAccumulator:
+        """
+        Remove rows previously added with :meth:`update` and return the accumulator.
+
+        Raises
+        ------
+        ValueError
+            If ``batch`` holds rows that were never counted. The accumulator
+            is left unchanged.
+        """
+        if len(batch) > self.n_records:
+            raise ValueError(
+                f"Cannot retract {len(batch)} rows; only {self.n_records} have been counted."
+            )
+        counts, weighted = self._count(batch)
+        remaining = self.counts.subtract(counts)
+        remaining_weighted = self.weighted.subtract(weighted) if weighted is not None else None
+        self.counts, self.weighted = remaining, remaining_weighted
+        self.n_records -= len(batch)
+        return self
+
+    def merge(self, other: AuditAccumulator) -> AuditAccumulator:
+        """
+        Add the state of ``other`` (e.g. another worker's shard) and return the accumulator.
+
+        Raises
+        ------
+        ValueError
+            If ``other`` counts a different group, outcome, favorable value or
+            weight column.
+        """
+        mine = (self.race_col, self.outcome_col, self.favorable, self.weight_col)
+        theirs = (other.race_col, other.outcome_col, other.favorable, other.weight_col)
+        if mine != theirs:
+            raise ValueError(
+                f"Cannot merge accumulators for different audits: {mine} != {theirs}."
+            )
+        self.counts = self.counts.merge(other.counts)
+        if self.weighted is not None:
+            self.weighted = self.weighted.merge(other.weighted)
+        self.n_records += other.n_records
+        return self
+
+    def _count(self, batch) -> tuple[GroupCounts, GroupCounts | None]:
+        missing = [c for c in (self.race_col, self.outcome_col, self.weight_col) if c is not None and c not in batch]
+        if missing:
+            raise ValueError(f"Column(s) not found in batch: {missing}.")
+        groups = batch[self.race_col]
+        indicator = favorable_indicator(batch[self.outcome_col], self.favorable)
+        counts = group_counts(groups, indicator)
+        if self.weight_col is None:
+            return counts, None
+        rates = weighted_group_rates(groups, indicator, batch[self.weight_col])
+        return counts, GroupCounts(rates.labels, rates.favorable, rates.weight_total)
+
+    # -- reporting ------------------------------------------------------------
+
+    def group_counts(self) -> GroupCounts:
+        """
+        The counts the report is built from: row counts, or weighted sums for
+        a weighted accumulator (groups whose weights sum to 0 are left out).
+        """
+        if self.weighted is None:
+            return self.counts
+        kept = self.weighted.total > 0
+        return GroupCounts(
+            [label for label, keep in zip(self.weighted.labels, kept) if keep],
+            self.weighted.favorable[kept],
+            self.weighted.total[kept],
+        )
+
+    def report(
+        self,
+        community_defs: dict,
+        favorable_value: Any = None,
+        privileged_group: str | None = None,
+    ) -> dict:
+        """
+        Build the ``/audit`` report for everything accumulated so far.
+
+        Identical to auditing the accumulated rows in one request.
+        ``favorable_value`` is echoed in the summary as given (defaults to
+        the accumulator's ``favorable``).
+
+        Raises
+        ------
+        ValueError
+            If no rows with a group label have been counted.
+        """
+        return build_audit_report(
+            self.group_counts(),
+            community_defs,
+            outcome_col=self.outcome_col,
+            favorable_value=self.favorable if favorable_value is None else favorable_value,
+            privileged_group=privileged_group,
+            total_records=self.n_records,
+        )
+
+    def bias_score(self) -> dict:
+        """Racial bias score (group outcomes and disparity) of the accumulated rows."""
+        return calculate_racial_bias_score_from_counts(self.group_counts())
+
+    # -- serialization --------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        """JSON-serializable state, for shipping a shard to the process that merges it."""
+        state = {
+            "race_col": self.race_col,
+            "outcome_col": self.outcome_col,
+            "favorable": self.favorable,
+            "weight_col": self.weight_col,
+            "n_records": self.n_records,
+            "counts": self.counts.to_dict(),
+        }
+        if self.weighted is not None:
+            state["weighted"] = self.group_counts().to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> AuditAccumulator:
+        """Rebuild an accumulator from :meth:`to_dict` output."""
+        acc = cls(state["race_col"], state["outcome_col"], state["favorable"], state.get("weight_col"))
+        acc.n_records = int(state["n_records"])
+        if state["counts"]:
+            acc.counts = GroupCounts.from_mapping(state["counts"])
+        if acc.weight_col is not None and state.get("weighted"):
+            acc.weighted = GroupCounts.from_mapping(state["weighted"])
+        return acc
+
+
+class RollingAuditMonitor:
+    """
+    Time-bucketed group counts in a ring buffer, for audits over rolling windows.
+
+    Each event lands in the bucket ``floor(timestamp / bucket)`` (buckets are
+    aligned to the Unix epoch, so daily buckets are UTC days). The buffer
+    holds the newest ``retention`` buckets; an event newer than any seen so
+    far advances the buffer and clears the buckets that fall out of it, and
+    an event older than the retained range is dropped and counted in
+    ``late_events``. An event stamped more than ``max_skew`` past the wall
+    clock is dropped and counted in ``future_events``: otherwise one bad
+    timestamp would advance the ring past every real event and clear it.
+
+    Parameters
+    ----------
+    race_col, outcome_col, time_col : str
+        Group, outcome and timestamp columns of the batches passed to
+        :meth:`update`. Naive timestamps are taken as UTC.
+    favorable : object
+        Outcome value counted as favorable, already of the column's type.
+    bucket : str or pandas.Timedelta
+        Bucket width (default one day).
+    retention : int
+        Number of buckets kept; the longest window that can be answered.
+    max_skew : str or pandas.Timedelta, optional
+        How far past the current time an event may be stamped (default one
+        hour); None accepts any timestamp.
+    max_groups : int
+        Distinct group labels the monitor will track. Each one adds a column
+        of ``retention`` buckets.
+    """
+
+    def __init__(
+        self,
+        race_col: str,
+        outcome_col: str,
+        time_col: str,
+        favorable: Any,
+        bucket: str | pd.Timedelta = "1D",
+        retention: int = 90,
+        max_skew: str | pd.Timedelta | None = "1h",
+        max_groups: int = 1000,
+    ):
+        self.race_col = race_col
+        self.outcome_col = outcome_col
+        self.time_col = time_col
+        self.favorable = favorable
+        self.bucket = pd.Timedelta(bucket)
+        if self.bucket <= pd.Timedelta(0):
+            raise ValueError(f"bucket must be a positive duration, got {bucket!r}.")
+        if retention < 1:
+            raise ValueError(f"retention must be at least one bucket, got {retention}.")
+        self.retention = int(retention)
+        self.max_skew = None if max_skew is None else pd.Timedelta(max_skew)
+        if self.max_skew is not None and self.max_skew < pd.Timedelta(0):
+            raise ValueError(f"max_skew must not be negative, got {max_skew!r}.")
+        if max_groups < 1:
+            raise ValueError(f"max_groups must be at least 1, got {max_groups}.")
+        self.max_groups = int(max_groups)
+        self.labels: list = []
+        self._label_index: dict = {}
+        self._favorable = np.zeros((self.retention, 0), dtype=float)
+        self._total = np.zeros((self.retention, 0), dtype=np.int64)
+        # Bucket number held by each slot of the ring (int64 min = never used).
+        self._slot_bucket = np.full(self.retention, np.iinfo(np.int64).min, dtype=np.int64)
+        self.head: int | None = None  # newest bucket number seen
+        self.late_events = 0
+        self.future_events = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"RollingAuditMonitor(race_col={self.race_col!r}, outcome_col={self.outcome_col!r}, "
+            f"time_col={self.time_col!r}, bucket={self.bucket!s}, retention={self.retention})"
+        )
+
+    # -- ingestion ------------------------------------------------------------
+
+    def update(self, batch) -> int:
+        """Add the decisions in ``batch`` (a DataFrame); returns the number of events kept."""
+        missing = [c for c in (self.race_col, self.outcome_col, self.time_col) if c not in batch]
+        if missing:
+            raise ValueError(f"Column(s) not found in batch: {missing}.")
+        return self.add(
+            batch[self.time_col],
+            batch[self.race_col],
+            favorable_indicator(batch[self.outcome_col], self.favorable),
+        )
+
+    def add(self, timestamps, groups, indicator, now=None) -> int:
+        """
+        Add events given as aligned arrays; returns the number of events kept.
+
+        ``indicator`` is the 0/1 favorable flag per event (see
+        ``group_stats.favorable_indicator``). Events with a missing
+        timestamp, group or indicator are skipped. ``now`` (default: the
+        wall clock) is the time ``max_skew`` is measured from.
+
+        Raises
+        ------
+        ValueError
+            If the arrays differ in length, a timestamp cannot be parsed or
+            the batch would take the monitor past ``max_groups`` groups.
+        """
+        times = pd.to_datetime(pd.Series(timestamps), utc=True)
+        codes = self._group_codes(groups)
+        indicator = np.asarray(indicator, dtype=float)
+        if not len(times) == len(codes) == len(indicator):
+            raise ValueError(
+                f"timestamps, groups and indicator must have the same length "
+                f"({len(times)}, {len(codes)}, {len(indicator)})."
+            )
+        valid = times.notna().to_numpy() & (codes >= 0) & ~np.isnan(indicator)
+        if not valid.any():
+            return 0
+        if self.max_skew is not None:
+            limit = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+            limit = (limit if limit.tzinfo is not None else limit.tz_localize("UTC")) + self.max_skew
+            future = valid & (times > limit).to_numpy()
+            self.future_events += int(future.sum())
+            valid &= ~future
+            if not valid.any():
+                return 0
+        buckets = self._bucket_numbers(times[valid])
+        codes, indicator = codes[valid], indicator[valid]
+
+        self._advance(int(buckets.max()))
+        current = buckets > self.head - self.retention
+        self.late_events += int((~current).sum())
+        buckets, codes, indicator = buckets[current], codes[current], indicator[current]
+
+        n_groups = len(self.labels)
+        cells = (buckets % self.retention) * n_groups + codes
+        size = self.retention * n_groups
+        self._favorable += np.bincount(cells, weights=indicator, minlength=size).reshape(self.retention, n_groups)
+        self._total += np.bincount(cells, minlength=size).reshape(self.retention, n_groups)
+        return int(current.sum())
+
+    def _group_codes(self, groups) -> np.ndarray:
+        """Map group labels to stable column indices, adding columns for new groups."""
+        if isinstance(groups, (list, tuple)):
+            groups = np.asarray(groups, dtype=object)
+        codes, uniques = pd.factorize(groups)
+        new = [label for label in uniques if label not in self._label_index]
+        if len(self.labels) + len(new) > self.max_groups:
+            raise ValueError(
+                f"Batch adds {len(new)} new group(s) to the {len(self.labels)} tracked; "
+                f"the monitor holds at most {self.max_groups}. Is race_col an ID column?"
+            )
+        if new:
+            for label in new:
+                self._label_index[label] = len(self.labels)
+                self.labels.append(label)
+            pad = ((0, 0), (0, len(new)))
+            self._favorable = np.pad(self._favorable, pad)
+            self._total = np.pad(self._total, pad)
+        lookup = np.array([self._label_index[label] for label in uniques] + [-1], dtype=np.int64)
+        return lookup[codes]
+
+    def _advance(self, newest: int) -> None:
+        """Move the ring forward to ``newest``, clearing the slots it reuses."""
+        if self.head is not None and newest <= self.head:
+            return
+        first = newest - self.retention + 1 if self.head is None else max(self.head + 1, newest - self.retention + 1)
+        for bucket in range(first, newest + 1):
+            slot = bucket % self.retention
+            self._favorable[slot] = 0.0
+            self._total[slot] = 0
+            self._slot_bucket[slot] = bucket
+        self.head = newest
+
+    # -- queries --------------------------------------------------------------
+
+    def _window_buckets(self, window, end=None) -> tuple[int, int]:
+        """First and last bucket number of ``window`` ending at ``end`` (default: the newest bucket)."""
+        if isinstance(window, (int, np.integer)):
+            n_buckets = int(window)
+        else:
+            n_buckets = math.ceil(pd.Timedelta(window) / self.bucket)
+        if not 1 <= n_buckets <= self.retention:
+            raise ValueError(
+                f"Window {window!r} spans {n_buckets} bucket(s); between 1 and {self.retention} are retained."
+            )
+        if end is not None:
+            last = int(self._bucket_numbers(pd.Series([end]))[0])
+        else:
+            last = self.head if self.head is not None else 0
+        return last - n_buckets + 1, last
+
+    def _bucket_numbers(self, times: pd.Series) -> np.ndarray:
+        """Bucket number of each (non-missing) timestamp."""
+        times = pd.to_datetime(times, utc=True).dt.tz_localize(None).dt.as_unit("ns")
+        return times.to_numpy().view(np.int64) // self.bucket.value
+
+    def window_counts(self, window, end=None) -> GroupCounts:
+        """
+        Per-group counts over the last ``window`` of events.
+
+        ``window`` is a duration (``"7D"``, ``pd.Timedelta(hours=6)``),
+        rounded up to whole buckets, or a number of buckets. ``end`` is a
+        timestamp inside the window's last bucket; by default the newest
+        bucket seen. Groups are in sorted order, as in a one-shot audit.
+        """
+        first, last = self._window_buckets(window, end)
+        in_window = (self._slot_bucket >= first) & (self._slot_bucket <= last)
+        favorable = self._favorable[in_window].sum(axis=0)
+        total = self._total[in_window].sum(axis=0)
+        observed = np.flatnonzero(total > 0)
+        labels = [self.labels[i] for i in observed]
+        try:
+            order = sorted(range(len(labels)), key=labels.__getitem__)
+        except TypeError:
+            order = list(range(len(labels)))
+        return GroupCounts([labels[i] for i in order], favorable[observed][order], total[observed][order])
+
+    def window_report(
+        self,
+        window,
+        community_defs: dict,
+        end=None,
+        favorable_value: Any = None,
+        privileged_group: str | None = None,
+    ) -> dict:
+        """
+        The ``/audit`` report (DI, statistical parity gap, flagged groups, ...) for one window.
+
+        Adds a ``window`` entry with the window's UTC ``start`` (inclusive),
+        ``end`` (exclusive) and bucket count.
+
+        Raises
+        ------
+        ValueError
+            If the window is longer than the retention or holds no events.
+        """
+        first, last = self._window_buckets(window, end)
+        report = build_audit_report(
+            self.window_counts(window, end),
+            community_defs,
+            outcome_col=self.outcome_col,
+            favorable_value=self.favorable if favorable_value is None else favorable_value,
+            privileged_group=privileged_group,
+        )
+        report["window"] = {
+            "start": self._bucket_start(first).isoformat(),
+            "end": self._bucket_start(last + 1).isoformat(),
+            "buckets": last - first + 1,
+        }
+        return report
+
+    def _bucket_start(self, bucket: int) -> pd.Timestamp:
+        return pd.Timestamp(bucket * self.bucket.value, unit="ns", tz="UTC")
+
+    @property
+    def latest(self) -> pd.Timestamp | None:
+        """Start of the newest bucket that has received events, or None."""
+        return None if self.head is None else self._bucket_start(self.head)
@@ -3,8 +3,10 @@
 import pandas as pd
 import numpy as np
 
+from group_stats import GroupCounts, group_counts, intersection_counts
 
-def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='outcome'):
+
+def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='outcome', min_cell_size=1):
     """
     Calculate a basic racial bias score based on outcome disparities across racial groups.
     Returns a dictionary of group outcomes and a disparity score (max - min outcome rate).
@@ -13,8 +15,13 @@ def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='out
     ----------
     df : pd.DataFrame
         Dataset with at least the sensitive_column and outcome_column.
-    sensitive_column : str
-        Column containing racial/ethnic group labels.
+    sensitive_column : str or list of str
+        Column containing racial/ethnic group labels. A list of columns
+        (e.g. race, sex, age band) scores every intersection, labelled
+        ``"A × B × C"``.
+    min_cell_size : int
+        With several sensitive columns, intersections with fewer rows are
+        left out of the score.
     outcome_column : str
         Column containing numeric binary outcomes (0/1 or float 0.0-1.0).
 
@@ -23,8 +30,10 @@ def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='out
     ValueError
         If required columns are missing, outcome is not numeric, or data is empty.
     """
+    sensitive_columns = list(sensitive_column) if isinstance(sensitive_column, (list, tuple)) else [sensitive_column]
+
     # Validate columns exist
-    for col in (sensitive_column, outcome_column):
+    for col in (*sensitive_columns, outcome_column):
         if col not in df.columns:
             raise ValueError(
                 f"Column '{col}' not found in dataset. "
@@ -41,9 +50,15 @@ def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='out
             f"Got dtype: {df[outcome_column].dtype}"
         )
 
-    # Drop rows with NaN in either column and warn
-    clean = df[[sensitive_column, outcome_column]].dropna()
-    n_dropped = len(df) - len(clean)
+    # Single pass over the data: rows with NaN in either column are skipped
+    # by the kernel, and the difference in row counts is what was dropped.
+    if len(sensitive_columns) > 1:
+        cells = intersection_counts(df[sensitive_columns], df[outcome_column])
+        n_dropped = len(df) - cells.n_records
+        counts = cells.to_group_counts(min_cell_size)
+    else:
+        counts = group_counts(df[sensitive_columns[0]], df[outcome_column])
+        n_dropped = len(df) - counts.n_records
     if n_dropped > 0:
         import logging
         logging.getLogger(__name__).warning(
@@ -51,21 +66,49 @@ def calculate_racial_bias_score(df, sensitive_column='race', outcome_column='out
             n_dropped, sensitive_column, outcome_column,
         )
 
-    if clean.empty:
+    if len(counts) == 0 and len(sensitive_columns) > 1 and cells.n_records > 0:
+        raise ValueError(f"No intersection has at least {min_cell_size} rows.")
+    if len(counts) == 0:
         raise ValueError("No valid rows after dropping missing values.")
 
-    group_stats = clean.groupby(sensitive_column)[outcome_column].mean()
+    return calculate_racial_bias_score_from_counts(counts)
+
+
+def calculate_racial_bias_score_from_counts(counts):
+    """
+    Calculate the racial bias score from pre-aggregated per-group counts.
+
+    calculate_racial_bias_score() counts the rows and delegates here; this
+    takes the contingency table directly, so it runs in O(groups).
+
+    Parameters
+    ----------
+    counts : dict or GroupCounts
+        ``{group: {"favorable": f, "total": n}}`` mapping (e.g. the result of an
+        upstream GROUP BY), or a GroupCounts instance.
+
+    Raises
+    ------
+    ValueError
+        If the counts are empty or inconsistent (see GroupCounts.from_mapping).
+    """
+    if not isinstance(counts, GroupCounts):
+        counts = GroupCounts.from_mapping(counts)
+    if len(counts) == 0:
+        raise ValueError("Group counts are empty.")
+
+    group_outcomes = counts.rate_dict()
 
     # Handle single-group edge case
-    if len(group_stats) < 2:
+    if len(group_outcomes) < 2:
         return {
-            "group_outcomes": group_stats.to_dict(),
+            "group_outcomes": group_outcomes,
             "racial_disparity_score": 0.0,
         }
 
-    disparity = group_stats.max() - group_stats.min()
+    disparity = max(group_outcomes.values()) - min(group_outcomes.values())
 
     return {
-        "group_outcomes": group_stats.to_dict(),
+        "group_outcomes": group_outcomes,
         "racial_disparity_score": round(float(disparity), 4),
     }
@@ -41,7 +41,8 @@ def check_datasets_exist() -> bool:
     for ds in datasets:
         path = PROJECT_ROOT / ds
         if path.exists():
-            df = pd.read_csv(path)
+            # Parse a single column — only the row count is needed.
+            df = pd.read_csv(path, usecols=[0])
             print(f"  OK  {ds} ({len(df):,} records)")
         else:
             print(f"  MISSING  {ds}")
@@ -49,43 +50,23 @@ def check_datasets_exist() -> bool:
     return all_present
 
 
-def run_validation_study() -> dict:
+def run_validation_study(max_workers: int | None = None) -> dict:
     """Re-run the validation study from scratch and return results."""
-    from validation_study import DATASETS, RESEARCHER_DEFAULT, COMMUNITY_DEFINED, run_audit
-
-    skip_labels = {
-        "Race Not Available", "Free Form Text Only", "Joint",
-        "2 or more minority races", "Other",
-    }
+    from validation_runner import run_validations
+    from validation_study import CONFIGS, DATASETS
 
     results = {}
-    for name, config in DATASETS.items():
-        path = PROJECT_ROOT / config["path"]
-        if not path.exists():
-            continue
-
-        df = pd.read_csv(path)
-        mask = ~df[config["race_col"]].isin(skip_labels)
-        df_clean = df[mask].copy()
-
-        default_result = run_audit(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"],
-            ref_group=None, threshold=RESEARCHER_DEFAULT["threshold"],
-        )
-
-        community_ref = "Caucasian" if name == "COMPAS Recidivism" else COMMUNITY_DEFINED["fairness_target"]
-        community_result = run_audit(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"],
-            ref_group=community_ref, threshold=COMMUNITY_DEFINED["threshold"],
-        )
+    for name, dataset in run_validations(DATASETS, CONFIGS, max_workers=max_workers).items():
+        default_result = dataset["configs"]["default"]
+        community_result = dataset["configs"]["community"]
 
         default_flagged = set(default_result["flagged_groups"])
         community_flagged = set(community_result["flagged_groups"])
         newly_flagged = community_flagged - default_flagged
 
         results[name] = {
-            "n_records": len(df_clean),
-            "n_groups": df_clean[config["race_col"]].nunique(),
+            "n_records": dataset["n_records"],
+            "n_groups": dataset["n_groups"],
             "default": default_result,
             "community": community_result,
             "newly_flagged": sorted(newly_flagged),
@@ -175,15 +156,19 @@ def verify_against_published(fresh: dict, published: dict) -> tuple[int, int]:
     return passed, failed
 
 
-def check_core_claim() -> tuple[int, int]:
+def check_core_claim(fresh: dict | None = None) -> tuple[int, int]:
     """
     Verify the specific published claim:
     'In 67% of datasets, community-defined thresholds flagged additional groups.'
+
+    ``fresh`` is a :func:`run_validation_study` result; the study is re-run
+    when it is omitted.
     """
     passed = 0
     failed = 0
 
-    fresh = run_validation_study()
+    if fresh is None:
+        fresh = run_validation_study()
     datasets_with_delta = sum(1 for r in fresh.values() if r["delta_flag_count"] > 0)
     total = len(fresh)
     pct = int(datasets_with_delta / total * 100) if total > 0 else 0
@@ -253,7 +238,7 @@ def main():
 
     # 4. Verify core claim
     print("── Step 4: Verifying Core Claim ──")
-    p, f_ = check_core_claim()
+    p, f_ = check_core_claim(fresh_results)
     total_passed += p
     total_failed += f_
     print()
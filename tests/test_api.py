@@ -0,0 +1,1290 @@
+"""
+API Test Suite — FastAPI audit service
+========================================
+Request-level checks for the endpoints in api/main.py, run in-process
+through FastAPI's TestClient.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Bootstrap project root
+import sys
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+
+HEADERS = {"X-API-Key": "dev-key-12345"}
+HMDA_PATH = Path(PROJECT_ROOT) / "data" / "external" / "hmda_michigan_lending.csv"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state(monkeypatch, tmp_path):
+    # Every server start in a test gets its own job store and rate-limit buckets,
+    # never the developer's data/jobs.
+    monkeypatch.setattr(api_main, "JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(api_main, "LIMITS_DB", str(tmp_path / "limits.sqlite3"))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Caching off, so every request exercises the code path under test.
+    monkeypatch.setenv("AUDIT_CACHE_SIZE", "0")
+    with TestClient(api_main.app) as c:
+        yield c
+
+
+@pytest.fixture
+def hiring_csv():
+    df = pd.DataFrame({
+        "race": ["White"] * 4 + ["Black"] * 3 + ["Latinx"] * 3,
+        "hired": ["yes", "yes", "yes", "no", "yes", "no", "no", "yes", "no", "no"],
+    })
+    return df.to_csv(index=False).encode()
+
+
+def _upload(client, path, contents, **form):
+    return client.post(
+        path,
+        files={"file": ("data.csv", contents, "text/csv")},
+        data=form,
+        headers=HEADERS,
+    )
+
+
+class TestStreamingAudit:
+    """/audit/csv/stream must reproduce the in-memory /audit/csv report."""
+
+    def test_matches_in_memory_audit(self, client, hiring_csv, monkeypatch):
+        form = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        expected = _upload(client, "/audit/csv", hiring_csv, **form).json()
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 3)
+        streamed = _upload(client, "/audit/csv/stream", hiring_csv, **form).json()
+        assert streamed == expected
+
+    @pytest.mark.skipif(not HMDA_PATH.exists(), reason="HMDA extract not available")
+    def test_matches_in_memory_audit_hmda(self, client, monkeypatch):
+        contents = HMDA_PATH.read_bytes()
+        form = {"race_col": "derived_race", "outcome_col": "action_taken", "favorable_value": "1"}
+        expected = _upload(client, "/audit/csv", contents, **form).json()
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 500)
+        streamed = _upload(client, "/audit/csv/stream", contents, **form).json()
+        assert streamed == expected
+
+    def test_missing_column_rejected(self, client, hiring_csv):
+        resp = _upload(
+            client, "/audit/csv/stream", hiring_csv,
+            race_col="ethnicity", outcome_col="hired", favorable_value="yes",
+        )
+        assert resp.status_code == 400
+
+
+class TestAggregatedCounts:
+    """Pre-aggregated {group: {favorable, total}} payloads give the row-level results."""
+
+    COUNTS = {
+        "White": {"favorable": 3, "total": 4},
+        "Black": {"favorable": 1, "total": 3},
+        "Latinx": {"favorable": 1, "total": 3},
+    }
+
+    def test_audit_counts_match_rows(self, client, hiring_csv):
+        form = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        expected = _upload(client, "/audit/csv", hiring_csv, **form).json()
+        resp = client.post("/audit", json={"counts": self.COUNTS, **form}, headers=HEADERS)
+        assert resp.status_code == 200
+        report = resp.json()
+        assert report["metrics"] == expected["metrics"]
+        assert report["summary"]["total_records"] == 10
+        assert report["summary"]["flagged_groups"] == expected["summary"]["flagged_groups"]
+
+    def test_audit_rejects_data_and_counts(self, client):
+        body = {
+            "data": [{"race": "White", "hired": "yes"}],
+            "counts": self.COUNTS,
+            "race_col": "race",
+            "outcome_col": "hired",
+            "favorable_value": "yes",
+        }
+        assert client.post("/audit", json=body, headers=HEADERS).status_code == 422
+
+    def test_audit_rejects_favorable_above_total(self, client):
+        body = {
+            "counts": {"White": {"favorable": 5, "total": 4}, "Black": {"favorable": 1, "total": 3}},
+            "race_col": "race",
+            "outcome_col": "hired",
+        }
+        assert client.post("/audit", json=body, headers=HEADERS).status_code == 400
+
+    def test_compliance_counts_match_rows(self, client, hiring_csv):
+        config = {"priority_groups": ["Black"], "fairness_target": "White", "fairness_threshold": 0.8}
+        form = {"race_col": "race", "outcome_col": "hired", "config_json": json.dumps(config)}
+        expected = _upload(client, "/audit/compliance", hiring_csv, favorable_value="yes", **form).json()
+        resp = client.post(
+            "/audit/compliance",
+            data={**form, "counts_json": json.dumps(self.COUNTS)},
+            headers=HEADERS,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_reweight_counts_returns_weight_table(self, client):
+        body = {"counts": self.COUNTS, "race_col": "race", "outcome_col": "hired"}
+        resp = client.post("/reweight", json=body, headers=HEADERS)
+        assert resp.status_code == 200
+        table = resp.json()["weight_table"]
+        # Black is a default priority group: favorable weight = 0.75 / (1/3)
+        assert table["Black"]["favorable"] == 2.25
+        assert table["White"] == {"favorable": 1.0, "unfavorable": 1.0}
+
+
+class TestColumnarAudit:
+    """Columnar payloads ({"columns": {...}}) produce the row-dict results."""
+
+    COLUMNS = {
+        "race": ["White"] * 4 + ["Black"] * 3 + ["Latinx"] * 3,
+        "hired": ["yes", "yes", "yes", "no", "yes", "no", "no", "yes", "no", "no"],
+        "age": list(range(10)),
+    }
+    PARAMS = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    def test_columns_match_csv(self, client, hiring_csv):
+        expected = _upload(client, "/audit/csv", hiring_csv, **self.PARAMS).json()
+        resp = client.post("/audit", json={"columns": self.COLUMNS, **self.PARAMS}, headers=HEADERS)
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_raw_columnar_endpoint_matches_csv(self, client, hiring_csv):
+        expected = _upload(client, "/audit/csv", hiring_csv, **self.PARAMS).json()
+        resp = client.post("/audit/columnar", json={"columns": self.COLUMNS, **self.PARAMS}, headers=HEADERS)
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_ragged_columns_rejected(self, client):
+        columns = {"race": ["White", "Black"], "hired": ["yes"]}
+        body = {"columns": columns, **self.PARAMS}
+        assert client.post("/audit", json=body, headers=HEADERS).status_code == 422
+        assert client.post("/audit/columnar", json=body, headers=HEADERS).status_code == 400
+
+    def test_raw_columnar_missing_param(self, client):
+        body = {"columns": self.COLUMNS, "race_col": "race", "outcome_col": "hired"}
+        assert client.post("/audit/columnar", json=body, headers=HEADERS).status_code == 422
+
+
+class TestColumnarUploads:
+    """Parquet and Arrow IPC uploads audit the same as the equivalent CSV."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    @pytest.fixture
+    def hiring_df(self, hiring_csv):
+        df = pd.read_csv(io.BytesIO(hiring_csv))
+        df["notes"] = "unused"  # extra column the audit should never read
+        return df
+
+    def test_parquet_upload(self, client, hiring_csv, hiring_df):
+        pytest.importorskip("pyarrow")
+        buf = io.BytesIO()
+        hiring_df.to_parquet(buf)
+        expected = _upload(client, "/audit/csv", hiring_csv, **self.FORM).json()
+        resp = client.post(
+            "/audit/csv",
+            files={"file": ("data.parquet", buf.getvalue(), "application/vnd.apache.parquet")},
+            data=self.FORM,
+            headers=HEADERS,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_arrow_stream_upload_streaming_endpoint(self, client, hiring_csv, hiring_df):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.Table.from_pandas(hiring_df)
+        buf = io.BytesIO()
+        with pa.ipc.new_stream(buf, table.schema) as writer:
+            writer.write_table(table, max_chunksize=3)
+        expected = _upload(client, "/audit/csv", hiring_csv, **self.FORM).json()
+        resp = client.post(
+            "/audit/csv/stream",
+            files={"file": ("data.arrows", buf.getvalue(), "application/vnd.apache.arrow.stream")},
+            data=self.FORM,
+            headers=HEADERS,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_parquet_missing_column(self, client, hiring_df):
+        pytest.importorskip("pyarrow")
+        buf = io.BytesIO()
+        hiring_df.to_parquet(buf)
+        resp = client.post(
+            "/audit/csv",
+            files={"file": ("data.parquet", buf.getvalue(), "application/octet-stream")},
+            data={**self.FORM, "race_col": "ethnicity"},
+            headers=HEADERS,
+        )
+        assert resp.status_code == 400
+        assert "ethnicity" in resp.json()["detail"]
+
+
+class TestProjectedUploads:
+    """CSV uploads parse only the audit columns; the size limit applies to them."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    @pytest.fixture
+    def wide_csv(self, hiring_csv):
+        df = pd.read_csv(io.BytesIO(hiring_csv))
+        for i in range(50):
+            df[f"unused_{i}"] = "x" * 200
+        return df.to_csv(index=False).encode()
+
+    def test_wide_file_limited_by_projected_size(self, client, hiring_csv, wide_csv, monkeypatch):
+        expected = _upload(client, "/audit/csv", hiring_csv, **self.FORM).json()
+        monkeypatch.setattr(api_main, "MAX_UPLOAD_BYTES", len(wide_csv) // 2)
+        resp = _upload(client, "/audit/csv", wide_csv, **self.FORM)
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_projected_columns_over_limit_rejected(self, client, hiring_csv, monkeypatch):
+        monkeypatch.setattr(api_main, "MAX_UPLOAD_BYTES", 10)
+        resp = _upload(client, "/audit/csv", hiring_csv, **self.FORM)
+        assert resp.status_code == 413
+
+
+class TestExecutors:
+    """Blocking work runs on bounded executors whose load is exposed at /metrics."""
+
+    def test_metrics_count_offloaded_work(self, client, hiring_csv):
+        before = client.get("/metrics", headers=HEADERS).json()["executors"]["io"]["completed"]
+        _upload(client, "/audit/csv", hiring_csv, race_col="race", outcome_col="hired", favorable_value="yes")
+        io_metrics = client.get("/metrics", headers=HEADERS).json()["executors"]["io"]
+        assert io_metrics["completed"] >= before + 2  # parse + report
+        assert io_metrics["queued"] == io_metrics["running"] == 0
+
+    def test_json_frames_built_on_io_pool(self, client, monkeypatch):
+        import threading
+
+        threads = []
+        build = api_main._request_frame
+
+        def recording(body):
+            threads.append(threading.current_thread().name)
+            return build(body)
+
+        monkeypatch.setattr(api_main, "_request_frame", recording)
+        body = {"data": [{"race": "White", "hired": "yes"}], "race_col": "race", "outcome_col": "hired",
+                "favorable_value": "yes"}
+        assert client.post("/audit", json=body, headers=HEADERS).status_code == 200
+        assert client.post("/reweight", json=body, headers=HEADERS).status_code == 200
+        assert client.post("/reweight", json=body, headers={**HEADERS, "Accept": "text/csv"}).status_code == 200
+        assert len(threads) == 3 and all(name.startswith("audit-io") for name in threads)
+
+    def test_bodies_decoded_and_coerced_on_io_pool(self, client, hiring_csv, monkeypatch):
+        import threading
+
+        threads = []
+        coerce, build = api_main._coerce_favorable, api_main._request_frame
+
+        def recording(fn):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread().name)
+                return fn(*args, **kwargs)
+            return wrapper
+
+        monkeypatch.setattr(api_main, "_coerce_favorable", recording(coerce))
+        monkeypatch.setattr(api_main, "_request_frame", recording(build))
+        columns = {"race": ["White", "Black"], "hired": ["yes", "no"]}
+        body = {"columns": columns, "race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        assert client.post("/audit/columnar", json=body, headers=HEADERS).status_code == 200
+
+        monitor = {"race_col": "race", "outcome_col": "hired", "time_col": "ts", "favorable_value": "yes"}
+        assert client.put("/monitor/io", json=monitor, headers=HEADERS).status_code == 200
+        events = {"columns": {**columns, "ts": [pd.Timestamp.now(tz="UTC").isoformat()] * 2}}
+        assert client.post("/monitor/io/events", json=events, headers=HEADERS).status_code == 200
+
+        form = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        config = json.dumps({"priority_groups": ["Black"], "fairness_target": "White", "fairness_threshold": 0.8})
+        assert _upload(client, "/audit/remediate", hiring_csv, **form).status_code == 200
+        assert _upload(client, "/audit/compliance", hiring_csv, config_json=config, **form).status_code == 200
+        batch = _upload(client, "/audit/compliance/batch", hiring_csv, configs_json=f"[{config}]", **form)
+        assert batch.status_code == 200
+        assert len(threads) >= 7 and all(name.startswith("audit-io") for name in threads)
+
+    def test_concurrency_is_bounded(self):
+        import asyncio
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from api.executors import BoundedExecutor
+
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def work():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        async def main():
+            executor = BoundedExecutor("test", ThreadPoolExecutor(max_workers=8), 8, max_concurrency=2)
+            await asyncio.gather(*(executor.run(work) for _ in range(6)))
+            executor.shutdown()
+            return executor.metrics()
+
+        metrics = asyncio.run(main())
+        assert peak[0] == 2
+        assert metrics["completed"] == 6
+        assert metrics["peak_queued"] == 4  # six submitted, two admitted at once
+
+
+class TestDebiasJobs:
+    """Background /jobs/debias runs reproduce /audit/debias and persist in SQLite."""
+
+    FORM = {"race_col": "race", "outcome_col": "y", "favorable_value": "1", "feature_cols": "x1,x2"}
+
+    @pytest.fixture
+    def debias_csv(self):
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        n = 400
+        df = pd.DataFrame({
+            "race": rng.choice(["White", "Black", "Latinx"], n),
+            "x1": rng.normal(size=n),
+            "x2": rng.normal(size=n),
+        })
+        df["y"] = (df["x1"] + (df["race"] == "White") * 0.5 + rng.normal(size=n) > 0).astype(int)
+        return df.to_csv(index=False).encode()
+
+    @pytest.fixture
+    def job_client(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AUDIT_CACHE_SIZE", "0")
+        monkeypatch.setenv("CPU_EXECUTOR", "thread")
+        monkeypatch.setattr(api_main, "JOBS_DIR", str(tmp_path))
+        with TestClient(api_main.app) as c:
+            yield c
+
+    def test_job_result_matches_sync_endpoint(self, job_client, debias_csv):
+        import time
+
+        expected = _upload(job_client, "/audit/debias", debias_csv, **self.FORM).json()
+        resp = _upload(job_client, "/jobs/debias", debias_csv, **self.FORM)
+        assert resp.status_code == 202
+        status_url = resp.json()["status_url"]
+        for _ in range(200):
+            job = job_client.get(status_url, headers=HEADERS).json()
+            if job["status"] not in ("queued", "running"):
+                break
+            time.sleep(0.05)
+        assert job["status"] == "succeeded"
+        assert job["progress"] == 1.0
+        # The mitigated model's predictions are randomized; the rest is deterministic.
+        for key in ("status", "constraint", "dataset_summary", "baseline"):
+            assert job["result"][key] == expected[key]
+
+    def test_unknown_job_is_404(self, job_client):
+        assert job_client.get("/jobs/nope", headers=HEADERS).status_code == 404
+
+    def test_store_enforces_per_key_limit(self, tmp_path):
+        from api.jobs import JobLimitError, JobStore
+
+        store = JobStore(tmp_path)
+        frame = pd.DataFrame({"a": [1]})
+        store.create("debias", "owner", {}, frame, max_active=1)
+        store.create("debias", "someone-else", {}, frame, max_active=1)
+        with pytest.raises(JobLimitError):
+            store.check_limit("owner", max_active=1)
+
+        def unpicklable(path):
+            raise AssertionError("input persisted past the job limit")
+
+        frame.to_pickle = unpicklable
+        with pytest.raises(JobLimitError):
+            store.create("debias", "owner", {}, frame, max_active=1)
+        assert len(list(store.inputs_dir.iterdir())) == 2
+
+    def test_cancelled_job_never_runs(self, tmp_path):
+        from api.jobs import CANCELLED, JobStore, run_debias_job
+
+        store = JobStore(tmp_path)
+        job_id = store.create("debias", "owner", {}, pd.DataFrame({"a": [1]}), max_active=1)
+        assert store.cancel(job_id, "owner")["status"] == CANCELLED
+        assert run_debias_job(str(tmp_path), job_id, 0, "boot") == CANCELLED
+        assert store.get(job_id)["status"] == CANCELLED
+
+    def test_interrupted_job_is_requeued(self, tmp_path):
+        import os
+
+        from api.jobs import QUEUED, RUNNING, JobStore
+
+        store = JobStore(tmp_path, boot_id="first-boot")
+        job_id = store.create("debias", "owner", {}, pd.DataFrame({"a": [1]}), max_active=1)
+        # The restarted server may well have the same pid (pid 1 in a container).
+        store.claim(job_id, runner_pid=os.getpid(), runner_boot="first-boot")
+        assert store.recover() == 0
+        assert store.get(job_id)["status"] == RUNNING
+        assert JobStore(tmp_path, boot_id="second-boot").recover() == 1
+        assert store.get(job_id)["status"] == QUEUED
+
+
+class TestAuditCache:
+    """Repeat audits of the same bytes and parameters are served from the result cache."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    @pytest.fixture
+    def cache_client(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AUDIT_CACHE_SIZE", "16")
+        monkeypatch.setenv("AUDIT_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("CPU_EXECUTOR", "thread")
+        with TestClient(api_main.app) as c:
+            yield c
+
+    def test_repeat_upload_hits(self, cache_client, hiring_csv):
+        first = _upload(cache_client, "/audit/csv", hiring_csv, **self.FORM)
+        second = _upload(cache_client, "/audit/csv/stream", hiring_csv, **self.FORM)
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        metrics = cache_client.get("/metrics", headers=HEADERS).json()["audit_cache"]
+        assert metrics["hits"] == 1 and metrics["misses"] == 1
+
+    def test_parameters_are_part_of_the_key(self, cache_client, hiring_csv):
+        _upload(cache_client, "/audit/csv", hiring_csv, **self.FORM)
+        resp = _upload(cache_client, "/audit/csv", hiring_csv, **{**self.FORM, "favorable_value": "no"})
+        assert resp.headers["X-Cache"] == "MISS"
+
+    def test_pdf_and_compliance_hit(self, cache_client, hiring_csv):
+        pytest.importorskip("reportlab")
+        config = json.dumps({"priority_groups": ["Black"], "fairness_target": "White", "fairness_threshold": 0.8})
+        for expected in ("MISS", "HIT"):
+            pdf = _upload(cache_client, "/audit/pdf", hiring_csv, **self.FORM)
+            assert pdf.headers["X-Cache"] == expected
+            compliance = _upload(cache_client, "/audit/compliance", hiring_csv, config_json=config, **self.FORM)
+            assert compliance.headers["X-Cache"] == expected
+
+    def test_json_body_hits(self, cache_client):
+        body = {"columns": {"race": ["White", "Black"], "hired": ["yes", "no"]}, **self.FORM}
+        for endpoint in ("/audit", "/audit/columnar"):
+            statuses = [cache_client.post(endpoint, json=body, headers=HEADERS).headers["X-Cache"] for _ in range(2)]
+            assert statuses == ["MISS", "HIT"]
+
+    def test_disabled_cache_skips_hashing(self, client, monkeypatch):
+        monkeypatch.setattr(api_main, "_sha256_hex", lambda data: pytest.fail("body hashed with the cache off"))
+        resp = client.post("/audit", json={"data": [{"race": "White", "hired": "yes"}], **self.FORM}, headers=HEADERS)
+        assert resp.status_code == 200
+
+    def test_lru_and_ttl_eviction(self):
+        from api.cache import ResultCache
+
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")
+        cache.put("c", {"n": 3})  # evicts "b", the least recently used
+        assert cache.get("b") is None and cache.get("a") == {"n": 1}
+
+        expired = ResultCache(max_entries=2, ttl_seconds=-1)
+        expired.put("a", {"n": 1})
+        assert expired.get("a") is None
+
+    def test_disk_backend_survives_restart(self, tmp_path):
+        from api.cache import ResultCache
+
+        ResultCache(directory=tmp_path).put("report", {"n": 1})
+        ResultCache(directory=tmp_path).put("pdf", b"%PDF")
+        reopened = ResultCache(directory=tmp_path)
+        assert reopened.get("report") == {"n": 1}
+        assert reopened.get("pdf") == b"%PDF"
+        assert reopened.metrics()["disk_hits"] == 2
+
+
+class TestRollingMonitor:
+    """/monitor windows report the same metrics as auditing the window's rows directly."""
+
+    CONFIG = {
+        "race_col": "race", "outcome_col": "hired", "time_col": "ts",
+        "favorable_value": "yes", "bucket": "1D", "retention": 30,
+    }
+
+    @pytest.fixture
+    def events(self):
+        days = pd.date_range("2026-03-01", periods=20, freq="D")
+        rows = []
+        for i, day in enumerate(days):
+            rows += [
+                {"race": "White", "hired": "yes", "ts": day.isoformat()},
+                {"race": "Black", "hired": "yes" if i % 2 else "no", "ts": (day + pd.Timedelta(hours=5)).isoformat()},
+            ]
+        return pd.DataFrame(rows)
+
+    @pytest.fixture(autouse=True)
+    def _reset_monitors(self):
+        api_main.monitors.clear()
+        yield
+        api_main.monitors.clear()
+
+    def test_window_matches_direct_audit(self, client, events):
+        assert client.put("/monitor/loans", json=self.CONFIG, headers=HEADERS).status_code == 200
+        for start in range(0, len(events), 15):
+            batch = events.iloc[start:start + 15]
+            resp = client.post("/monitor/loans/events", json={"data": batch.to_dict(orient="records")}, headers=HEADERS)
+            assert resp.status_code == 200
+            assert resp.json()["ingested"] == len(batch)
+
+        body = client.get("/monitor/loans", params={"window": ["7D", "30D"]}, headers=HEADERS).json()
+        assert body["latest_bucket"].startswith("2026-03-20")
+        last_week = events[pd.to_datetime(events["ts"]) >= "2026-03-14"]
+        expected = client.post("/audit", json={
+            "data": last_week[["race", "hired"]].to_dict(orient="records"),
+            "race_col": "race", "outcome_col": "hired", "favorable_value": "yes",
+        }, headers=HEADERS).json()
+        week = body["windows"]["7D"]
+        assert week["metrics"] == expected["metrics"]
+        assert week["summary"]["flagged_groups"] == expected["summary"]["flagged_groups"]
+        assert week["window"] == {
+            "start": "2026-03-14T00:00:00+00:00", "end": "2026-03-21T00:00:00+00:00", "buckets": 7,
+        }
+        assert body["windows"]["30D"]["summary"]["total_records"] == len(events)
+
+    def test_late_events_dropped_and_long_window_rejected(self, client, events):
+        client.put("/monitor/loans", json=self.CONFIG, headers=HEADERS)
+        client.post("/monitor/loans/events", json={"data": events.to_dict(orient="records")}, headers=HEADERS)
+        late = {"columns": {"race": ["White"], "hired": ["no"], "ts": ["2025-01-01T00:00:00"]}}
+        resp = client.post("/monitor/loans/events", json=late, headers=HEADERS).json()
+        assert resp["ingested"] == 0 and resp["late_events"] == 1
+        assert client.get("/monitor/loans", params={"window": "90D"}, headers=HEADERS).status_code == 400
+
+    def test_future_events_rejected(self, client, events):
+        client.put("/monitor/loans", json=self.CONFIG, headers=HEADERS)
+        client.post("/monitor/loans/events", json={"data": events.to_dict(orient="records")}, headers=HEADERS)
+        future = {"columns": {"race": ["White"], "hired": ["no"], "ts": ["2099-01-01T00:00:00"]}}
+        resp = client.post("/monitor/loans/events", json=future, headers=HEADERS).json()
+        assert resp["ingested"] == 0 and resp["future_events"] == 1
+        body = client.get("/monitor/loans", params={"window": "30D"}, headers=HEADERS).json()
+        assert body["latest_bucket"].startswith("2026-03-20")
+        assert body["windows"]["30D"]["summary"]["total_records"] == len(events)
+
+    def test_too_many_groups_rejected(self, client):
+        client.put("/monitor/loans", json={**self.CONFIG, "max_groups": 5}, headers=HEADERS)
+        ids = {"columns": {"race": [f"id-{i}" for i in range(6)], "hired": ["yes"] * 6,
+                           "ts": ["2026-03-01T00:00:00"] * 6}}
+        resp = client.post("/monitor/loans/events", json=ids, headers=HEADERS)
+        assert resp.status_code == 400
+        assert "at most 5" in resp.json()["detail"]
+
+    def test_monitors_are_scoped_to_api_key(self, client):
+        client.put("/monitor/loans", json=self.CONFIG, headers=HEADERS)
+        assert client.get("/monitor/loans", headers=HEADERS).status_code == 200
+        assert client.get("/monitor/other", headers=HEADERS).status_code == 404
+        assert client.delete("/monitor/loans", headers=HEADERS).status_code == 200
+        assert client.get("/monitor/loans", headers=HEADERS).status_code == 404
+
+
+class TestIntersectionalAudit:
+    """/audit/intersectional audits race x sex cells and suppresses small ones."""
+
+    def test_cells_and_suppression(self, client):
+        df = pd.DataFrame({
+            "race": ["White"] * 6 + ["Black"] * 6,
+            "sex": ["F", "M"] * 5 + ["F", "F"],
+            "hired": ["yes", "yes", "no", "yes", "yes", "yes", "no", "yes", "no", "no", "yes", "no"],
+            "notes": ["x"] * 12,
+        })
+        resp = _upload(
+            client, "/audit/intersectional", df.to_csv(index=False).encode(),
+            group_cols="race, sex", outcome_col="hired", favorable_value="yes",
+            min_cell_size=3, privileged_group="White × M",
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["summary"]["groups_analyzed"] == ["Black × F", "White × F", "White × M"]
+        assert body["metrics"]["disparate_impact"]["White × M"] == 1.0
+        assert body["intersections"]["cells_suppressed"] == 1
+        assert body["intersections"]["records_suppressed"] == 2
+
+    def test_empty_group_cols_rejected(self, client, hiring_csv):
+        resp = _upload(client, "/audit/intersectional", hiring_csv,
+                       group_cols=" , ", outcome_col="hired", favorable_value="yes")
+        assert resp.status_code == 400
+
+
+class TestBootstrapEndpoint:
+    """/audit/bootstrap returns intervals from an upload or pre-aggregated counts."""
+
+    def test_upload_and_counts_agree(self, client, hiring_csv):
+        form = {"race_col": "race", "outcome_col": "hired", "n_replicates": "2000", "seed": "5"}
+        upload = _upload(client, "/audit/bootstrap", hiring_csv, favorable_value="yes", **form).json()
+        # Same group order as the upload's sorted groups, so the seeded draws line up.
+        counts = {"Black": {"favorable": 1, "total": 3}, "Latinx": {"favorable": 1, "total": 3},
+                  "White": {"favorable": 3, "total": 4}}
+        aggregated = client.post(
+            "/audit/bootstrap", data={"counts_json": json.dumps(counts), **form}, headers=HEADERS
+        ).json()
+        assert upload["total_records"] == aggregated["total_records"] == 10
+        assert upload["disparate_impact"] == aggregated["disparate_impact"]
+        assert upload["disparate_impact"]["Black"]["estimate"] == 0.4444
+
+    def test_rows_method_requires_file(self, client):
+        counts = json.dumps({"White": {"favorable": 3, "total": 4}})
+        resp = client.post(
+            "/audit/bootstrap",
+            data={"counts_json": counts, "race_col": "race", "outcome_col": "hired", "method": "rows"},
+            headers=HEADERS,
+        )
+        assert resp.status_code == 400
+
+
+class TestThresholdSweepEndpoint:
+    """/audit/threshold-sweep reports exact flip thresholds and the flagged-count curve."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "theta_min": "0.4", "theta_max": "0.6", "steps": "5"}
+
+    def test_curve_and_flip_thresholds(self, client, hiring_csv):
+        resp = _upload(client, "/audit/threshold-sweep", hiring_csv, favorable_value="yes", **self.FORM)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["reference_group"] == "White"
+        assert body["sweep"] == {"thresholds": [0.4, 0.45, 0.5, 0.55, 0.6], "flagged_counts": [0, 2, 2, 2, 2]}
+        assert body["groups"]["Black"]["flip_threshold"] == 0.4444
+        assert body["groups"]["White"]["flip_threshold"] is None
+        assert body["flagged_at_fairness_threshold"] == ["Black", "Latinx"]
+
+    def test_counts_json_matches_upload(self, client, hiring_csv):
+        upload = _upload(client, "/audit/threshold-sweep", hiring_csv, favorable_value="yes", **self.FORM).json()
+        counts = {"White": {"favorable": 3, "total": 4}, "Black": {"favorable": 1, "total": 3},
+                  "Latinx": {"favorable": 1, "total": 3}}
+        aggregated = client.post(
+            "/audit/threshold-sweep", data={"counts_json": json.dumps(counts), **self.FORM}, headers=HEADERS
+        ).json()
+        assert aggregated == upload
+
+    def test_flags_match_audit_near_threshold(self, client):
+        # Rounded rates (0.5, 0.4) would put Black's DI at exactly 0.8; unrounded it is 0.7999.
+        counts = {"White": {"favorable": 50004, "total": 100000}, "Black": {"favorable": 39998, "total": 100000}}
+        audit = client.post(
+            "/audit", json={"counts": counts, "race_col": "race", "outcome_col": "hired"}, headers=HEADERS
+        ).json()
+        sweep = client.post(
+            "/audit/threshold-sweep", data={"counts_json": json.dumps(counts), **self.FORM}, headers=HEADERS
+        ).json()
+        assert audit["summary"]["flagged_groups"] == ["Black"]
+        assert sweep["flagged_at_fairness_threshold"] == audit["summary"]["flagged_groups"]
+        assert sweep["groups"]["Black"]["flip_threshold"] == audit["metrics"]["disparate_impact"]["Black"] == 0.7999
+
+    def test_empty_range_rejected(self, client, hiring_csv):
+        form = {**self.FORM, "theta_min": "0.9", "theta_max": "0.8"}
+        resp = _upload(client, "/audit/threshold-sweep", hiring_csv, favorable_value="yes", **form)
+        assert resp.status_code == 400
+
+
+class TestComplianceBatch:
+    """/audit/compliance/batch checks one upload against many configs in one pass."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired"}
+
+    @staticmethod
+    def _config(threshold, target="White", **extra):
+        return {"priority_groups": ["Black"], "fairness_target": target, "fairness_threshold": threshold, **extra}
+
+    def test_verdicts_match_single_compliance(self, client, hiring_csv):
+        configs = [self._config(0.4), self._config(0.5), self._config(0.9, target="Black")]
+        resp = _upload(client, "/audit/compliance/batch", hiring_csv, favorable_value="yes",
+                       configs_json=json.dumps(configs), **self.FORM)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["matrix"]["configs"] == ["inline-0", "inline-1", "inline-2"]
+        for config, row in zip(configs, body["configs"]):
+            single = _upload(client, "/audit/compliance", hiring_csv, favorable_value="yes",
+                             config_json=json.dumps(config), **self.FORM).json()
+            assert row["verdict"] == single["verdict"]
+            assert row["flagged_groups"] == single["summary"]["flagged_groups"]
+            assert row["fairness_target"] == single["summary"]["reference_group"]
+        assert body["summary"]["configs_passed"] == 2
+        assert body["matrix"]["flagged"][1] == [True, True, False]  # Black, Latinx, White
+
+    def test_registry_ids_with_counts(self, client):
+        counts = {"White": {"favorable": 42, "total": 100}, "Black or African American": {"favorable": 34, "total": 100}}
+        resp = client.post(
+            "/audit/compliance/batch",
+            data={"counts_json": json.dumps(counts), "config_ids": "proxy-survey-mi-lending-2026-001", **self.FORM},
+            headers=HEADERS,
+        )
+        assert resp.status_code == 200
+        (row,) = resp.json()["configs"]
+        assert row["source"] == "registry" and row["jurisdiction"] == "Michigan"
+        assert row["priority_groups_flagged"] == ["Black or African American"]
+
+    def test_unknown_id_and_missing_configs_rejected(self, client, hiring_csv):
+        resp = _upload(client, "/audit/compliance/batch", hiring_csv, favorable_value="yes",
+                       config_ids="no-such-config", **self.FORM)
+        assert resp.status_code == 400 and "no-such-config" in resp.json()["detail"]
+        resp = _upload(client, "/audit/compliance/batch", hiring_csv, favorable_value="yes", **self.FORM)
+        assert resp.status_code == 400
+
+
+class TestRegistryEndpoints:
+    """/registry serves published configs that compliance checks can reference by id."""
+
+    RECORD_ID = "proxy-survey-mi-lending-2026-001"
+
+    def test_list_and_get(self, client):
+        listing = client.get("/registry", params={"jurisdiction": "michigan"}, headers=HEADERS).json()
+        assert self.RECORD_ID in [c["record_id"] for c in listing["configs"]]
+        entry = client.get(f"/registry/{self.RECORD_ID}", headers=HEADERS).json()
+        assert entry["domain"] == "lending" and entry["config"]["fairness_threshold"] == 0.88
+        assert client.get("/registry/no-such-config", headers=HEADERS).status_code == 404
+
+    def test_compliance_by_config_id(self, client, hiring_csv):
+        config = client.get(f"/registry/{self.RECORD_ID}", headers=HEADERS).json()["config"]
+        form = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        by_id = _upload(client, "/audit/compliance", hiring_csv, config_id=self.RECORD_ID, **form).json()
+        inline = _upload(client, "/audit/compliance", hiring_csv, config_json=json.dumps(config), **form).json()
+        assert by_id == inline
+        both = _upload(client, "/audit/compliance", hiring_csv, config_id=self.RECORD_ID,
+                       config_json=json.dumps(config), **form)
+        assert both.status_code == 400
+
+    def test_batch_by_jurisdiction(self, client, hiring_csv):
+        resp = _upload(client, "/audit/compliance/batch", hiring_csv, favorable_value="yes",
+                       race_col="race", outcome_col="hired", jurisdiction="Michigan")
+        assert resp.status_code == 200
+        assert self.RECORD_ID in resp.json()["matrix"]["configs"]
+
+
+class TestReweightExport:
+    """/reweight* streams CSV, NDJSON or Parquet when asked via Accept."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    def _export(self, client, contents, accept, **form):
+        return client.post(
+            "/reweight/csv",
+            files={"file": ("data.csv", contents, "text/csv")},
+            data={**self.FORM, **form},
+            headers={**HEADERS, "Accept": accept},
+        )
+
+    def _expected_weights(self, client, contents):
+        report = _upload(client, "/reweight/csv", contents, **self.FORM).json()
+        return [row["sample_weight"] for row in report["reweighted_data"]]
+
+    @pytest.mark.parametrize("accept", ["text/csv", "application/x-ndjson", "application/vnd.apache.parquet"])
+    def test_streamed_weights_match_json_report(self, client, hiring_csv, monkeypatch, accept):
+        expected = self._expected_weights(client, hiring_csv)
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 3)
+        resp = self._export(client, hiring_csv, accept)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith(accept)
+        assert resp.headers["x-records"] == "10"
+        if accept == "text/csv":
+            df = pd.read_csv(io.BytesIO(resp.content))
+        elif accept == "application/x-ndjson":
+            df = pd.read_json(io.BytesIO(resp.content), lines=True)
+        else:
+            df = pd.read_parquet(io.BytesIO(resp.content))
+        assert list(df.columns) == ["race", "hired", "sample_weight"]
+        assert df["sample_weight"].tolist() == expected
+
+    def test_column_type_change_between_chunks(self, client, monkeypatch):
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 4)
+        # hired and zip parse as int64 in the first chunk, then float64 and str.
+        contents = (
+            "race,hired,zip\n"
+            + "White,1,48201\nBlack,0,48201\nWhite,1,48201\nBlack,1,48201\n"
+            + "White,0.0,48201-1\nBlack,1.0,48201-1\nWhite,1.0,48201-1\nBlack,0.0,48201-1\n"
+        ).encode()
+        report = _upload(client, "/reweight/csv", contents, **{**self.FORM, "favorable_value": "1"}).json()
+        resp = self._export(client, contents, "application/vnd.apache.parquet", favorable_value="1")
+        assert resp.status_code == 200
+        out = pd.read_parquet(io.BytesIO(resp.content))
+        assert out["zip"].tolist() == ["48201"] * 4 + ["48201-1"] * 4
+        assert out["sample_weight"].tolist() == [row["sample_weight"] for row in report["reweighted_data"]]
+
+    @pytest.mark.parametrize("accept", ["application/x-ndjson", "application/vnd.apache.parquet"])
+    def test_numeric_columns_keep_their_type(self, client, monkeypatch, accept):
+        if accept.endswith("parquet"):
+            pytest.importorskip("pyarrow")
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 3)
+        # age is int64 in every chunk; score is int64 in the first chunk, then float64.
+        contents = (
+            "race,hired,age,score,zip\n"
+            + "White,yes,63,1,12160\nBlack,no,41,2,12160\nWhite,yes,29,3,12160\n"
+            + "Black,yes,55,2.5,12160\nWhite,no,38,1.5,12160\nBlack,no,47,0.5,12160-1\n"
+        ).encode()
+        report = _upload(client, "/reweight/csv", contents, **self.FORM).json()
+        resp = self._export(client, contents, accept)
+        assert resp.status_code == 200
+        if accept == "application/x-ndjson":
+            first = json.loads(resp.text.splitlines()[0])
+            assert first["age"] == 63 and first["score"] == 1.0 and first["zip"] == "12160"
+            assert first["age"] == report["reweighted_data"][0]["age"]
+        else:
+            out = pd.read_parquet(io.BytesIO(resp.content))
+            assert out["age"].dtype == "int64" and out["score"].dtype == "float64"
+            assert out["age"].tolist() == [row["age"] for row in report["reweighted_data"]]
+
+    def test_group_labels_parsed_as_while_counting(self, client, monkeypatch):
+        # Integer group codes from Parquet: the export must see the labels the counts were keyed by.
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 4)
+        monkeypatch.setattr(api_main, "community_defs", {"fairness_target": 1, "priority_groups": [2]})
+        buf = io.BytesIO()
+        pd.DataFrame({"race": [1, 1, 1, 2, 2, 2], "hired": ["yes", "no", "yes", "no", "no", "yes"]}).to_parquet(buf)
+        contents = buf.getvalue()
+        files = {"file": ("data.parquet", contents, "application/vnd.apache.parquet")}
+        report = client.post("/reweight/csv", files=files, data=self.FORM, headers=HEADERS).json()
+        resp = client.post("/reweight/csv", files=files, data=self.FORM, headers={**HEADERS, "Accept": "text/csv"})
+        assert resp.status_code == 200
+        weights = pd.read_csv(io.BytesIO(resp.content))["sample_weight"].tolist()
+        assert weights == [row["sample_weight"] for row in report["reweighted_data"]]
+        assert weights[3:] == [0.5, 0.5, 2.0]
+
+    def test_weights_only(self, client, hiring_csv, monkeypatch):
+        expected = self._expected_weights(client, hiring_csv)
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 4)
+        resp = self._export(client, hiring_csv, "text/csv", weights_only="true")
+        df = pd.read_csv(io.BytesIO(resp.content))
+        assert list(df.columns) == ["row", "sample_weight"]
+        assert df["row"].tolist() == list(range(10))
+        assert df["sample_weight"].tolist() == expected
+
+        report = _upload(client, "/reweight/csv", hiring_csv, weights_only="true", **self.FORM).json()
+        assert report["reweighted_data"][1] == {"row": 1, "sample_weight": expected[1]}
+
+    def test_json_body_export(self, client, hiring_csv):
+        expected = self._expected_weights(client, hiring_csv)
+        rows = pd.read_csv(io.BytesIO(hiring_csv)).to_dict(orient="records")
+        resp = client.post(
+            "/reweight",
+            json={"data": rows, **self.FORM, "weights_only": True},
+            headers={**HEADERS, "Accept": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["sample_weight"] for line in lines] == expected
+
+    def test_default_accept_keeps_json_report(self, client, hiring_csv):
+        resp = self._export(client, hiring_csv, "*/*")
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json()["records"] == 10
+
+    def test_unsupported_accept_rejected(self, client, hiring_csv):
+        resp = self._export(client, hiring_csv, "application/xml")
+        assert resp.status_code == 406
+
+    def test_missing_target_group_rejected_before_streaming(self, client):
+        contents = b"race,hired\nBlack,yes\nLatinx,no\n"
+        resp = self._export(client, contents, "text/csv")
+        assert resp.status_code == 400
+
+
+class TestUploadLimits:
+    """Request bodies are capped as they arrive; spooled uploads are parsed through mmap."""
+
+    @staticmethod
+    def _call(middleware, chunks, content_length=None):
+        import asyncio
+
+        headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+        scope = {"type": "http", "method": "POST", "path": "/upload", "headers": headers}
+        messages = [
+            {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+            for i, chunk in enumerate(chunks)
+        ]
+        pulled, sent = [], []
+
+        async def receive():
+            pulled.append(messages[len(pulled)])
+            return pulled[-1]
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(middleware(scope, receive, send))
+        return len(pulled), sent
+
+    @staticmethod
+    def _middleware(limit):
+        from api.uploads import BodySizeLimitMiddleware
+
+        async def app(scope, receive, send):
+            while (await receive()).get("more_body"):
+                pass
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        return BodySizeLimitMiddleware(app, limit_for=lambda scope: limit)
+
+    def test_rejects_once_limit_crossed(self):
+        pulled, sent = self._call(self._middleware(10), [b"x" * 6] * 5)
+        assert pulled == 2  # stops reading at the chunk that crossed the limit
+        assert sent[0]["status"] == 413
+
+    def test_rejects_declared_length_without_reading(self):
+        pulled, sent = self._call(self._middleware(10), [b"x" * 20], content_length=20)
+        assert pulled == 0
+        assert sent[0]["status"] == 413
+
+    def test_within_limit_passes(self):
+        _, sent = self._call(self._middleware(100), [b"x" * 6] * 5)
+        assert sent[0]["status"] == 200
+
+    def test_reweight_json_report_capped_stream_not(self, client, hiring_csv, monkeypatch):
+        monkeypatch.setattr(api_main, "MAX_UPLOAD_BYTES", 64)
+        monkeypatch.setattr(api_main, "MULTIPART_OVERHEAD_BYTES", 0)
+        form = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+        assert _upload(client, "/reweight/csv", hiring_csv, **form).status_code == 413
+        resp = client.post(
+            "/reweight/csv",
+            files={"file": ("data.csv", hiring_csv, "text/csv")},
+            data=form,
+            headers={**HEADERS, "Accept": "text/csv"},
+        )
+        assert resp.status_code == 200
+
+    def test_mapped_upload(self):
+        import mmap
+        import tempfile
+
+        from api.uploads import mapped_upload
+
+        small = tempfile.SpooledTemporaryFile(max_size=1024)
+        small.write(b"race,hired\nWhite,yes\n")
+        with mapped_upload(small) as source:
+            assert source is small and source.tell() == 0
+
+        large = tempfile.SpooledTemporaryFile(max_size=1024)
+        large.write(b"race,hired\n" + b"White,yes\n" * 200)
+        with mapped_upload(large) as source:
+            assert isinstance(source, mmap.mmap)
+            assert len(pd.read_csv(source)) == 200
+        assert source.closed
+
+
+class TestCompression:
+    """gzip/zstd uploads are decompressed while parsed; responses follow Accept-Encoding."""
+
+    FORM = {"race_col": "race", "outcome_col": "hired", "favorable_value": "yes"}
+
+    @staticmethod
+    def _compress(contents, compression):
+        import gzip
+
+        if compression == "gzip":
+            return gzip.compress(contents), "data.csv.gz", "application/gzip"
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdCompressor().compress(contents), "data.csv.zst", "application/zstd"
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    @pytest.mark.parametrize("path", ["/audit/csv", "/audit/csv/stream", "/reweight/csv"])
+    def test_compressed_upload_matches_plain(self, client, hiring_csv, compression, path):
+        expected = _upload(client, path, hiring_csv, **self.FORM).json()
+        data, filename, content_type = self._compress(hiring_csv, compression)
+        resp = client.post(
+            path, files={"file": (filename, data, content_type)}, data=self.FORM, headers=HEADERS,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == expected
+
+    def test_compressed_parquet_rejected(self, client, hiring_csv):
+        resp = client.post(
+            "/audit/csv",
+            files={"file": ("data.parquet.gz", b"not parquet", "application/gzip")},
+            data=self.FORM,
+            headers=HEADERS,
+        )
+        assert resp.status_code == 415
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_response_compressed_per_accept_encoding(self, client, hiring_csv, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+        contents = hiring_csv + hiring_csv.split(b"\n", 1)[1] * 9  # large enough to compress
+        resp = client.post(
+            "/reweight/csv",
+            files={"file": ("data.csv", contents, "text/csv")},
+            data=self.FORM,
+            headers={**HEADERS, "Accept-Encoding": encoding},
+        )
+        assert resp.headers["content-encoding"] == encoding
+        assert resp.json()["records"] == 100  # decoded transparently by the client
+
+    def test_streamed_export_compressed(self, client, hiring_csv, monkeypatch):
+        monkeypatch.setattr(api_main, "STREAM_CHUNK_ROWS", 3)
+        resp = client.post(
+            "/reweight/csv",
+            files={"file": ("data.csv", hiring_csv, "text/csv")},
+            data=self.FORM,
+            headers={**HEADERS, "Accept": "text/csv", "Accept-Encoding": "gzip"},
+        )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert len(pd.read_csv(io.BytesIO(resp.content))) == 10
+
+    def test_identity_when_not_accepted(self, client, hiring_csv):
+        resp = _upload(client, "/reweight/csv", hiring_csv, **self.FORM)
+        plain = client.post(
+            "/reweight/csv",
+            files={"file": ("data.csv", hiring_csv, "text/csv")},
+            data=self.FORM,
+            headers={**HEADERS, "Accept-Encoding": "identity"},
+        )
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == resp.json()
+
+    def test_small_and_excluded_responses_sent_as_is(self):
+        from starlette.applications import Starlette
+        from starlette.responses import Response, StreamingResponse
+        from starlette.routing import Route
+
+        from api.compression import CompressionMiddleware
+
+        text = b"race,hired\n" * 500
+        app = Starlette(routes=[
+            Route("/small", lambda r: Response(b"tiny", media_type="text/plain")),
+            Route("/pdf", lambda r: Response(text, media_type="application/pdf")),
+            Route("/csv", lambda r: StreamingResponse(iter([text, text]), media_type="text/csv")),
+        ])
+        app.add_middleware(CompressionMiddleware, minimum_size=1000)
+        client = TestClient(app)
+        headers = {"Accept-Encoding": "gzip"}
+        assert "content-encoding" not in client.get("/small", headers=headers).headers
+        assert "content-encoding" not in client.get("/pdf", headers=headers).headers
+        raw = client.get("/csv", headers=headers)
+        assert raw.headers["content-encoding"] == "gzip" and raw.headers["vary"] == "Accept-Encoding"
+        assert raw.content == text * 2  # decoded by the client
+
+    def test_accepted_encodings(self):
+        from api.compression import accepted_encodings
+
+        assert accepted_encodings("gzip;q=0.5, zstd;q=0, br") == {"gzip", "br"}
+        assert accepted_encodings(None) == set()
+
+
+class TestAuth:
+    """Pure ASGI key check against hashed, hot-reloaded key stores."""
+
+    @staticmethod
+    def _app(store):
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse as StarletteJSON
+        from starlette.routing import Route
+
+        from api.auth import APIKeyMiddleware
+
+        async def whoami(request):
+            key = request.state.api_key
+            return StarletteJSON({"name": key.name, "metadata": key.metadata})
+
+        app = Starlette(routes=[Route("/whoami", whoami), Route("/health", lambda r: StarletteJSON({}))])
+        app.add_middleware(APIKeyMiddleware, store=store)
+        return TestClient(app)
+
+    def test_missing_or_invalid_key_rejected(self, client):
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"X-API-Key": "wrong"}).status_code == 401
+        assert client.get("/metrics", headers=HEADERS).status_code == 200
+        assert client.get("/health").status_code == 200
+
+    def test_env_store_keeps_only_hashes(self):
+        from api.auth import EnvKeyStore, hash_key
+
+        store = EnvKeyStore("alpha, beta")
+        assert store.lookup("beta").key_hash == hash_key("beta")
+        assert store.lookup("gamma") is None
+        assert all("alpha" not in r.key_hash for r in store.records())
+
+    @pytest.mark.parametrize("filename", ["keys.json", "keys.sqlite3"])
+    def test_store_hot_reload(self, tmp_path, filename):
+        from api.auth import open_key_store
+
+        store = open_key_store(tmp_path / filename)
+        store.reload_interval = 0
+        client = self._app(store)
+        assert client.get("/whoami", headers={"X-API-Key": "k1"}).status_code == 401
+
+        # Issued by another process (a second store on the same file), then revoked.
+        writer = open_key_store(tmp_path / filename)
+        api_key, record = writer.add(name="ci", metadata={"team": "lending"})
+        resp = client.get("/whoami", headers={"X-API-Key": api_key})
+        assert resp.status_code == 200
+        assert resp.json() == {"name": "ci", "metadata": {"team": "lending"}}
+        assert writer.revoke(record.key_id)
+        assert client.get("/whoami", headers={"X-API-Key": api_key}).status_code == 401
+        assert client.get("/health").status_code == 200
+
+    def test_expired_key_rejected(self, tmp_path):
+        from api.auth import SQLiteKeyStore
+
+        store = SQLiteKeyStore(tmp_path / "keys.sqlite3")
+        expired, _ = store.add(expires_at="2000-01-01T00:00:00+00:00")
+        current, _ = store.add(expires_at="2999-01-01T00:00:00+00:00")
+        assert store.lookup(expired) is None
+        assert store.lookup(current) is not None
+        with pytest.raises(ValueError):
+            store.add(api_key=current)
+
+    def test_expiry_normalized_to_utc(self, tmp_path):
+        from datetime import datetime, timezone
+
+        from api.auth import FileKeyStore
+
+        store = FileKeyStore(tmp_path / "keys.json")
+        _, record = store.add(expires_at="2027-01-01T00:00:00-05:00")
+        assert record.expires_at == "2027-01-01T05:00:00+00:00"
+        assert record.active(datetime(2027, 1, 1, 4, 59, tzinfo=timezone.utc))
+        assert not record.active(datetime(2027, 1, 1, 5, 0, tzinfo=timezone.utc))
+
+        # A bare date is valid through the end of that day, UTC.
+        _, record = store.add(expires_at="2027-01-01")
+        assert record.active(datetime(2027, 1, 1, 23, 59, tzinfo=timezone.utc))
+        assert not record.active(datetime(2027, 1, 2, tzinfo=timezone.utc))
+
+        with pytest.raises(ValueError, match="ISO 8601"):
+            store.add(expires_at="next tuesday")
+
+    def test_unreadable_file_keeps_previous_keys(self, tmp_path):
+        from api.auth import FileKeyStore
+
+        store = FileKeyStore(tmp_path / "keys.json")
+        store.reload_interval = 0
+        api_key, _ = store.add()
+        (tmp_path / "keys.json").write_text("{not json")
+        assert store.lookup(api_key) is not None
+
+
+class TestAdmission:
+    """Per-key token buckets, concurrency caps and load shedding."""
+
+    @staticmethod
+    def _key(owner="owner-a", **metadata):
+        from api.auth import APIKey
+
+        return APIKey(key_hash=owner, metadata=metadata)
+
+    @staticmethod
+    def _control(tmp_path, **kwargs):
+        from api.limits import AdmissionControl, TokenBuckets
+
+        return AdmissionControl(TokenBuckets(tmp_path / "limits.sqlite3"), **kwargs)
+
+    def test_parse_rate(self):
+        from api.limits import parse_rate
+
+        assert parse_rate("30/hour") == (30, 30 / 3600)
+        assert parse_rate("5/10") == (5, 0.5)
+        assert parse_rate("none") is None and parse_rate("0") is None
+        for bad in ("30", "x/min", "10/fortnight", "-1/min"):
+            with pytest.raises(ValueError):
+                parse_rate(bad)
+
+    def test_endpoint_class(self):
+        from api.limits import BULK, CHEAP, EXPENSIVE, endpoint_class
+
+        assert endpoint_class("POST", "/audit/debias") == EXPENSIVE
+        assert endpoint_class("POST", "/audit/pdf") == EXPENSIVE
+        assert endpoint_class("POST", "/audit/bootstrap") == EXPENSIVE
+        assert endpoint_class("POST", "/audit/csv/stream") == BULK
+        assert endpoint_class("POST", "/audit/compliance/batch") == BULK
+        assert endpoint_class("GET", "/jobs/debias") == CHEAP
+        assert endpoint_class("POST", "/audit") == CHEAP
+
+    def test_bucket_refills_and_survives_restart(self, tmp_path):
+        from api.limits import TokenBuckets
+
+        buckets = TokenBuckets(tmp_path / "limits.sqlite3")
+        assert buckets.take("a", "cheap", 2, 1.0, now=100) == 0
+        assert buckets.take("a", "cheap", 2, 1.0, now=100) == 0
+        assert buckets.take("a", "cheap", 2, 1.0, now=100) == pytest.approx(1.0)
+        assert buckets.take("b", "cheap", 2, 1.0, now=100) == 0  # per owner
+
+        reopened = TokenBuckets(tmp_path / "limits.sqlite3")
+        assert reopened.take("a", "cheap", 2, 1.0, now=100.5) == pytest.approx(0.5)
+        assert reopened.take("a", "cheap", 2, 1.0, now=101.5) == 0
+
+    def test_rate_limit_refusal(self, tmp_path):
+        from api.limits import Refusal
+
+        control = self._control(tmp_path, rates={"expensive": "2/hour"})
+        key = self._key()
+        for _ in range(2):
+            control.acquire(key, "expensive")
+            control.release(key, "expensive")
+        with pytest.raises(Refusal) as exc:
+            control.acquire(key, "expensive")
+        assert exc.value.status_code == 429
+        assert 1700 < exc.value.retry_after <= 1800
+        control.acquire(key, "cheap")  # separate bucket
+        assert control.metrics()["rate_limited"] == 1
+        assert control.metrics()["in_flight"] == 1
+
+    def test_concurrency_cap_and_metadata_override(self, tmp_path):
+        from api.limits import Refusal
+
+        control = self._control(tmp_path, concurrency={"expensive": 1})
+        key = self._key()
+        control.acquire(key, "expensive")
+        with pytest.raises(Refusal) as exc:
+            control.acquire(key, "expensive")
+        assert exc.value.status_code == 429
+        control.release(key, "expensive")
+        control.acquire(key, "expensive")
+
+        vip = self._key("owner-b", concurrency_expensive="3", rate_limit_expensive="none")
+        assert control.limits_for(vip, "expensive") == (None, 3)
+        for _ in range(3):
+            control.acquire(vip, "expensive")
+        with pytest.raises(Refusal):
+            control.acquire(vip, "expensive")
+        # Invalid metadata falls back to the defaults.
+        assert control.limits_for(self._key(rate_limit_cheap="lots"), "cheap") == control.limits_for(key, "cheap")
+
+    def test_load_shedding(self, tmp_path):
+        from api.limits import Refusal
+
+        queued = [0]
+        control = self._control(tmp_path, queue_depth=lambda: queued[0], max_queued=4, shed_retry_after=7)
+        control.check_load()
+        queued[0] = 4
+        with pytest.raises(Refusal) as exc:
+            control.check_load()
+        assert (exc.value.status_code, exc.value.retry_after) == (503, 7)
+
+        control = self._control(tmp_path, max_rss_bytes=1)
+        with pytest.raises(Refusal):
+            control.check_load()
+
+    def test_middleware_returns_429_with_retry_after(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_CHEAP", "2/min")
+        with TestClient(api_main.app) as c:
+            assert c.get("/registry", headers=HEADERS).status_code == 200
+            assert c.get("/registry", headers=HEADERS).status_code == 200
+            resp = c.get("/registry", headers=HEADERS)
+            assert resp.status_code == 429
+            assert 1 <= int(resp.headers["retry-after"]) <= 30
+            assert c.get("/health").status_code == 200  # unauthenticated paths pass
+        # Bucket state persists into the next server lifetime.
+        with TestClient(api_main.app) as c:
+            assert c.get("/registry", headers=HEADERS).status_code == 429
+
+    def test_middleware_sheds_on_queue_depth(self, client, monkeypatch):
+        monkeypatch.setattr(api_main.admission, "max_queued", 1)
+        monkeypatch.setattr(api_main.admission, "queue_depth", lambda: 1)
+        resp = client.get("/registry", headers=HEADERS)
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "5"
+        monkeypatch.setattr(api_main.admission, "queue_depth", lambda: 0)
+        assert client.get("/metrics", headers=HEADERS).json()["admission"]["shed"] == 1
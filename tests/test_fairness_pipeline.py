@@ -9,9 +9,17 @@ Covers:
 - fairness_audit.py
 - fairness_reweight.py
 - community_input.py
+- group_stats.py
+- ingest.py
+- monitoring.py
+- bootstrap.py
+- validation_runner.py
+- threshold_sweep.py
+- config_registry.py
 - Integration: end-to-end audit pipeline
 """
 
+import io
 import json
 import math
 import tempfile
@@ -27,9 +35,32 @@ PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from racial_bias_score import calculate_racial_bias_score
-from fairness_audit import group_outcomes_by_race, disparate_impact
-from fairness_reweight import reweight_samples_with_community
+from racial_bias_score import calculate_racial_bias_score, calculate_racial_bias_score_from_counts
+from fairness_audit import (
+    group_outcomes_by_race,
+    disparate_impact,
+    disparate_impact_from_counts,
+    disparate_impact_matrix,
+    disparate_impact_ratios,
+    build_audit_report,
+    intersectional_audit,
+)
+from group_stats import GroupCounts, group_counts, intersection_counts, outcome_counts, weighted_group_rates
+from monitoring import AuditAccumulator, RollingAuditMonitor
+from bootstrap import bootstrap_audit, bootstrap_audit_rows, count_replicates
+from validation_runner import evaluate_counts, run_validations
+from threshold_sweep import ThresholdSweep, threshold_grid
+from config_registry import ConfigRegistry, load_config
+from ingest import (
+    CSV, GZIP, PARQUET, ZSTD, MissingColumnsError, audit_dtypes, detect_compression, detect_format,
+    iter_batches, read_table,
+)
+from fairness_reweight import (
+    ReweightTable,
+    community_sample_weights,
+    reweight_samples_with_community,
+    reweight_table,
+)
 from community_input import (
     build_community_config,
     validate_community_config,
@@ -145,6 +176,12 @@ class TestRacialBiasScore:
         result = calculate_racial_bias_score(df, "race", "outcome")
         assert result["racial_disparity_score"] == 0.0
 
+    def test_intersectional_score(self, simple_df):
+        df = simple_df.assign(sex=["F", "M", "F", "F", "M", "M"])
+        result = calculate_racial_bias_score(df, ["race", "sex"], "outcome")
+        assert result["group_outcomes"]["Black × F"] == 0.5
+        assert result["racial_disparity_score"] == 1.0
+
     def test_all_nan_after_drop_raises(self):
         df = pd.DataFrame({
             "race": ["White", "Black"],
@@ -189,6 +226,16 @@ class TestFairnessAudit:
         with pytest.raises(ValueError, match="empty"):
             group_outcomes_by_race(df, "race", "outcome")
 
+    def test_disparate_impact_matrix_rows_match_ratios(self):
+        rates = {"White": 0.75, "Black": 0.3333, "Latinx": 0.0, "Asian": 0.6}
+        references = ["White", "Asian", "Latinx"]
+        matrix = disparate_impact_matrix(rates, references)
+        assert matrix.shape == (3, 4)
+        for row, ref in zip(matrix, references[:2]):
+            assert row.tolist() == list(disparate_impact_ratios(rates, ref).values())
+        # Zero-rate reference: every ratio undefined except the reference itself.
+        assert np.isnan(matrix[2, [0, 1, 3]]).all() and matrix[2, 2] == 1.0
+
     def test_disparate_impact_equal_rates(self):
         """Equal rates → DI = 1.0."""
         df = pd.DataFrame({
@@ -235,6 +282,20 @@ class TestFairnessAudit:
         di = disparate_impact(df, "race", "outcome", "White", "NonExistent", 1)
         assert di == 0.0
 
+    def test_intersectional_audit_reports_cells(self, large_df, community_defs_default):
+        df = large_df.assign(sex=np.where(np.arange(len(large_df)) % 3 == 0, "F", "M"))
+        report = intersectional_audit(df, ["race", "sex"], "outcome", 1, community_defs_default, min_cell_size=60)
+        cells = report["intersections"]
+        assert cells["cells_occupied"] == 8
+        assert cells["cells_reported"] + cells["cells_suppressed"] == 8
+        assert all(n >= 60 for n in cells["cell_sizes"].values())
+        assert set(report["metrics"]["disparate_impact"]) == set(cells["cell_sizes"])
+        assert report["summary"]["total_records"] == len(df)
+
+    def test_intersectional_audit_all_cells_too_small_raises(self, simple_df, community_defs_default):
+        with pytest.raises(ValueError, match="at least 30 rows"):
+            intersectional_audit(simple_df, ["race"], "outcome", 1, community_defs_default)
+
     def test_disparate_impact_string_favorable(self):
         """Works with string outcome values."""
         df = pd.DataFrame({
@@ -357,6 +418,49 @@ class TestFairnessReweight:
         )
         pd.testing.assert_series_equal(r1["sample_weight"], r2["sample_weight"])
 
+    def test_weights_only_leaves_input_untouched(self, large_df, community_defs_default):
+        before = large_df.copy()
+        weights = community_sample_weights(large_df, "race", "outcome", 1, community_defs_default)
+        pd.testing.assert_frame_equal(large_df, before)
+        expected = reweight_samples_with_community(large_df, "race", "outcome", 1, community_defs_default)
+        np.testing.assert_array_equal(weights, expected["sample_weight"].to_numpy())
+
+    def test_inplace_attaches_column_to_input(self, simple_df, community_defs_default):
+        result = reweight_samples_with_community(
+            simple_df, "race", "outcome", 1, community_defs_default, inplace=True
+        )
+        assert result is simple_df
+        assert "sample_weight" in simple_df.columns
+
+    def test_missing_group_gets_weight_one(self, community_defs_default):
+        df = pd.DataFrame({
+            "race": ["White", "White", "Black", "Black", None],
+            "outcome": [1, 0, 1, 0, 1],
+        })
+        weights = community_sample_weights(df, "race", "outcome", 1, community_defs_default)
+        assert weights[-1] == 1.0
+
+    def test_table_applies_to_shards(self, large_df, community_defs_default):
+        table = reweight_table(large_df, "race", "outcome", 1, community_defs_default)
+        whole = community_sample_weights(large_df, "race", "outcome", 1, community_defs_default)
+        shards = [table.apply_weights(large_df.iloc[i:i + 150]) for i in range(0, len(large_df), 150)]
+        np.testing.assert_array_equal(np.concatenate(shards), whole)
+
+    def test_table_applies_to_arrow_batches(self, large_df, community_defs_default):
+        pa = pytest.importorskip("pyarrow")
+        table = reweight_table(large_df, "race", "outcome", 1, community_defs_default)
+        batch = pa.RecordBatch.from_pandas(large_df.astype({"race": "category"}))
+        np.testing.assert_array_equal(table.apply_weights(batch), table.apply_weights(large_df))
+
+    def test_table_round_trips_through_json(self, large_df, community_defs_default):
+        import json
+
+        table = reweight_table(large_df, "race", "outcome", 1, community_defs_default)
+        restored = ReweightTable.from_dict(json.loads(json.dumps(table.to_dict())))
+        np.testing.assert_array_equal(restored.apply_weights(large_df), table.apply_weights(large_df))
+        assert restored.weight("Black", True) == table.weight("Black", True)
+        assert restored.weight("Unknown", False) == 1.0
+
 
 # ===================================================================
 # SECTION 4: community_input.py
@@ -639,3 +743,558 @@ class TestAdversarial:
         assert di == 0.8
         # At threshold 0.8, DI >= threshold → NOT flagged
         assert not (di < 0.8)
+
+
+# ===================================================================
+# SECTION 7: group_stats.py
+# ===================================================================
+
+class TestGroupStats:
+    """Tests for the single-pass group_counts() kernel."""
+
+    def test_matches_groupby_mean(self, large_df):
+        counts = group_counts(large_df["race"], large_df["outcome"])
+        expected = large_df.groupby("race")["outcome"].mean().to_dict()
+        assert counts.labels == sorted(expected)
+        for group, rate in counts.rate_dict().items():
+            assert math.isclose(rate, expected[group])
+
+    def test_counts_and_totals(self, simple_df):
+        counts = outcome_counts(simple_df, "race", "outcome", 1)
+        assert counts.to_dict() == {
+            "Black": {"favorable": 1.0, "total": 2},
+            "Latinx": {"favorable": 0.0, "total": 2},
+            "White": {"favorable": 2.0, "total": 2},
+        }
+        assert counts.n_records == 6
+
+    def test_missing_values_dropped(self):
+        counts = group_counts(
+            pd.Series(["White", None, "Black", "Black"]),
+            pd.Series([1, 1, np.nan, 0]),
+        )
+        assert counts.to_dict() == {
+            "Black": {"favorable": 0.0, "total": 1},
+            "White": {"favorable": 1.0, "total": 1},
+        }
+
+    def test_unobserved_categories_dropped(self):
+        groups = pd.Categorical(["White", "Black"], categories=["White", "Black", "Asian"])
+        counts = group_counts(groups, [1, 0])
+        assert "Asian" not in counts
+        assert len(counts) == 2
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same length"):
+            group_counts(["White", "Black"], [1])
+
+    def test_disparate_impact_from_counts_matches_frame(self, large_df):
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        assert disparate_impact_from_counts(counts, "White", "Black") == pytest.approx(
+            disparate_impact(large_df, "race", "outcome", "White", "Black", 1)
+        )
+
+    def test_disparate_impact_ratios(self):
+        ratios = disparate_impact_ratios({"White": 0.8, "Black": 0.4}, "White")
+        assert ratios == {"White": 1.0, "Black": 0.5}
+
+    def test_disparate_impact_ratios_zero_reference(self):
+        ratios = disparate_impact_ratios({"White": 0.0, "Black": 0.4}, "White")
+        assert ratios == {"White": 1.0, "Black": None}
+
+    def test_merge_of_chunks_equals_whole(self, large_df):
+        whole = outcome_counts(large_df, "race", "outcome", 1)
+        merged = GroupCounts()
+        for start in range(0, len(large_df), 300):
+            merged = merged.merge(outcome_counts(large_df.iloc[start:start + 300], "race", "outcome", 1))
+        assert merged.to_dict() == whole.to_dict()
+
+    def test_bias_score_from_counts_matches_rows(self, large_df):
+        from_rows = calculate_racial_bias_score(large_df, "race", "outcome")
+        from_counts = calculate_racial_bias_score_from_counts(
+            outcome_counts(large_df, "race", "outcome", 1).to_dict()
+        )
+        assert from_counts == from_rows
+
+    def test_from_mapping_rejects_favorable_above_total(self):
+        with pytest.raises(ValueError, match="between 0 and total"):
+            GroupCounts.from_mapping({"White": {"favorable": 5, "total": 4}})
+
+    def test_from_mapping_rejects_missing_field(self):
+        with pytest.raises(ValueError, match="'favorable' and 'total'"):
+            GroupCounts.from_mapping({"White": {"total": 4}})
+
+    def test_reweight_table_matches_row_weights(self, large_df, community_defs_default):
+        table = ReweightTable.from_counts(
+            outcome_counts(large_df, "race", "outcome", 1), community_defs_default
+        ).to_dict()
+        rows = reweight_samples_with_community(large_df, "race", "outcome", 1, community_defs_default)
+        for (group, outcome), weights in rows.groupby(["race", "outcome"])["sample_weight"]:
+            key = "favorable" if outcome == 1 else "unfavorable"
+            assert set(weights) == {table["weights"][group][key]}
+
+    def test_group_counts_constructor_validates(self):
+        with pytest.raises(ValueError, match="same length"):
+            GroupCounts(["White"], [1.0, 2.0], [1])
+
+    def test_intersection_counts_match_multi_column_groupby(self, large_df):
+        rng = np.random.default_rng(3)
+        df = large_df.assign(
+            sex=rng.choice(["F", "M"], size=len(large_df)),
+            age=rng.choice(["<25", "25-44", "45+", None], size=len(large_df)),
+        )
+        cells = intersection_counts(df[["race", "sex", "age"]], df["outcome"])
+        expected = df.dropna().groupby(["race", "sex", "age"])["outcome"].agg(["sum", "count"])
+        assert len(cells) == len(expected)
+        counts = cells.to_group_counts()
+        for (race, sex, age), row in expected.iterrows():
+            assert counts.to_dict()[f"{race} × {sex} × {age}"] == {"favorable": row["sum"], "total": row["count"]}
+
+    def test_intersection_counts_sparse_code_space(self):
+        # 3 columns x 400 levels = 64M possible cells, 500 occupied.
+        n = 500
+        groups = pd.DataFrame({c: [f"{c}{i % 400:03d}" for i in range(n)] for c in "abc"})
+        cells = intersection_counts(groups, np.ones(n))
+        assert len(cells) == 400
+        assert cells.total.sum() == n
+
+    def test_min_cell_size_suppresses_small_cells(self, simple_df):
+        df = simple_df.assign(sex=["F", "M", "F", "F", "M", "M"])
+        counts = intersection_counts(df[["race", "sex"]], df["outcome"]).to_group_counts(min_cell_size=2)
+        assert counts.labels == ["Black × F", "Latinx × M"]
+
+    def test_weighted_rates_match_per_group_masks(self, large_df, community_defs_default):
+        rows = reweight_samples_with_community(large_df, "race", "outcome", 1, community_defs_default)
+        weighted = weighted_group_rates(rows["race"], rows["outcome"] == 1, rows["sample_weight"])
+        for group, rate in weighted.rate_dict().items():
+            g = rows[rows["race"] == group]
+            expected = g.loc[g["outcome"] == 1, "sample_weight"].sum() / g["sample_weight"].sum()
+            assert rate == pytest.approx(expected)
+
+    def test_effective_sample_size(self):
+        weighted = weighted_group_rates(["A", "A", "B", "B"], [1, 0, 1, 0], [1.0, 1.0, 3.0, 1.0])
+        assert weighted.effective_n.tolist() == pytest.approx([2.0, 16 / 10])
+        assert weighted.weight_total.tolist() == [2.0, 4.0]
+        assert weighted.rate_dict() == {"A": 0.5, "B": 0.75}
+
+
+# ===================================================================
+# SECTION 8: ingest.py
+# ===================================================================
+
+class TestIngest:
+    """Tests for format detection and column-projected reads."""
+
+    def test_detect_format_content_type_wins(self):
+        assert detect_format("application/vnd.apache.parquet", "data.csv") == PARQUET
+
+    def test_detect_format_falls_back_to_extension(self):
+        assert detect_format("application/octet-stream", "hmda.parquet") == PARQUET
+
+    def test_detect_format_defaults_to_csv(self):
+        assert detect_format(None, None) == CSV
+
+    def test_csv_missing_column_raises(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text("race,outcome\nWhite,1\n")
+        with pytest.raises(MissingColumnsError, match="hired"):
+            read_table(path, CSV, columns=["race", "hired"])
+
+    def test_parquet_reads_only_requested_columns(self, tmp_path, simple_df):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "data.parquet"
+        simple_df.assign(extra=1).to_parquet(path)
+        df = read_table(path, PARQUET, columns=["race", "outcome"])
+        assert list(df.columns) == ["race", "outcome"]
+        assert len(df) == len(simple_df)
+
+    def test_csv_projection_with_padded_header(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text(" race , outcome ,notes\nWhite,1,a\nBlack,0,b\n")
+        df = read_table(path, CSV, columns=["race", "outcome"], dtype=audit_dtypes("race", "outcome", 1))
+        assert list(df.columns) == ["race", "outcome"]
+        assert isinstance(df["race"].dtype, pd.CategoricalDtype)
+        assert df["outcome"].dtype == "float64"
+
+    def test_csv_engines_agree(self, tmp_path, large_df):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "data.csv"
+        large_df.to_csv(path, index=False)
+        kwargs = dict(columns=["race", "outcome"], dtype=audit_dtypes("race", "outcome", 1))
+        c_counts = outcome_counts(read_table(path, CSV, **kwargs), "race", "outcome", 1)
+        pa_counts = outcome_counts(read_table(path, CSV, engine="pyarrow", **kwargs), "race", "outcome", 1)
+        assert c_counts.to_dict() == pa_counts.to_dict()
+
+    def test_detect_compression(self):
+        assert detect_compression(None, "hmda.csv.gz") == GZIP
+        assert detect_compression("application/zstd", "upload") == ZSTD
+        assert detect_compression("text/csv", "hmda.csv") is None
+        assert detect_format("application/gzip", "hmda.csv.gz") == CSV
+        assert detect_format(None, "hmda.parquet.zst") == PARQUET
+
+    @pytest.mark.parametrize("compression", [GZIP, ZSTD])
+    def test_compressed_csv_file_object(self, large_df, compression):
+        import gzip
+
+        raw = large_df.assign(notes="x").to_csv(index=False).encode()
+        if compression == GZIP:
+            data = gzip.compress(raw)
+        else:
+            zstandard = pytest.importorskip("zstandard")
+            data = zstandard.ZstdCompressor().compress(raw)
+        kwargs = dict(columns=["race", "outcome"], dtype=audit_dtypes("race", "outcome", 1))
+        expected = outcome_counts(read_table(io.BytesIO(raw), CSV, **kwargs), "race", "outcome", 1)
+
+        df = read_table(io.BytesIO(data), CSV, compression=compression, **kwargs)
+        assert list(df.columns) == ["race", "outcome"]
+        assert outcome_counts(df, "race", "outcome", 1).to_dict() == expected.to_dict()
+        batches = list(iter_batches(io.BytesIO(data), CSV, batch_rows=300, compression=compression, **kwargs))
+        assert sum(len(b) for b in batches) == len(large_df)
+
+    def test_compressed_parquet_rejected(self):
+        with pytest.raises(ValueError, match="Compressed Parquet"):
+            read_table(io.BytesIO(b""), PARQUET, compression=GZIP)
+
+    def test_audit_dtypes_leaves_unknown_outcome_inferred(self):
+        assert audit_dtypes("race", "hired") == {"race": "category"}
+        assert audit_dtypes("race", "hired", "Yes") == {"race": "category", "hired": "str"}
+
+
+# ===================================================================
+# SECTION 9: monitoring.py
+# ===================================================================
+
+class TestAuditAccumulator:
+    """Incremental counts must reproduce a one-shot audit of the same rows."""
+
+    @staticmethod
+    def _shards(df, size=250):
+        return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+    def test_updates_match_one_shot_report(self, large_df, community_defs_default):
+        acc = AuditAccumulator("race", "outcome", 1)
+        for shard in self._shards(large_df):
+            acc.update(shard)
+        expected = build_audit_report(
+            outcome_counts(large_df, "race", "outcome", 1), community_defs_default,
+            outcome_col="outcome", favorable_value="1", total_records=len(large_df),
+        )
+        assert acc.report(community_defs_default, favorable_value="1") == expected
+
+    def test_merged_workers_match_single_accumulator(self, large_df, community_defs_default):
+        workers = [AuditAccumulator("race", "outcome", 1).update(shard) for shard in self._shards(large_df)]
+        merged = workers[0]
+        for worker in workers[1:]:
+            merged.merge(AuditAccumulator.from_dict(json.loads(json.dumps(worker.to_dict()))))
+        single = AuditAccumulator("race", "outcome", 1).update(large_df)
+        assert merged.report(community_defs_default) == single.report(community_defs_default)
+        assert merged.bias_score() == calculate_racial_bias_score(large_df, "race", "outcome")
+
+    def test_retract_matches_remaining_rows(self, large_df, community_defs_default):
+        acc = AuditAccumulator("race", "outcome", 1).update(large_df)
+        acc.retract(large_df.iloc[:400])
+        remaining = AuditAccumulator("race", "outcome", 1).update(large_df.iloc[400:])
+        assert acc.n_records == 600
+        assert acc.counts.to_dict() == remaining.counts.to_dict()
+        assert acc.report(community_defs_default) == remaining.report(community_defs_default)
+
+    def test_retracting_uncounted_rows_raises(self, simple_df):
+        acc = AuditAccumulator("race", "outcome", 1).update(simple_df.iloc[:2])
+        with pytest.raises(ValueError, match="never counted"):
+            acc.retract(simple_df.iloc[2:4])
+        assert acc.n_records == 2
+
+    def test_merge_rejects_different_audit(self):
+        with pytest.raises(ValueError, match="different audits"):
+            AuditAccumulator("race", "outcome", 1).merge(AuditAccumulator("race", "outcome", 0))
+
+    def test_weighted_rates_and_retraction(self, large_df, community_defs_default):
+        rows = reweight_samples_with_community(large_df, "race", "outcome", 1, community_defs_default)
+        acc = AuditAccumulator("race", "outcome", 1, weight_col="sample_weight")
+        for shard in self._shards(rows):
+            acc.update(shard)
+        expected = weighted_group_rates(rows["race"], rows["outcome"] == 1, rows["sample_weight"])
+        assert acc.group_counts().rate_dict() == pytest.approx(expected.rate_dict())
+
+        acc.retract(rows.iloc[:250])
+        tail = rows.iloc[250:]
+        expected = weighted_group_rates(tail["race"], tail["outcome"] == 1, tail["sample_weight"])
+        assert acc.group_counts().rate_dict() == pytest.approx(expected.rate_dict())
+
+
+class TestRollingAuditMonitor:
+    """Windowed counts from the bucket ring equal counts of the filtered rows."""
+
+    @pytest.fixture
+    def stamped_df(self, large_df):
+        rng = np.random.default_rng(7)
+        seconds = rng.integers(0, 60 * 86400, size=len(large_df))
+        return large_df.assign(ts=pd.Timestamp("2026-01-01") + pd.to_timedelta(seconds, unit="s"))
+
+    def test_windows_match_filtered_rows(self, stamped_df):
+        monitor = RollingAuditMonitor("race", "outcome", "ts", 1, retention=60)
+        for start in range(0, len(stamped_df), 200):
+            monitor.update(stamped_df.iloc[start:start + 200])
+        assert monitor.late_events == 0
+        for days in (1, 7, 30, 60):
+            first = monitor.latest.tz_localize(None) - pd.Timedelta(days=days - 1)
+            expected = outcome_counts(stamped_df[stamped_df["ts"] >= first], "race", "outcome", 1)
+            assert monitor.window_counts(f"{days}D").to_dict() == expected.to_dict()
+
+    def test_ring_wraps_and_drops_expired_buckets(self, stamped_df):
+        monitor = RollingAuditMonitor("race", "outcome", "ts", 1, retention=7)
+        for _, day in stamped_df.groupby(stamped_df["ts"].dt.floor("D")):
+            monitor.update(day)
+        assert monitor.late_events == 0  # day by day, nothing arrives late
+        last_week = stamped_df["ts"] >= monitor.latest.tz_localize(None) - pd.Timedelta(days=6)
+        assert monitor.window_counts(7).n_records == last_week.sum()
+        with pytest.raises(ValueError, match="retained"):
+            monitor.window_counts("8D")
+
+    def test_future_timestamp_does_not_clear_ring(self, stamped_df):
+        monitor = RollingAuditMonitor("race", "outcome", "ts", 1, retention=60)
+        now = stamped_df["ts"].max()
+        monitor.add(stamped_df["ts"], stamped_df["race"], stamped_df["outcome"] == 1, now=now)
+        before = monitor.window_counts("30D").to_dict()
+        assert monitor.add(["2099-01-01"], ["White"], [1], now=now) == 0
+        assert monitor.future_events == 1
+        assert monitor.window_counts("30D").to_dict() == before
+        # Within the allowed skew an event is kept.
+        assert monitor.add([now + pd.Timedelta(minutes=30)], ["White"], [1], now=now) == 1
+
+    def test_max_groups(self):
+        monitor = RollingAuditMonitor("race", "outcome", "ts", 1, retention=10, max_groups=3)
+        assert monitor.add(["2026-01-01"] * 2, ["A", "B"], [1, 0]) == 2
+        with pytest.raises(ValueError, match="at most 3"):
+            monitor.add(["2026-01-01"] * 2, ["C", "D"], [1, 0])
+        assert monitor.labels == ["A", "B"]
+        assert monitor.add(["2026-01-01"] * 2, ["C", "A"], [1, 0]) == 2
+
+    def test_window_report_matches_build_audit_report(self, stamped_df, community_defs_default):
+        monitor = RollingAuditMonitor("race", "outcome", "ts", 1, retention=60)
+        monitor.update(stamped_df)
+        report = monitor.window_report("60D", community_defs_default)
+        assert report.pop("window")["buckets"] == 60
+        expected = build_audit_report(
+            outcome_counts(stamped_df, "race", "outcome", 1), community_defs_default,
+            outcome_col="outcome", favorable_value=1,
+        )
+        assert report == expected
+
+
+# ===================================================================
+# SECTION 10: bootstrap.py
+# ===================================================================
+
+class TestBootstrap:
+    """Contingency-table bootstraps agree with the point audit and with row resampling."""
+
+    def test_intervals_bracket_point_estimates(self, large_df, community_defs_default):
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        result = bootstrap_audit(counts, community_defs_default, n_replicates=2000, seed=1)
+        report = build_audit_report(counts, community_defs_default, "outcome", 1)
+        assert result["reference_group"] == "White"
+        for group, ci in result["disparate_impact"].items():
+            assert ci["estimate"] == report["metrics"]["disparate_impact"][group]
+            assert ci["lower"] <= ci["estimate"] <= ci["upper"]
+            assert 0.0 <= ci["p_flagged"] <= 1.0
+        assert result["disparate_impact"]["White"] == {"estimate": 1.0, "lower": 1.0, "upper": 1.0, "p_flagged": 0.0}
+        score = result["disparity_score"]
+        assert score["estimate"] == report["metrics"]["disparity_score"]
+        assert score["lower"] <= score["estimate"] <= score["upper"]
+
+    def test_seeded_runs_are_reproducible(self, large_df, community_defs_default):
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        first = bootstrap_audit(counts, community_defs_default, n_replicates=500, method="multinomial", seed=7)
+        second = bootstrap_audit(counts, community_defs_default, n_replicates=500, method="multinomial", seed=7)
+        assert first == second
+
+    def test_multinomial_preserves_total(self, simple_df):
+        counts = outcome_counts(simple_df, "race", "outcome", 1)
+        favorable, total = count_replicates(counts, 100, "multinomial", np.random.default_rng(0))
+        assert favorable.shape == (100, 3)
+        assert (total.sum(axis=1) == 6).all()
+        assert (favorable <= total).all()
+
+    def test_rows_agree_with_binomial(self, large_df, community_defs_default):
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        binomial = bootstrap_audit(counts, community_defs_default, n_replicates=4000, seed=2)
+        rows = bootstrap_audit_rows(large_df, "race", "outcome", 1, community_defs_default, n_replicates=4000, seed=3)
+        for group in ("Black", "Latinx", "Asian"):
+            for bound in ("lower", "upper"):
+                assert rows["disparate_impact"][group][bound] == pytest.approx(
+                    binomial["disparate_impact"][group][bound], abs=0.03
+                )
+
+    def test_weighted_rows_bootstrap(self, large_df, community_defs_default):
+        rows = reweight_samples_with_community(large_df, "race", "outcome", 1, community_defs_default)
+        result = bootstrap_audit_rows(
+            rows, "race", "outcome", 1, community_defs_default, weight_col="sample_weight",
+            n_replicates=500, seed=0,
+        )
+        # Reweighting lifts priority groups to the target rate: DI is ~1 after mitigation.
+        assert result["disparate_impact"]["Black"]["estimate"] == pytest.approx(1.0, abs=1e-3)
+        assert result["method"] == "rows"
+
+    def test_zero_reference_rate_is_undefined_not_flagged(self, community_defs_default):
+        counts = GroupCounts(["White", "Black"], [0, 3], [5, 5])
+        result = bootstrap_audit(counts, community_defs_default, n_replicates=200, seed=0)
+        black = result["disparate_impact"]["Black"]
+        assert black["estimate"] is None and black["lower"] is None
+        assert black["p_flagged"] == 0.0 and black["undefined_fraction"] == 1.0
+
+
+# ===================================================================
+# SECTION 11: validation_runner.py
+# ===================================================================
+
+class TestValidationRunner:
+    """Cached-count evaluation must match auditing each config from the rows."""
+
+    CONFIGS = {
+        "default": {"fairness_target": None, "threshold": 0.8},
+        "community": {"fairness_target": "White", "threshold": 0.9},
+    }
+
+    @pytest.fixture
+    def datasets(self, tmp_path, large_df):
+        large_df.to_csv(tmp_path / "a.csv", index=False)
+        compas = pd.DataFrame({
+            "race": ["Caucasian"] * 10 + ["African-American"] * 10 + ["Other"] * 4,
+            "recid": [0] * 8 + [1] * 2 + [0] * 6 + [1] * 4 + [1] * 4,
+        })
+        compas.to_csv(tmp_path / "b.csv", index=False)
+        spec = {"race_col": "race", "outcome_col": "outcome", "favorable": 1}
+        return {
+            "A": {"path": "a.csv", **spec},
+            "B": {"path": "b.csv", "race_col": "race", "outcome_col": "recid", "favorable": 0},
+            "Missing": {"path": "missing.csv", **spec},
+        }
+
+    def test_matches_row_audit(self, datasets, tmp_path, large_df):
+        results = run_validations(datasets, self.CONFIGS, root=tmp_path, max_workers=1)
+        assert list(results) == ["A", "B"]
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        assert results["A"]["n_records"] == len(large_df)
+        assert results["A"]["configs"]["community"] == evaluate_counts(counts, "White", 0.9)
+
+    def test_skip_labels_and_caucasian_fallback(self, datasets, tmp_path):
+        b = run_validations(datasets, self.CONFIGS, root=tmp_path, max_workers=1)["B"]
+        assert b["n_records"] == 20 and b["n_groups"] == 2
+        community = b["configs"]["community"]
+        assert community["reference_group"] == "Caucasian"
+        assert community["disparate_impact"]["African-American"] == 0.75
+        assert community["flagged_groups"] == ["African-American"]
+
+    def test_process_pool_matches_serial(self, datasets, tmp_path):
+        serial = run_validations(datasets, self.CONFIGS, root=tmp_path, max_workers=1)
+        pooled = run_validations(datasets, self.CONFIGS, root=tmp_path, max_workers=2)
+        assert list(pooled) == list(serial)
+        for name in serial:
+            assert pooled[name]["configs"] == serial[name]["configs"]
+            assert pooled[name]["counts"].to_dict() == serial[name]["counts"].to_dict()
+
+
+# ===================================================================
+# SECTION 12: threshold_sweep.py
+# ===================================================================
+
+class TestThresholdSweep:
+    """Sorted-DI sweeps must agree with checking every group at every threshold."""
+
+    DI = {"White": 1.0, "Black": 0.6667, "Latinx": 0.8, "Asian": 1.05, "Other": None}
+
+    def test_dense_grid_matches_loop(self):
+        sweep = ThresholdSweep(self.DI, reference="White")
+        grid = threshold_grid(0.5, 1.2, 10_001)
+        expected = [
+            sum(1 for g, di in self.DI.items() if g != "White" and di is not None and di < t) for t in grid
+        ]
+        assert sweep.flagged_counts(grid).tolist() == expected
+
+    def test_exact_flip_thresholds(self):
+        sweep = ThresholdSweep(self.DI, reference="White")
+        assert sweep.flip_thresholds() == {"Black": 0.6667, "Latinx": 0.8, "Asian": 1.05}
+        assert sweep.undefined == ["Other"]
+        # Flagging is strict: a group passes at its own DI and fails just above it.
+        assert sweep.flagged_groups(0.8) == ["Black"]
+        assert sweep.flagged_groups(0.8001) == ["Black", "Latinx"]
+
+    def test_grid_hits_round_thresholds(self):
+        grid = threshold_grid(0.7, 0.95, 6)
+        assert grid.tolist() == [0.7, 0.75, 0.8, 0.85, 0.9, 0.95]
+        with pytest.raises(ValueError):
+            threshold_grid(0.9, 0.8)
+
+    def test_from_counts_uses_audit_reference(self, large_df):
+        counts = outcome_counts(large_df, "race", "outcome", 1)
+        sweep = ThresholdSweep.from_counts(counts)
+        assert sweep.reference == "White"
+        di = disparate_impact_ratios(counts.rate_dict(), "White")
+        del di["White"]
+        assert sweep.flip_thresholds() == di
+
+
+# ===================================================================
+# SECTION 13: config_registry.py
+# ===================================================================
+
+class TestConfigRegistry:
+    """Registry lookups must track the files on disk without re-parsing unchanged ones."""
+
+    @staticmethod
+    def _write(path, record_id, threshold=0.8, input_date="2026-03-15", **extra):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        config = {
+            "priority_groups": ["Black"], "fairness_target": "White", "fairness_threshold": threshold,
+            "provenance": {"record_id": record_id, "input_date": input_date, "input_protocol": "community_session"},
+            **extra,
+        }
+        path.write_text(json.dumps(config))
+
+    @pytest.fixture
+    def registry_dir(self, tmp_path):
+        self._write(tmp_path / "michigan" / "lending" / "detroit.json", "mi-lending-1")
+        self._write(tmp_path / "michigan" / "employment" / "detroit.json", "mi-hiring-1", input_date="2025-01-10")
+        self._write(tmp_path / "georgia" / "lending" / "atlanta.json", "ga-lending-1", jurisdiction="Georgia")
+        self._write(tmp_path / "templates" / "blank.json", "template")
+        (tmp_path / "index.json").write_text("{}")
+        return tmp_path
+
+    def test_indexes_by_id_and_filters(self, registry_dir):
+        registry = ConfigRegistry(registry_dir)
+        assert [e.record_id for e in registry.entries()] == ["ga-lending-1", "mi-hiring-1", "mi-lending-1"]
+        assert registry.get("mi-lending-1")["fairness_threshold"] == 0.8
+        # Jurisdiction falls back to the directory name when the config has none.
+        assert [e.record_id for e in registry.find(jurisdiction="Michigan")] == ["mi-hiring-1", "mi-lending-1"]
+        assert [e.record_id for e in registry.find(domain="lending")] == ["ga-lending-1", "mi-lending-1"]
+        assert [e.record_id for e in registry.find(date_to="2025-12-31")] == ["mi-hiring-1"]
+        with pytest.raises(KeyError):
+            registry.get("template")
+
+    def test_mtime_invalidation(self, registry_dir):
+        registry = ConfigRegistry(registry_dir)
+        registry.entries()
+        registry.entries()
+        assert registry.parses == 3  # unchanged files are not re-read
+
+        path = registry_dir / "michigan" / "lending" / "detroit.json"
+        self._write(path, "mi-lending-1", threshold=0.95)
+        (registry_dir / "georgia" / "lending" / "atlanta.json").unlink()
+        assert registry.get("mi-lending-1")["fairness_threshold"] == 0.95
+        assert registry.parses == 4
+        assert "ga-lending-1" not in {e.record_id for e in registry.entries()}
+
+    def test_get_returns_copy(self, registry_dir):
+        registry = ConfigRegistry(registry_dir)
+        registry.get("mi-lending-1")["priority_groups"].append("Latinx")
+        assert registry.get("mi-lending-1")["priority_groups"] == ["Black"]
+
+    def test_load_config_reloads_changed_file(self, tmp_path):
+        path = tmp_path / "defs.json"
+        self._write(path, "a", threshold=0.8)
+        assert load_config(path)["fairness_threshold"] == 0.8
+        self._write(path, "a", threshold=0.85)
+        assert load_config(path)["fairness_threshold"] == 0.85
+        with pytest.raises(FileNotFoundError):
+            load_config(tmp_path / "missing.json")
@@ -19,12 +19,15 @@ import json
 import sys
 from pathlib import Path
 
-import pandas as pd
-
 PROJECT_ROOT = str(Path(__file__).resolve().parent)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from group_stats import outcome_counts
+from fairness_audit import disparate_impact_ratios
+from threshold_sweep import ThresholdSweep
+from validation_runner import load_counts
+
 
 DATASETS = {
     "HR Hiring": {
@@ -57,8 +60,12 @@ THRESHOLDS = [0.70, 0.75, 0.80, 0.85, 0.90, 0.95]
 
 def compute_di(df, race_col, outcome_col, favorable):
     """Compute DI ratios for all groups relative to White/Caucasian/highest-rate."""
-    binary = (df[outcome_col] == favorable).astype(float)
-    group_rates = binary.groupby(df[race_col]).mean().to_dict()
+    return compute_di_from_counts(outcome_counts(df, race_col, outcome_col, favorable))
+
+
+def compute_di_from_counts(counts):
+    """:func:`compute_di` on precomputed per-group counts."""
+    group_rates = counts.rate_dict()
 
     # Reference group
     if "White" in group_rates:
@@ -68,16 +75,7 @@ def compute_di(df, race_col, outcome_col, favorable):
     else:
         ref = max(group_rates, key=lambda g: group_rates[g])
 
-    ref_rate = group_rates[ref]
-
-    di_ratios = {}
-    for group, rate in group_rates.items():
-        if group == ref:
-            di_ratios[group] = 1.0
-        elif ref_rate == 0:
-            di_ratios[group] = None
-        else:
-            di_ratios[group] = round(rate / ref_rate, 4)
+    di_ratios = disparate_impact_ratios(group_rates, ref)
 
     return di_ratios, group_rates, ref
 
@@ -92,20 +90,15 @@ def main():
     all_results = {}
 
     for name, config in DATASETS.items():
-        path = Path(PROJECT_ROOT) / config["path"]
-        if not path.exists():
+        if not (Path(PROJECT_ROOT) / config["path"]).exists():
             print(f"  SKIP: {name}")
             continue
 
-        df = pd.read_csv(path)
-        mask = ~df[config["race_col"]].isin(SKIP_LABELS)
-        df_clean = df[mask].copy()
-
-        di_ratios, group_rates, ref = compute_di(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"]
-        )
-
-        n_records = len(df_clean)
+        counts, n_records = load_counts(config, PROJECT_ROOT, SKIP_LABELS)
+        di_ratios, group_rates, ref = compute_di_from_counts(counts)
+        sweep = ThresholdSweep(di_ratios, ref)
+        flips = sweep.flip_thresholds()
+        flagged_counts = sweep.flagged_counts(THRESHOLDS)
         groups = sorted(di_ratios.keys())
 
         print(f"{'─' * 100}")
@@ -132,14 +125,16 @@ def main():
             rate = group_rates[group]
             row = f"  {group:<42} {rate:>7.1%} {di if di is not None else 'undef':>7}"
 
-            group_data = {"rate": round(rate, 4), "di": di, "flagged_at": []}
+            flip = flips.get(group)
+            group_data = {
+                "rate": round(rate, 4),
+                "di": di,
+                "flip_threshold": flip,
+                "flagged_at": [t for t in THRESHOLDS if flip is not None and flip < t],
+            }
 
             for t in THRESHOLDS:
-                if di is not None and di < t and group != ref:
-                    row += f" {'FAIL':>7}"
-                    group_data["flagged_at"].append(t)
-                else:
-                    row += f" {'pass':>7}"
+                row += f" {'FAIL' if t in group_data['flagged_at'] else 'pass':>7}"
             print(row)
             dataset_result["groups"][group] = group_data
 
@@ -147,37 +142,21 @@ def main():
 
         # Summary: flagged count at each threshold
         print(f"  {'GROUPS FLAGGED':<42} {'':>7} {'':>7}", end="")
-        for t in THRESHOLDS:
-            count = sum(
-                1 for g, di in di_ratios.items()
-                if di is not None and di < t and g != ref
-            )
+        for t, count in zip(THRESHOLDS, flagged_counts):
             print(f" {count:>7}", end="")
             dataset_result["threshold_sweep"][str(t)] = {
-                "flagged_count": count,
-                "flagged_groups": [
-                    g for g, di in di_ratios.items()
-                    if di is not None and di < t and g != ref
-                ],
+                "flagged_count": int(count),
+                "flagged_groups": sorted(sweep.flagged_groups(t)),
             }
         print()
 
-        # The "critical transition" — where does a group flip from pass to fail?
+        # The "critical transition" — the exact θ where a group flips from pass to fail.
         print()
-        print("  Critical transitions (threshold where group status changes):")
-        for group in groups:
-            di = di_ratios[group]
-            if di is None or group == ref or di >= max(THRESHOLDS):
+        print("  Critical transitions (group passes at θ ≤ DI, fails at every θ above):")
+        for group, flip in flips.items():
+            if flip >= max(THRESHOLDS):
                 continue
-            # Find the lowest threshold that flags this group
-            first_flag = None
-            for t in THRESHOLDS:
-                if di < t:
-                    first_flag = t
-                    break
-            if first_flag:
-                print(f"    {group}: DI={di:.4f} → first flagged at θ={first_flag} "
-                      f"(passes at θ={THRESHOLDS[THRESHOLDS.index(first_flag) - 1] if THRESHOLDS.index(first_flag) > 0 else 'none'})")
+            print(f"    {group}: DI={flip:.4f} → flagged for every θ > {flip:.4f}")
 
         print()
         all_results[name] = dataset_result
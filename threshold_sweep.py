@@ -0,0 +1,102 @@
+"""
+Threshold Sweep
+----------------
+Which groups a DI threshold flags, for every threshold at once.
+
+A group is flagged at threshold θ exactly when its disparate impact is
+below θ, so flagging is monotone: once a group fails at some θ it fails at
+every higher one. :class:`ThresholdSweep` sorts the DI values once; the
+number of groups flagged at any θ is then a ``searchsorted`` into that
+array, so a grid of 10,000 thresholds costs one vectorized call rather than
+a loop over groups and thresholds. Each group's *flip threshold* — the
+point where it changes from pass to fail — is its DI value itself: it
+passes for every θ at or below it and fails for every θ above.
+
+Usage:
+    from group_stats import outcome_counts
+    from threshold_sweep import ThresholdSweep, threshold_grid
+
+    sweep = ThresholdSweep.from_counts(outcome_counts(df, "race", "outcome", 1))
+    sweep.flagged_counts(threshold_grid(0.5, 1.0, 10_001))   # array([0, 0, ..., 3])
+    sweep.flip_thresholds()   # {"Black": 0.6667, "Latinx": 0.8333, ...}
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from fairness_audit import disparate_impact_ratios, reference_group
+from group_stats import GroupCounts
+
+
+def threshold_grid(start: float = 0.5, stop: float = 1.0, steps: int = 501) -> np.ndarray:
+    """
+    Evenly spaced thresholds from ``start`` to ``stop`` inclusive.
+
+    Values are rounded to 12 decimals so grid points such as 0.8 compare
+    equal to a DI of exactly 0.8 rather than to 0.8000000000000003.
+    """
+    if steps < 2:
+        raise ValueError(f"steps must be at least 2, got {steps}.")
+    if not start < stop:
+        raise ValueError(f"start must be below stop, got {start} and {stop}.")
+    return np.linspace(start, stop, steps).round(12)
+
+
+class ThresholdSweep:
+    """
+    Flag status of every group across all thresholds, from DI values sorted once.
+
+    Parameters
+    ----------
+    di_ratios : dict
+        ``{group: di}`` as produced by ``disparate_impact_ratios``. Groups
+        whose DI is None (undefined) are never flagged.
+    reference : optional
+        Reference group; it is left out of the sweep, as it cannot be
+        disparately impacted relative to itself.
+    """
+
+    def __init__(self, di_ratios: dict, reference=None):
+        self.reference = reference
+        defined = {g: di for g, di in di_ratios.items() if g != reference and di is not None}
+        self.undefined = sorted((g for g, di in di_ratios.items() if g != reference and di is None), key=str)
+        self.groups = sorted(defined, key=lambda g: (defined[g], str(g)))
+        self.values = np.array([defined[g] for g in self.groups], dtype=float)
+
+    @classmethod
+    def from_counts(cls, counts: GroupCounts, privileged_group: str | None = None) -> ThresholdSweep:
+        """
+        Sweep the DI of ``counts`` exactly as ``build_audit_report`` computes it.
+
+        The reference group is chosen from the rounded rates and DI from the
+        unrounded ones, so the groups flagged at any threshold match ``/audit``.
+        """
+        if len(counts) == 0:
+            raise ValueError("Group counts are empty.")
+        rates = counts.rate_dict()
+        reference = reference_group({g: round(r, 4) for g, r in rates.items()}, privileged_group)
+        return cls(disparate_impact_ratios(rates, reference), reference)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def flagged_counts(self, thresholds) -> np.ndarray:
+        """Number of groups flagged (DI strictly below θ) at each threshold."""
+        return np.searchsorted(self.values, np.asarray(thresholds, dtype=float), side="left")
+
+    def flagged_groups(self, threshold: float) -> list:
+        """Groups flagged at ``threshold``, lowest DI first."""
+        return self.groups[: int(self.flagged_counts([threshold])[0])]
+
+    def flip_thresholds(self) -> dict:
+        """``{group: θ*}``: the group passes for θ ≤ θ* and is flagged for every θ > θ*."""
+        return {g: float(v) for g, v in zip(self.groups, self.values)}
+
+    def curve(self, thresholds) -> dict:
+        """JSON-ready flagged-count curve over ``thresholds``."""
+        thresholds = np.asarray(thresholds, dtype=float)
+        return {
+            "thresholds": thresholds.tolist(),
+            "flagged_counts": self.flagged_counts(thresholds).tolist(),
+        }
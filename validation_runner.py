@@ -0,0 +1,173 @@
+"""
+Validation Runner
+------------------
+Load each validation dataset once, count it once, and evaluate any number
+of fairness configs against the cached counts.
+
+Every config in the validation study — a reference group and a DI threshold
+— needs only the per-group (favorable, total) counts, so re-reading and
+re-grouping the file per config is wasted work. :func:`run_validations`
+parses each dataset a single time, reduces it to a :class:`GroupCounts`,
+and evaluates every config against that. Datasets are independent, so they
+are spread across a process pool; adding jurisdictions adds parallel work
+rather than serial wall time.
+
+Usage:
+    from validation_runner import run_validations
+    from validation_study import CONFIGS, DATASETS
+
+    results = run_validations(DATASETS, CONFIGS)
+    results["HMDA Lending (Michigan)"]["configs"]["community"]["flagged_groups"]
+    # ["Black or African American", ...]
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fairness_audit import disparate_impact_ratios
+from group_stats import GroupCounts, outcome_counts
+from ingest import audit_dtypes, read_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Race labels that are not a racial group (missing, free text, mixed) and are
+# dropped before auditing.
+SKIP_LABELS = frozenset({
+    "Race Not Available", "Free Form Text Only", "Joint",
+    "2 or more minority races", "Other",
+})
+
+# With the default pool size, fewer datasets than this are counted in-process:
+# a spawned worker re-imports pandas, which costs more than counting a few files.
+_POOL_MIN_DATASETS = 8
+
+
+def load_counts(spec: dict, root: str | Path = PROJECT_ROOT, skip_labels=SKIP_LABELS) -> tuple[GroupCounts, int] | None:
+    """
+    Read one dataset and reduce it to per-group counts.
+
+    ``spec`` has ``path`` (relative to ``root``), ``race_col``,
+    ``outcome_col`` and ``favorable``. Only the two audited columns are
+    parsed. Returns ``(counts, n_records)`` — ``n_records`` counts every row
+    kept after dropping ``skip_labels`` — or None when the file is missing.
+    """
+    path = Path(root) / spec["path"]
+    if not path.exists():
+        return None
+    race_col, outcome_col, favorable = spec["race_col"], spec["outcome_col"], spec["favorable"]
+    df = read_table(
+        path,
+        columns=[race_col, outcome_col],
+        dtype=audit_dtypes(race_col, outcome_col, favorable),
+    )
+    df = df[~df[race_col].isin(skip_labels)]
+    return outcome_counts(df, race_col, outcome_col, favorable), len(df)
+
+
+def evaluate_counts(counts: GroupCounts, ref_group: str | None, threshold: float) -> dict:
+    """
+    Audit per-group counts under one config.
+
+    The reference group is ``ref_group`` when present, else "White", else
+    "Caucasian" (COMPAS labels), else the highest-rate group. Returns the
+    reference group, threshold, rounded group rates, DI ratios, flagged
+    groups and disparity score.
+    """
+    group_rates = counts.rate_dict(decimals=4)
+
+    if ref_group and ref_group in group_rates:
+        ref = ref_group
+    elif "White" in group_rates:
+        ref = "White"
+    elif "Caucasian" in group_rates:
+        ref = "Caucasian"
+    else:
+        ref = max(group_rates, key=lambda g: group_rates[g])
+
+    di_ratios = disparate_impact_ratios(group_rates, ref)
+    flagged = [g for g, di in di_ratios.items() if di is not None and di < threshold]
+
+    return {
+        "reference_group": ref,
+        "threshold": threshold,
+        "group_rates": group_rates,
+        "disparate_impact": di_ratios,
+        "flagged_groups": flagged,
+        "disparity_score": round(max(group_rates.values()) - min(group_rates.values()), 4),
+    }
+
+
+def evaluate_configs(counts: GroupCounts, configs: dict) -> dict:
+    """Evaluate ``{key: {"fairness_target", "threshold"}}`` configs against one set of counts."""
+    return {
+        key: evaluate_counts(counts, config.get("fairness_target"), config["threshold"])
+        for key, config in configs.items()
+    }
+
+
+def validate_dataset(spec: dict, configs: dict, root: str | Path = PROJECT_ROOT, skip_labels=SKIP_LABELS) -> dict | None:
+    """
+    Load, count and evaluate one dataset; None when its file is missing.
+
+    Returns ``{"n_records", "n_groups", "counts", "configs"}`` where
+    ``configs`` maps each config key to its :func:`evaluate_counts` result.
+    """
+    loaded = load_counts(spec, root, skip_labels)
+    if loaded is None:
+        return None
+    counts, n_records = loaded
+    return {
+        "n_records": n_records,
+        "n_groups": len(counts),
+        "counts": counts,
+        "configs": evaluate_configs(counts, configs),
+    }
+
+
+def run_validations(
+    datasets: dict,
+    configs: dict,
+    root: str | Path = PROJECT_ROOT,
+    max_workers: int | None = None,
+    skip_labels=SKIP_LABELS,
+) -> dict:
+    """
+    Evaluate every config against every dataset, one process per dataset.
+
+    Parameters
+    ----------
+    datasets : dict
+        ``{name: spec}`` as accepted by :func:`load_counts`.
+    configs : dict
+        ``{key: {"fairness_target", "threshold", ...}}``.
+    root : str or Path
+        Directory dataset paths are relative to.
+    max_workers : int, optional
+        Process pool size; defaults to one per dataset, capped at the CPU
+        count, or no pool at all for fewer than eight datasets. ``1`` runs
+        everything in this process.
+
+    Returns
+    -------
+    dict
+        ``{name: validate_dataset(...)}`` in ``datasets`` order. Datasets
+        whose file is missing are left out.
+    """
+    names = list(datasets)
+    specs = [datasets[name] for name in names]
+    n = len(names)
+    if max_workers is None:
+        max_workers = min(n, os.cpu_count() or 1) if n >= _POOL_MIN_DATASETS else 1
+
+    if max_workers <= 1 or n <= 1:
+        outcomes = [validate_dataset(spec, configs, root, skip_labels) for spec in specs]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            outcomes = list(pool.map(validate_dataset, specs, [configs] * n, [root] * n, [skip_labels] * n))
+
+    return {name: outcome for name, outcome in zip(names, outcomes) if outcome is not None}
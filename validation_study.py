@@ -19,15 +19,13 @@ import json
 import sys
 from pathlib import Path
 
-import pandas as pd
-
 # Bootstrap project root
 PROJECT_ROOT = str(Path(__file__).resolve().parent)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from racial_bias_score import calculate_racial_bias_score
-from fairness_audit import disparate_impact
+from group_stats import outcome_counts
+from validation_runner import evaluate_counts, run_validations
 
 
 # ---------------------------------------------------------------------------
@@ -74,43 +72,19 @@ COMMUNITY_DEFINED = {
 }
 
 
-def run_audit(df, race_col, outcome_col, favorable, ref_group, threshold):
-    """Run a single audit and return group rates, DI ratios, and flagged groups."""
-    binary = (df[outcome_col] == favorable).astype(float)
-    group_rates = binary.groupby(df[race_col]).mean().round(4).to_dict()
-
-    # Determine reference group
-    if ref_group and ref_group in group_rates:
-        ref = ref_group
-    elif "White" in group_rates:
-        ref = "White"
-    elif "Caucasian" in group_rates:
-        ref = "Caucasian"
-    else:
-        ref = max(group_rates, key=lambda g: group_rates[g])
-
-    ref_rate = group_rates[ref]
-
-    # Compute DI
-    di_ratios = {}
-    for group, rate in group_rates.items():
-        if group == ref:
-            di_ratios[group] = 1.0
-        elif ref_rate == 0:
-            di_ratios[group] = None
-        else:
-            di_ratios[group] = round(rate / ref_rate, 4)
+# Config key → config. COMPAS labels White defendants "Caucasian"; the
+# reference-group fallback in evaluate_counts maps "White" onto it.
+CONFIGS = {
+    "default": RESEARCHER_DEFAULT,
+    "survey_proxy": SURVEY_PROXY,
+    "community": COMMUNITY_DEFINED,
+}
 
-    flagged = [g for g, di in di_ratios.items() if di is not None and di < threshold]
 
-    return {
-        "reference_group": ref,
-        "threshold": threshold,
-        "group_rates": group_rates,
-        "disparate_impact": di_ratios,
-        "flagged_groups": flagged,
-        "disparity_score": round(max(group_rates.values()) - min(group_rates.values()), 4),
-    }
+def run_audit(df, race_col, outcome_col, favorable, ref_group, threshold):
+    """Run a single audit and return group rates, DI ratios, and flagged groups."""
+    counts = outcome_counts(df, race_col, outcome_col, favorable)
+    return evaluate_counts(counts, ref_group, threshold)
 
 
 def main():
@@ -122,22 +96,16 @@ def main():
     results = {}
     total_delta_flags = 0
 
+    validated = run_validations(DATASETS, CONFIGS)
+
     for name, config in DATASETS.items():
-        path = Path(PROJECT_ROOT) / config["path"]
-        if not path.exists():
-            print(f"  SKIP: {name} — file not found at {path}")
+        if name not in validated:
+            print(f"  SKIP: {name} — file not found at {Path(PROJECT_ROOT) / config['path']}")
             continue
 
-        df = pd.read_csv(path)
-
-        # Filter to major racial groups (drop "Race Not Available", "Other", etc.)
-        skip_labels = {"Race Not Available", "Free Form Text Only", "Joint",
-                       "2 or more minority races", "Other"}
-        mask = ~df[config["race_col"]].isin(skip_labels)
-        df_clean = df[mask].copy()
-
-        n_groups = df_clean[config["race_col"]].nunique()
-        n_records = len(df_clean)
+        dataset = validated[name]
+        n_groups = dataset["n_groups"]
+        n_records = dataset["n_records"]
 
         print(f"{'─' * 80}")
         print(f"  DATASET: {name}")
@@ -145,25 +113,9 @@ def main():
         print(f"  Race col: {config['race_col']} | Outcome: {config['outcome_col']} | Favorable: {config['favorable']}")
         print(f"{'─' * 80}")
 
-        # --- EEOC default audit ---
-        default_result = run_audit(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"],
-            ref_group=None, threshold=RESEARCHER_DEFAULT["threshold"],
-        )
-
-        # --- Survey proxy audit ---
-        proxy_ref = "Caucasian" if name == "COMPAS Recidivism" else SURVEY_PROXY["fairness_target"]
-        proxy_result = run_audit(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"],
-            ref_group=proxy_ref, threshold=SURVEY_PROXY["threshold"],
-        )
-
-        # --- Community-defined audit ---
-        community_ref = "Caucasian" if name == "COMPAS Recidivism" else COMMUNITY_DEFINED["fairness_target"]
-        community_result = run_audit(
-            df_clean, config["race_col"], config["outcome_col"], config["favorable"],
-            ref_group=community_ref, threshold=COMMUNITY_DEFINED["threshold"],
-        )
+        default_result = dataset["configs"]["default"]
+        proxy_result = dataset["configs"]["survey_proxy"]
+        community_result = dataset["configs"]["community"]
 
         # --- Compare ---
         default_flagged = set(default_result["flagged_groups"])